@@ -0,0 +1,135 @@
+"""Response cache for the AI engine: bounded in-memory LRU+TTL with an optional SQLite tier."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+    max_size: int = 0
+
+
+def cache_key(department: str, prompt: str, model: str, temperature: float) -> str:
+    """Stable key over the normalized request; whitespace-only differences share an entry."""
+    normalized = [
+        department.strip().lower(),
+        " ".join(prompt.split()),
+        model.strip(),
+        round(float(temperature), 3),
+    ]
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL, optionally backed by a SQLite file.
+
+    The SQLite tier survives restarts: a memory miss falls through to disk and a disk hit
+    is promoted back into memory. ``clock`` returns the current epoch time in seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 3600.0,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(max_size=max_size)
+        self._conn: sqlite3.Connection | None = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM ai_cache WHERE created_at < ?", (clock() - ttl,))
+
+    def get(self, key: str) -> str | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return value
+                del self._entries[key]
+                self._stats.expirations += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM ai_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self._store(key, row[0], row[1])
+                    self._stats.disk_hits += 1
+                    return row[0]
+
+            self._stats.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = self._clock()
+        with self._lock:
+            self._store(key, value, now)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ai_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, now),
+                )
+
+    def _store(self, key: str, value: str, created_at: float) -> None:
+        self._entries[key] = (created_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM ai_cache")
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            self._stats.size = len(self._entries)
+            return asdict(self._stats)
+
+
+_DEFAULT_CACHE: ResponseCache | None = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def default_cache() -> ResponseCache:
+    """Process-wide cache configured from ``AI_CACHE_SIZE``, ``AI_CACHE_TTL`` and ``AI_CACHE_PATH``."""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = ResponseCache(
+                max_size=int(os.getenv("AI_CACHE_SIZE", "1024")),
+                ttl=float(os.getenv("AI_CACHE_TTL", "3600")),
+                path=os.getenv("AI_CACHE_PATH") or None,
+            )
+        return _DEFAULT_CACHE
@@ -2,7 +2,23 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+import re
+import threading
+import time
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.services.ai_cache import ResponseCache, cache_key, default_cache
+from app.services.ai_scheduler import (
+    AIOverloaded,
+    AIScheduler,
+    Priority,
+    default_scheduler,
+)
+from app.services.instrumentation import AI_FALLBACKS, AI_REQUEST_SECONDS
 
 PROMPT_TEMPLATES = {
     "hr": "You are an HR automation assistant. Task: {task}",
@@ -12,14 +28,99 @@ PROMPT_TEMPLATES = {
     "sales": "You are a sales manager assistant. Task: {task}",
 }
 
+DEFAULT_MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are AI Office Manager."
+
+# OpenAI clients are thread-safe and own an HTTP connection pool, so every engine with the
+# same connection settings shares one client (and its keep-alive connections) per process.
+_CLIENTS: dict[tuple[Any, ...], Any] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+def _raise_if_rate_limited(exc: Exception) -> None:
+    """Turn a provider 429 (after the SDK's own retries) into backpressure instead of a mock answer."""
+    if getattr(exc, "status_code", None) != 429:
+        return
+    response = getattr(exc, "response", None)
+    try:
+        retry_after = float(response.headers.get("retry-after", 1)) if response is not None else 1.0
+    except ValueError:
+        retry_after = 1.0
+    raise AIOverloaded("AI provider rate limit reached", retry_after) from exc
+
 
 @dataclass
 class AIEngine:
     api_key: str | None = None
+    base_url: str | None = None
+    model: str = DEFAULT_MODEL
+    temperature: float = 0.2
+    timeout: float = field(default_factory=lambda: _env_float("OPENAI_TIMEOUT", 30.0))
+    connect_timeout: float = field(default_factory=lambda: _env_float("OPENAI_CONNECT_TIMEOUT", 5.0))
+    max_retries: int = field(default_factory=lambda: _env_int("OPENAI_MAX_RETRIES", 2))
+    max_connections: int = field(default_factory=lambda: _env_int("OPENAI_MAX_CONNECTIONS", 20))
+    max_keepalive_connections: int = field(default_factory=lambda: _env_int("OPENAI_MAX_KEEPALIVE", 10))
+    max_concurrency: int = field(default_factory=lambda: _env_int("AI_MAX_CONCURRENCY", 8))
+    # Completion tokens assumed per call when budgeting AI_TOKENS_PER_MINUTE; reconciled with usage.
+    completion_tokens_estimate: int = field(default_factory=lambda: _env_int("AI_COMPLETION_TOKENS_ESTIMATE", 256))
+    cache: ResponseCache | None = field(default_factory=default_cache, repr=False)
+    scheduler: AIScheduler | None = field(default_factory=default_scheduler, repr=False)
 
     def __post_init__(self) -> None:
         if self.api_key is None:
             self.api_key = os.getenv("OPENAI_API_KEY")
+        if self.base_url is None:
+            self.base_url = os.getenv("OPENAI_BASE_URL")
+
+    def _client_key(self) -> tuple[Any, ...]:
+        return (
+            self.api_key,
+            self.base_url,
+            self.timeout,
+            self.connect_timeout,
+            self.max_retries,
+            self.max_connections,
+            self.max_keepalive_connections,
+        )
+
+    def client(self) -> Any:
+        """Return the process-wide OpenAI client for this engine's connection settings."""
+        key = self._client_key()
+        client = _CLIENTS.get(key)
+        if client is not None:
+            return client
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(key)
+            if client is None:
+                import httpx
+                from openai import DefaultHttpxClient, OpenAI
+
+                timeout = httpx.Timeout(self.timeout, connect=self.connect_timeout)
+                http_client = DefaultHttpxClient(
+                    timeout=timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive_connections,
+                    ),
+                )
+                # The SDK retries connection errors, 429s and 5xx with exponential backoff.
+                client = OpenAI(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=timeout,
+                    max_retries=self.max_retries,
+                    http_client=http_client,
+                )
+                _CLIENTS[key] = client
+        return client
 
     def _mock_response(self, department: str, task: str) -> str:
         prefix = department.upper()
@@ -29,26 +130,193 @@ class AIEngine:
             "and track KPI movement weekly."
         )
 
-    def process(self, department: str, task: str) -> str:
-        """Return a response from OpenAI if available, otherwise deterministic mock output."""
+    def _mock_stream(self, department: str, task: str) -> Iterator[str]:
+        yield from re.findall(r"\S+\s*", self._mock_response(department, task))
+
+    def _messages(self, prompt: str) -> list[dict[str, str]]:
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+
+    def render_prompt(self, department: str, task: str) -> str:
         template = PROMPT_TEMPLATES.get(department, "General task: {task}")
-        prompt = template.format(task=task)
+        return template.format(task=task)
+
+    def process(self, department: str, task: str, priority: Priority = Priority.INTERACTIVE) -> str:
+        """Return a response from OpenAI if available, otherwise deterministic mock output.
+
+        Raises :class:`AIOverloaded` when the scheduler queue or the provider's rate limit is
+        exhausted, rather than answering with the mock.
+        """
+        started = time.perf_counter()
+        try:
+            content, outcome = self._process(department, task, priority)
+        except AIOverloaded:
+            self._record(department, "process", "rejected", started)
+            raise
+        self._record(department, "process", outcome, started)
+        return content
+
+    def _estimate_tokens(self, prompt: str) -> int:
+        # ~4 characters per token for English text, plus the expected completion.
+        return (len(SYSTEM_PROMPT) + len(prompt)) // 4 + self.completion_tokens_estimate
+
+    def _process(self, department: str, task: str, priority: Priority) -> tuple[str, str]:
+        """The response and how it was produced: ``completion``, ``cache`` or ``fallback:<reason>``."""
+        prompt = self.render_prompt(department, task)
 
         if not self.api_key:
-            return self._mock_response(department, task)
+            return self._mock_response(department, task), "fallback:no_api_key"
+
+        key = cache_key(department, prompt, self.model, self.temperature)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, "cache"
 
+        estimate = self._estimate_tokens(prompt)
         try:
-            from openai import OpenAI
-
-            client = OpenAI(api_key=self.api_key)
-            completion = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are AI Office Manager."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.2,
+            if self.scheduler is None:
+                content = self._complete(prompt, key, estimate)
+            else:
+                # Identical prompts in flight at the same time share one upstream call.
+                content = self.scheduler.run(
+                    lambda: self._complete(prompt, key, estimate), key=key, priority=priority, tokens=estimate
+                )
+        except AIOverloaded:
+            raise
+        except Exception:  # noqa: BLE001 - any upstream failure degrades to the mock answer
+            return self._mock_response(department, task), "fallback:error"
+
+        if not content:
+            return self._mock_response(department, task), "fallback:empty"
+        return content, "completion"
+
+    def _complete(self, prompt: str, key: str, estimate: int) -> str | None:
+        """One upstream completion; caches real answers so later callers skip the queue."""
+        if self.cache is not None:
+            # A flight for this prompt may have landed while this one waited for its slot.
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        try:
+            completion = self.client().chat.completions.create(
+                model=self.model,
+                messages=self._messages(prompt),
+                temperature=self.temperature,
             )
-            return completion.choices[0].message.content or self._mock_response(department, task)
-        except Exception:
-            return self._mock_response(department, task)
+        except Exception as exc:
+            _raise_if_rate_limited(exc)
+            raise
+        usage = getattr(completion, "usage", None)
+        if usage is not None and self.scheduler is not None:
+            self.scheduler.adjust_tokens(usage.total_tokens - estimate)
+        content = completion.choices[0].message.content
+        # Only real completions are cached; fallbacks should be retried on the next call.
+        if content and self.cache is not None:
+            self.cache.set(key, content)
+        return content
+
+    @staticmethod
+    def _record(department: str, mode: str, outcome: str, started: float) -> None:
+        outcome, _, reason = outcome.partition(":")
+        if reason:
+            AI_FALLBACKS.inc(reason=reason)
+        AI_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            department=department if department in PROMPT_TEMPLATES else "other",
+            mode=mode,
+            outcome=outcome,
+        )
+
+    def stream(self, department: str, task: str, priority: Priority = Priority.INTERACTIVE) -> Iterator[str]:
+        """Yield the response in chunks as the model generates it.
+
+        Mirrors :meth:`process`: cached responses come back as one chunk, and the mock
+        fallback is streamed word by word so callers behave the same offline. The upstream
+        stream holds a scheduler slot until it finishes.
+        """
+        started = time.perf_counter()
+        outcome = "completion"
+        try:
+            outcome = yield from self._stream(department, task, priority)
+        except AIOverloaded:
+            outcome = "rejected"
+            raise
+        finally:
+            self._record(department, "stream", outcome, started)
+
+    def _stream(self, department: str, task: str, priority: Priority) -> Generator[str, None, str]:
+        prompt = self.render_prompt(department, task)
+
+        if not self.api_key:
+            yield from self._mock_stream(department, task)
+            return "fallback:no_api_key"
+
+        key = cache_key(department, prompt, self.model, self.temperature)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return "cache"
+
+        parts: list[str] = []
+        try:
+            with self.scheduler.slot(priority, self._estimate_tokens(prompt)) if self.scheduler else nullcontext():
+                chunks = self.client().chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(prompt),
+                    temperature=self.temperature,
+                    stream=True,
+                )
+                for chunk in chunks:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+        except AIOverloaded:
+            raise
+        except Exception as exc:  # noqa: BLE001 - same fallback as process(), when nothing was sent
+            # Output already sent cannot be retracted; only fall back if nothing was streamed.
+            if not parts:
+                _raise_if_rate_limited(exc)
+                yield from self._mock_stream(department, task)
+                return "fallback:error"
+            return "error"
+
+        if not parts:
+            yield from self._mock_stream(department, task)
+            return "fallback:empty"
+        if self.cache is not None:
+            self.cache.set(key, "".join(parts))
+        return "completion"
+
+    def _process_item(self, department: str, task: str) -> dict[str, str | None]:
+        try:
+            return {"response": self.process(department, task, Priority.BULK), "error": None}
+        except Exception as exc:  # noqa: BLE001 - reported per item so one failure keeps the batch
+            return {"response": None, "error": f"{type(exc).__name__}: {exc}"}
+
+    def process_many(
+        self, items: Iterable[tuple[str, str]], max_concurrency: int | None = None
+    ) -> list[dict[str, str | None]]:
+        """Process ``(department, task)`` pairs concurrently; results keep input order.
+
+        Each result has ``response`` and ``error`` keys so one failing item does not fail
+        the batch. At most ``max_concurrency`` upstream calls run at once, queued at bulk
+        priority behind interactive requests.
+        """
+        items = list(items)
+        limit = max(1, max_concurrency or self.max_concurrency)
+        # The mock path is pure string formatting; threads would only add overhead.
+        if not self.api_key or limit == 1 or len(items) <= 1:
+            return [self._process_item(department, task) for department, task in items]
+        with ThreadPoolExecutor(max_workers=min(limit, len(items)), thread_name_prefix="ai-batch") as pool:
+            return list(pool.map(lambda item: self._process_item(*item), items))
+
+    def cache_stats(self) -> dict[str, int]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def scheduler_stats(self) -> dict[str, Any]:
+        return self.scheduler.stats() if self.scheduler is not None else {}
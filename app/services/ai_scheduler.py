@@ -0,0 +1,263 @@
+"""Admission control for upstream AI calls: single-flight, priority queue and token-bucket pacing.
+
+Callers run their upstream call in their own thread once :class:`AIScheduler` grants them a slot.
+A dispatcher thread hands out slots in priority order (interactive before bulk, FIFO within a
+priority), no faster than the request and token budgets allow and never more than
+``max_concurrency`` at a time. Identical requests already in flight share one upstream call.
+When the queue is full, or a request waits longer than ``max_wait``, callers get
+:class:`AIOverloaded` instead of a silently degraded answer.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, TypeVar
+
+from app.services.instrumentation import AI_QUEUE_WAIT_SECONDS
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BULK = 1
+
+
+class AIOverloaded(RuntimeError):
+    """The AI backend is saturated; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, retry_after: float = 1.0) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """``per_minute`` units refilled continuously, bursting up to ``burst`` seconds' worth.
+
+    Providers enforce per-minute limits over much shorter windows, so the default burst is one
+    second rather than a whole minute. Not thread-safe on its own; :class:`AIScheduler` only
+    touches it under its lock.
+    """
+
+    def __init__(self, per_minute: float, burst: float = 1.0) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (or refund, if negative) the difference between estimated and actual usage."""
+        self._refill()
+        self.level = min(self.capacity, self.level - amount)
+
+
+class _Ticket:
+    __slots__ = ("cancelled", "enqueued", "event", "granted", "priority", "tokens")
+
+    def __init__(self, priority: Priority, tokens: int) -> None:
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.cancelled = False
+        self.event = threading.Event()
+
+
+class AIScheduler:
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_queue: int = 256,
+        max_wait: float = 30.0,
+        burst: float = 1.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._requests = TokenBucket(requests_per_minute, burst) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute, burst) if tokens_per_minute else None
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, _Ticket]] = []
+        self._seq = itertools.count()
+        self._queued = 0
+        self._active = 0
+        self._dispatcher: threading.Thread | None = None
+        self._flights: dict[Hashable, Future] = {}
+        self._stats = {"granted": 0, "deduplicated": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+
+    def run(
+        self,
+        fn: Callable[[], T],
+        key: Hashable | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        tokens: int = 0,
+    ) -> T:
+        """Run ``fn`` in this thread once admitted; concurrent calls with the same ``key`` share its result."""
+        if key is None:
+            with self.slot(priority, tokens):
+                return fn()
+        with self._cond:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+            else:
+                self._stats["deduplicated"] += 1
+        if not leader:
+            return flight.result()
+        try:
+            with self.slot(priority, tokens):
+                result = fn()
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._cond:
+                del self._flights[key]
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.INTERACTIVE, tokens: int = 0) -> Iterator[None]:
+        """Wait for an upstream slot (e.g. for a stream) and hold it for the ``with`` block."""
+        self._acquire(priority, tokens)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def adjust_tokens(self, amount: int) -> None:
+        """Reconcile the token budget once a call reports its real usage (``actual - estimate``)."""
+        if self._tokens is not None and amount:
+            with self._cond:
+                self._tokens.adjust(amount)
+
+    def _acquire(self, priority: Priority, tokens: int) -> None:
+        ticket = _Ticket(priority, tokens)
+        with self._cond:
+            if self._queued >= self.max_queue:
+                self._stats["rejected_queue_full"] += 1
+                raise AIOverloaded(f"AI queue is full ({self.max_queue} waiting)", self._retry_after())
+            heapq.heappush(self._heap, (int(priority), next(self._seq), ticket))
+            self._queued += 1
+            self._ensure_dispatcher()
+            self._cond.notify_all()
+        granted = ticket.event.wait(self.max_wait)
+        with self._cond:
+            if not granted and not ticket.granted:
+                # Lazily removed: the dispatcher skips cancelled tickets.
+                ticket.cancelled = True
+                self._queued -= 1
+                self._stats["rejected_timeout"] += 1
+                self._cond.notify_all()
+                raise AIOverloaded(f"Waited over {self.max_wait:.0f}s for an AI slot", self._retry_after())
+        AI_QUEUE_WAIT_SECONDS.observe(time.monotonic() - ticket.enqueued, priority=ticket.priority.name.lower())
+
+    def _retry_after(self) -> float:
+        delays = [1.0]
+        if self._requests is not None:
+            delays.append(self._requests.delay(1))
+        return max(delays)
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch, name="ai-scheduler", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while True:
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap or self._active >= self.max_concurrency:
+                    self._cond.wait()
+                    continue
+                ticket = self._heap[0][2]
+                wait = max(
+                    self._requests.delay(1) if self._requests is not None else 0.0,
+                    self._tokens.delay(ticket.tokens) if self._tokens is not None else 0.0,
+                )
+                if wait > 0:
+                    # Woken early by new arrivals, so a higher-priority ticket can overtake.
+                    self._cond.wait(wait)
+                    continue
+                heapq.heappop(self._heap)
+                if self._requests is not None:
+                    self._requests.take(1)
+                if self._tokens is not None:
+                    self._tokens.take(ticket.tokens)
+                self._queued -= 1
+                self._active += 1
+                self._stats["granted"] += 1
+                ticket.granted = True
+                ticket.event.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            by_priority = {priority.name.lower(): 0 for priority in Priority}
+            for _, _, ticket in self._heap:
+                if not ticket.cancelled:
+                    by_priority[ticket.priority.name.lower()] += 1
+            return {
+                "queued": self._queued,
+                "queued_by_priority": by_priority,
+                "active": self._active,
+                "in_flight_keys": len(self._flights),
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                **self._stats,
+            }
+
+
+def _env_limit(name: str) -> float | None:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+_DEFAULT_SCHEDULER: AIScheduler | None = None
+_DEFAULT_SCHEDULER_LOCK = threading.Lock()
+
+
+def default_scheduler() -> AIScheduler:
+    """Process-wide scheduler from ``AI_UPSTREAM_CONCURRENCY``, ``AI_REQUESTS_PER_MINUTE``,
+    ``AI_TOKENS_PER_MINUTE``, ``AI_RATE_BURST_SECONDS``, ``AI_QUEUE_SIZE`` and ``AI_QUEUE_TIMEOUT``
+    (rates unset: unlimited)."""
+    global _DEFAULT_SCHEDULER
+    with _DEFAULT_SCHEDULER_LOCK:
+        if _DEFAULT_SCHEDULER is None:
+            _DEFAULT_SCHEDULER = AIScheduler(
+                max_concurrency=int(os.getenv("AI_UPSTREAM_CONCURRENCY", os.getenv("OPENAI_MAX_CONNECTIONS", "20"))),
+                requests_per_minute=_env_limit("AI_REQUESTS_PER_MINUTE"),
+                tokens_per_minute=_env_limit("AI_TOKENS_PER_MINUTE"),
+                max_queue=int(os.getenv("AI_QUEUE_SIZE", "256")),
+                max_wait=float(os.getenv("AI_QUEUE_TIMEOUT", "30")),
+                burst=float(os.getenv("AI_RATE_BURST_SECONDS", "1")),
+            )
+        return _DEFAULT_SCHEDULER
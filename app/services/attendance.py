@@ -0,0 +1,307 @@
+"""Attendance analytics over raw clock-in/out event logs, stored as memory-mapped NumPy columns.
+
+Event files (CSV with an employee, a timestamp and an in/out event column) are ingested in chunks
+into one partition per calendar month. A partition is three flat binary columns: the employee's
+dictionary code (``int32``), seconds since the start of the month (``uint32``) and the event kind
+(``uint8``, 1 = in), 9 bytes per event, plus a manifest holding the committed row count. Readers
+map exactly that many rows, so a half-finished append is never visible.
+
+Per-period summaries (present days, late days, hours worked per employee) pack every event into
+one sortable ``int64`` key and reduce the sorted keys with ``bincount``, with no Python loop over
+rows. They are cached in memory and on disk under the partition's row count, so they are only
+recomputed after new events arrive.
+
+Ingests hold an exclusive lock on ``<root>/.lock`` (``flock``, where available) and reload the
+employee dictionary under it, so several processes or store instances can append to one store.
+
+Timestamps are taken as office-local wall-clock time: offsets, when present, are dropped rather
+than converted. A shift that starts in one month and ends in the next is not counted as hours.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import warnings
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import time
+from pathlib import Path
+from typing import IO, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows: ingests are only serialized within the process.
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+# Sorted keys are reduced in blocks of about this many rows, split on employee boundaries.
+BLOCK_ROWS = 4_000_000
+
+COLUMNS = {"employee": np.int32, "second": np.uint32, "kind": np.uint8}
+IN_EVENTS = {"in", "clockin", "checkin", "signin", "entry", "enter", "1"}
+OUT_EVENTS = {"out", "clockout", "checkout", "signout", "exit", "0"}
+
+# Key layout: employee code | second of the month (22 bits; 31 days < 2**22 s) | kind (1 bit).
+_SECOND_BITS = 22
+_EMPLOYEE_SHIFT = _SECOND_BITS + 1
+_DAY = 86_400
+
+
+def _wall_clock(values: pd.Series) -> pd.Series:
+    """Parse ISO timestamps as recorded wall-clock time, dropping any UTC offsets."""
+    with warnings.catch_warnings():
+        # Mixed offsets parse to objects (with a FutureWarning); they are re-parsed below.
+        warnings.simplefilter("ignore", FutureWarning)
+        stamps = pd.to_datetime(values, format="ISO8601", errors="coerce")
+    if not pd.api.types.is_datetime64_any_dtype(stamps):
+        stripped = values.astype(str).str.replace(r"(?:Z|[+-]\d\d:?\d\d)$", "", regex=True)
+        return pd.to_datetime(stripped, format="ISO8601", errors="coerce")
+    return stamps.dt.tz_localize(None) if stamps.dt.tz is not None else stamps
+
+
+def _event_kinds(values: pd.Series) -> np.ndarray:
+    """1 for clock-in, 0 for clock-out, -1 for anything else; mapped once per distinct label."""
+    labels = values.astype("category")
+    normalized = labels.cat.categories.astype(str).str.lower().str.replace(r"[^a-z0-9]", "", regex=True)
+    lookup = np.where(normalized.isin(IN_EVENTS), 1, np.where(normalized.isin(OUT_EVENTS), 0, -1)).astype(np.int8)
+    codes = labels.cat.codes.to_numpy()
+    return np.where(codes >= 0, lookup[codes], -1)
+
+
+class AttendanceStore:
+    def __init__(
+        self,
+        root: str | Path,
+        late_after: time = time(9, 15),
+        max_shift_hours: float = 16.0,
+    ) -> None:
+        self.root = Path(root)
+        self.late_after = late_after
+        # Longer in->out gaps are treated as a missed clock-out and not counted as hours.
+        self.max_shift_hours = max_shift_hours
+        self._lock = threading.Lock()
+        self._employees: list[str] | None = None
+        self._codes: dict[str, int] = {}
+        self._aggregates: dict[tuple, pd.DataFrame] = {}
+
+    # -- layout ---------------------------------------------------------------------------------
+
+    def _partition(self, period: str) -> Path:
+        return self.root / "events" / period
+
+    def _read_rows(self, period: str) -> int:
+        manifest = self._partition(period) / "manifest.json"
+        return json.loads(manifest.read_text())["rows"] if manifest.exists() else 0
+
+    def _write_json(self, path: Path, payload: Any) -> None:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload))
+        os.replace(tmp, path)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared by every store on ``root``, across processes."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".lock", "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def employees(self) -> list[str]:
+        if self._employees is None:
+            path = self.root / "employees.json"
+            self._employees = json.loads(path.read_text()) if path.exists() else []
+            self._codes = {name: code for code, name in enumerate(self._employees)}
+        return self._employees
+
+    def periods(self) -> list[str]:
+        """Months with events, newest first (``YYYY-MM``)."""
+        events = self.root / "events"
+        if not events.exists():
+            return []
+        return sorted((p.name for p in events.iterdir() if (p / "manifest.json").exists()), reverse=True)
+
+    def rows(self, period: str) -> int:
+        return self._read_rows(period)
+
+    def columns(self, period: str, rows: int | None = None) -> dict[str, np.ndarray]:
+        """Read-only memory maps of the first ``rows`` rows of a partition (default: all committed)."""
+        rows = self._read_rows(period) if rows is None else rows
+        partition = self._partition(period)
+        if not rows:
+            return {name: np.empty(0, dtype) for name, dtype in COLUMNS.items()}
+        return {name: np.memmap(partition / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,)) for name, dtype in COLUMNS.items()}
+
+    # -- ingest ---------------------------------------------------------------------------------
+
+    def _encode_employees(self, names: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(names.astype(str), sort=False)
+        known = self.employees()
+        lookup = np.empty(len(uniques), dtype=np.int32)
+        for position, name in enumerate(uniques):
+            code = self._codes.get(name)
+            if code is None:
+                code = self._codes[name] = len(known)
+                known.append(name)
+            lookup[position] = code
+        return lookup[codes]
+
+    def _append(self, period: str, employee: np.ndarray, second: np.ndarray, kind: np.ndarray) -> None:
+        partition = self._partition(period)
+        partition.mkdir(parents=True, exist_ok=True)
+        rows = self._read_rows(period)
+        for name, values in (("employee", employee), ("second", second), ("kind", kind)):
+            path = partition / f"{name}.bin"
+            with open(path, "ab") as handle:
+                # Drop bytes past the manifest left by an interrupted append.
+                handle.truncate(rows * np.dtype(COLUMNS[name]).itemsize)
+                values.astype(COLUMNS[name], copy=False).tofile(handle)
+        self._write_json(partition / "manifest.json", {"rows": rows + len(employee)})
+
+    def ingest(
+        self,
+        source: str | IO[Any],
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        employee_col: str = "employee",
+        time_col: str = "timestamp",
+        event_col: str = "event",
+    ) -> dict[str, Any]:
+        """Append a CSV event log chunk by chunk; rows with an unparseable time or event are skipped."""
+        stored = skipped = 0
+        touched: set[str] = set()
+        with self._lock, self._file_lock(), pd.read_csv(
+            source, usecols=[employee_col, time_col, event_col], dtype={employee_col: str}, chunksize=chunk_rows
+        ) as reader:
+            # Another store may have added employees since this one last read the dictionary;
+            # new names are appended after them, and existing codes never change.
+            self._employees = None
+            for chunk in reader:
+                stamps = _wall_clock(chunk[time_col])
+                kind = _event_kinds(chunk[event_col])
+                valid = stamps.notna().to_numpy() & (kind >= 0) & chunk[employee_col].notna().to_numpy()
+                skipped += int((~valid).sum())
+                if not valid.any():
+                    continue
+                moments = stamps.to_numpy()[valid].astype("datetime64[s]")
+                employee = self._encode_employees(chunk[employee_col][valid])
+                kind = kind[valid]
+                months = moments.astype("datetime64[M]")
+                second = (moments - months.astype("datetime64[s]")).astype(np.int64)
+                # The dictionary must be durable before any partition refers to new codes.
+                self._write_json(self.root / "employees.json", self.employees())
+                for month in np.unique(months):
+                    mask = months == month
+                    period = str(month)
+                    self._append(period, employee[mask], second[mask], kind[mask])
+                    touched.add(period)
+                stored += int(valid.sum())
+        return {"stored": stored, "skipped": skipped, "periods": sorted(touched)}
+
+    # -- aggregation ----------------------------------------------------------------------------
+
+    def _sorted_keys(self, period: str, rows: int) -> np.ndarray:
+        columns = self.columns(period, rows)
+        keys = np.empty(rows, dtype=np.int64)
+        for start in range(0, rows, BLOCK_ROWS):
+            stop = min(rows, start + BLOCK_ROWS)
+            block = keys[start:stop]
+            np.left_shift(columns["employee"][start:stop], _EMPLOYEE_SHIFT, out=block, dtype=np.int64)
+            block |= columns["second"][start:stop].astype(np.int64) << 1
+            block |= columns["kind"][start:stop]
+        keys.sort()
+        return keys
+
+    def _reduce(self, keys: np.ndarray, totals: dict[str, np.ndarray]) -> None:
+        employee = keys >> _EMPLOYEE_SHIFT
+        second = (keys >> 1) & ((1 << _SECOND_BITS) - 1)
+        kind = keys & 1
+        size = len(totals["present_days"])
+
+        # Keys are ordered by (employee, time), so each employee-day starts with its first event.
+        employee_day = employee * 32 + second // _DAY
+        first = np.empty(len(keys), dtype=bool)
+        first[:1] = True
+        np.not_equal(employee_day[1:], employee_day[:-1], out=first[1:])
+        late = (second % _DAY) > (self.late_after.hour * 3600 + self.late_after.minute * 60 + self.late_after.second)
+        totals["present_days"] += np.bincount(employee[first], minlength=size)
+        totals["late_days"] += np.bincount(employee[first & late], minlength=size)
+
+        # Hours come from each clock-in followed directly by a clock-out of the same employee.
+        gap = second[1:] - second[:-1]
+        paired = (kind[:-1] == 1) & (kind[1:] == 0) & (employee[1:] == employee[:-1]) & (gap <= self.max_shift_hours * 3600)
+        totals["seconds_worked"] += np.bincount(employee[:-1][paired], weights=gap[paired], minlength=size)
+
+    def _compute(self, period: str, rows: int) -> pd.DataFrame:
+        keys = self._sorted_keys(period, rows)
+        # Reloaded after the rows were fixed: another process may have added employees since.
+        self._employees = None
+        names = self.employees()
+        totals = {
+            "present_days": np.zeros(len(names), dtype=np.int64),
+            "late_days": np.zeros(len(names), dtype=np.int64),
+            "seconds_worked": np.zeros(len(names), dtype=np.float64),
+        }
+        start = 0
+        while start < len(keys):
+            # Cut blocks only where the employee changes, so no pair or day spans two blocks.
+            stop = min(len(keys), start + BLOCK_ROWS)
+            if stop < len(keys):
+                next_employee = (keys[stop - 1] >> _EMPLOYEE_SHIFT) + 1
+                stop = int(np.searchsorted(keys, next_employee << _EMPLOYEE_SHIFT))
+            self._reduce(keys[start:stop], totals)
+            start = stop
+        seen = totals["present_days"] > 0
+        return pd.DataFrame(
+            {
+                "employee": np.asarray(names, dtype=object)[seen],
+                "present_days": totals["present_days"][seen],
+                "late_days": totals["late_days"][seen],
+                "hours_worked": np.round(totals["seconds_worked"][seen] / 3600, 2),
+            }
+        ).sort_values("employee", ignore_index=True)
+
+    def summary(self, period: str) -> pd.DataFrame:
+        """Present days, late days and hours worked per employee for ``period`` (``YYYY-MM``)."""
+        settings = f"{self.late_after:%H%M%S}-{self.max_shift_hours:g}"
+        key = (period, self._read_rows(period), settings)
+        cached = self._aggregates.get(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            path = self.root / "aggregates" / f"{period}-{key[1]}-{settings}.pkl"
+            if path.exists():
+                summary = pd.read_pickle(path)
+            else:
+                summary = self._compute(period, key[1])
+                path.parent.mkdir(parents=True, exist_ok=True)
+                for stale in path.parent.glob(f"{period}-*.pkl"):
+                    stale.unlink()
+                summary.to_pickle(path)
+            self._aggregates = {k: v for k, v in self._aggregates.items() if k[0] != period}
+            self._aggregates[key] = summary
+        return summary
+
+
+_DEFAULT_STORE: AttendanceStore | None = None
+_DEFAULT_STORE_LOCK = threading.Lock()
+
+
+def default_attendance_store() -> AttendanceStore:
+    """Process-wide store under ``ATTENDANCE_STORE_DIR`` (default ``.attendance_store``); arrivals
+    after ``ATTENDANCE_LATE_AFTER`` (default ``09:15``) count as late."""
+    global _DEFAULT_STORE
+    with _DEFAULT_STORE_LOCK:
+        if _DEFAULT_STORE is None:
+            _DEFAULT_STORE = AttendanceStore(
+                os.getenv("ATTENDANCE_STORE_DIR", ".attendance_store"),
+                late_after=time.fromisoformat(os.getenv("ATTENDANCE_LATE_AFTER", "09:15")),
+            )
+        return _DEFAULT_STORE
@@ -1,15 +1,106 @@
 """Database setup and ORM models for AI Office Manager."""
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, create_engine
+import os
+import threading
+import weakref
+from datetime import date, datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    bindparam,
+    create_engine,
+    event,
+    inspect,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
-DB_URL = "sqlite:///ai_office_manager.db"
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+DB_URL = os.getenv("DATABASE_URL", "sqlite:///ai_office_manager.db")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+# Async drivers for the sync URL schemes we support; override with ASYNC_DATABASE_URL.
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme.split("+")[0], scheme) + sep + rest
+
+
+def _apply_sqlite_pragmas(sync_engine: Engine, url: str) -> None:
+    in_memory = url.endswith(("://", ":memory:"))
+
+    @event.listens_for(sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, _record) -> None:
+        cursor = dbapi_connection.cursor()
+        if not in_memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
+def create_db_engine(url: str) -> Engine:
+    """Create an engine; SQLite files get WAL, a busy timeout and NORMAL sync on every connection.
+
+    WAL lets readers run alongside the single writer, and the busy timeout makes writers wait
+    for the lock instead of failing immediately with "database is locked".
+    """
+    if not url.startswith("sqlite"):
+        return create_engine(url)
+    new_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+    )
+    _apply_sqlite_pragmas(new_engine, url)
+    return new_engine
+
+
+engine = create_db_engine(DB_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+ASYNC_DB_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DB_URL)
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Async engine for the API; built on first use so sync-only callers never import the async driver."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    if not ASYNC_DB_URL.startswith("sqlite"):
+        return create_async_engine(ASYNC_DB_URL)
+    async_engine = create_async_engine(ASYNC_DB_URL, connect_args={"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000})
+    _apply_sqlite_pragmas(async_engine.sync_engine, ASYNC_DB_URL)
+    return async_engine
+
+
+@lru_cache(maxsize=1)
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    return async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -28,8 +119,17 @@ class Ticket(Base):
     issue = Column(String(500), nullable=False)
     status = Column(String(30), default="Open")
     category = Column(String(50), default="General")
+    # "auto" when the classifier predicted the category, "user" when a person chose it; NULL on
+    # rows written before this was recorded, which are treated as user-labelled.
+    category_source = Column(String(10))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tickets_category_created_at_id", "category", "created_at", "id"),
+    )
+
 
 class Lead(Base):
     __tablename__ = "leads"
@@ -42,6 +142,12 @@ class Lead(Base):
     deal_size = Column(Float, default=0.0)
     score = Column(Float, default=0.0)
     extra = Column(JSON, default=dict)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_leads_score_id", "score", "id"),
+        Index("ix_leads_source_score_id", "source", "score", "id"),
+    )
 
 
 class Task(Base):
@@ -51,16 +157,310 @@ class Task(Base):
     title = Column(String(150), nullable=False)
     owner = Column(String(80), nullable=False)
     due_date = Column(String(20), nullable=False)
+    # Typed copy of ``due_date`` for range queries; derived on insert, kept in sync on SQLite by
+    # the ``tasks_due_on_au`` trigger, and backfilled for older rows by ``backfill_due_on``.
+    due_on = Column(Date, default=lambda context: parse_due_date(context.get_current_parameters().get("due_date")))
     priority = Column(String(20), default="Medium")
     status = Column(String(20), default="Pending")
 
+    __table_args__ = (
+        Index("ix_tasks_due_on_id", "due_on", "id"),
+        Index("ix_tasks_status_due_on_id", "status", "due_on", "id"),
+    )
+
+
+class Reminder(Base):
+    __tablename__ = "reminders"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=True)
+    message = Column(String(300), nullable=False)
+    # Naive UTC, like every other timestamp in the schema.
+    remind_at = Column(DateTime, nullable=False)
+    fired_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Only pending reminders are indexed: the scheduler never reads fired ones back.
+        Index(
+            "ix_reminders_pending",
+            "remind_at",
+            "id",
+            sqlite_where=text("fired_at IS NULL"),
+            postgresql_where=text("fired_at IS NULL"),
+        ),
+    )
+
+
+def parse_due_date(value: object) -> date | None:
+    """Date of a free-form ``due_date`` string (ISO date, optionally followed by a time); ``None`` if unparseable."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
 
-def init_db() -> None:
-    Base.metadata.create_all(bind=engine)
-    session = SessionLocal()
+# External-content FTS5 index over tickets: it stores only the inverted index and reads the
+# text back from ``tickets`` by rowid. Triggers keep it in sync with every write path.
+TICKET_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts USING fts5(
+        customer, issue, content='tickets', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts(rowid, customer, issue) VALUES (new.id, new.customer, new.issue);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_ad AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, customer, issue) VALUES ('delete', old.id, old.customer, old.issue);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS tickets_fts_au AFTER UPDATE OF customer, issue ON tickets BEGIN
+        INSERT INTO tickets_fts(tickets_fts, rowid, customer, issue) VALUES ('delete', old.id, old.customer, old.issue);
+        INSERT INTO tickets_fts(rowid, customer, issue) VALUES (new.id, new.customer, new.issue);
+    END""",
+]
+
+
+def init_ticket_search(bind: Engine) -> None:
+    """Create the FTS5 ticket index and triggers on SQLite, backfilling existing tickets once."""
+    if bind.dialect.name != "sqlite":
+        return
+    backfill = not inspect(bind).has_table("tickets_fts")
+    with bind.begin() as conn:
+        for statement in TICKET_FTS_DDL:
+            conn.exec_driver_sql(statement)
+        if backfill:
+            conn.exec_driver_sql("INSERT INTO tickets_fts(tickets_fts) VALUES ('rebuild')")
+
+
+# Row counts and change versions for the dashboard tables, kept exact by triggers so metrics
+# never scan a table and conditional GETs can tell whether a table changed since the last poll.
+COUNTED_TABLES = ("tickets", "tasks", "leads")
+TABLE_COUNTS_DDL = [
+    """CREATE TABLE IF NOT EXISTS table_counts (
+        table_name VARCHAR(50) PRIMARY KEY,
+        row_count INTEGER NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0,
+        modified_at TIMESTAMP
+    )""",
+    *(
+        statement
+        for table in COUNTED_TABLES
+        for statement in (
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_count_ai AFTER INSERT ON {table} BEGIN
+                UPDATE table_counts SET row_count = row_count + 1, version = version + 1,
+                    modified_at = CURRENT_TIMESTAMP WHERE table_name = '{table}';
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_count_ad AFTER DELETE ON {table} BEGIN
+                UPDATE table_counts SET row_count = row_count - 1, version = version + 1,
+                    modified_at = CURRENT_TIMESTAMP WHERE table_name = '{table}';
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS {table}_version_au AFTER UPDATE ON {table} BEGIN
+                UPDATE table_counts SET version = version + 1, modified_at = CURRENT_TIMESTAMP
+                    WHERE table_name = '{table}';
+            END""",
+        )
+    ),
+]
+# Added to table_counts after it first shipped; older databases get them on upgrade.
+_TABLE_COUNTS_UPGRADE = {"version": "INTEGER NOT NULL DEFAULT 0", "modified_at": "TIMESTAMP"}
+
+
+def init_table_counts(bind: Engine) -> None:
+    """Create the counter table and triggers on SQLite, seeding each counter with one COUNT(*)."""
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.begin() as conn:
+        present = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(table_counts)")}
+        if present:
+            for column, ddl in _TABLE_COUNTS_UPGRADE.items():
+                if column not in present:
+                    conn.exec_driver_sql(f"ALTER TABLE table_counts ADD COLUMN {column} {ddl}")
+                    # Triggers from before the column existed do not maintain it; recreate them.
+                    for table in COUNTED_TABLES:
+                        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table}_count_ai")
+                        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {table}_count_ad")
+            conn.exec_driver_sql("UPDATE table_counts SET modified_at = CURRENT_TIMESTAMP WHERE modified_at IS NULL")
+        for statement in TABLE_COUNTS_DDL:
+            conn.exec_driver_sql(statement)
+        for table in COUNTED_TABLES:
+            conn.exec_driver_sql(
+                "INSERT OR IGNORE INTO table_counts (table_name, row_count, modified_at) "
+                f"SELECT '{table}', COUNT(*), CURRENT_TIMESTAMP FROM {table}"
+            )
+
+
+# Daily rollups behind the monthly report, kept current by triggers on every write path. Tickets
+# and leads are bucketed by creation day, tasks by due day; NULL keys (e.g. rows written before
+# ``leads.created_at`` existed) land in the '' bucket so deletes always find their row again.
+# Keys lead with the month and end with the day, and the tables are clustered on them
+# (WITHOUT ROWID), so a monthly GROUP BY is one ordered range scan with no sort.
+ROLLUPS = {
+    "ticket_daily": {
+        "source": "tickets",
+        "key": {
+            "month": "substr(date({row}.created_at), 1, 7)",
+            "category": "{row}.category",
+            "status": "{row}.status",
+            "day": "date({row}.created_at)",
+        },
+        "measures": {"tickets": ("INTEGER", "1")},
+    },
+    "task_daily": {
+        "source": "tasks",
+        "key": {"month": "substr(date({row}.due_date), 1, 7)", "status": "{row}.status", "day": "date({row}.due_date)"},
+        "measures": {"tasks": ("INTEGER", "1")},
+    },
+    "lead_daily": {
+        "source": "leads",
+        "key": {"month": "substr(date({row}.created_at), 1, 7)", "source": "{row}.source", "day": "date({row}.created_at)"},
+        "measures": {"leads": ("INTEGER", "1"), "deal_size": ("REAL", "COALESCE({row}.deal_size, 0)")},
+    },
+}
+_ROLLUP_WATCHED = {"tickets": "created_at, category, status", "tasks": "due_date, status", "leads": "created_at, source, deal_size"}
+
+
+def _rollup_ddl(name: str, spec: dict) -> list[str]:
+    """Table, backfill and insert/delete/update triggers for one rollup."""
+    source, key, measures = spec["source"], spec["key"], spec["measures"]
+    key_columns = ", ".join(key)
+    columns = ", ".join([*(f"{column} TEXT NOT NULL" for column in key), *(f"{m} {t} NOT NULL" for m, (t, _) in measures.items())])
+
+    def key_exprs(row: str) -> list[str]:
+        return [f"COALESCE({expr.format(row=row)}, '')" for expr in key.values()]
+
+    def add(row: str) -> str:
+        values = ", ".join([*key_exprs(row), *(expr.format(row=row) for _, expr in measures.values())])
+        updates = ", ".join(f"{m} = {m} + excluded.{m}" for m in measures)
+        return f"INSERT INTO {name} VALUES ({values}) ON CONFLICT ({key_columns}) DO UPDATE SET {updates};"
+
+    def remove(row: str) -> str:
+        updates = ", ".join(f"{m} = {m} - {expr.format(row=row)}" for m, (_, expr) in measures.items())
+        match = " AND ".join(f"{column} = {expr}" for column, expr in zip(key, key_exprs(row)))
+        return f"UPDATE {name} SET {updates} WHERE {match};"
+
+    sums = ", ".join(f"SUM({expr.format(row=source)})" for _, expr in measures.values())
+    groups = ", ".join(str(position) for position in range(1, len(key) + 1))
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} ({columns}, PRIMARY KEY ({key_columns})) WITHOUT ROWID",
+        f"INSERT INTO {name} SELECT {', '.join(key_exprs(source))}, {sums} FROM {source} GROUP BY {groups}",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ai AFTER INSERT ON {source} BEGIN {add('new')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {name}_ad AFTER DELETE ON {source} BEGIN {remove('old')} END",
+        (
+            f"CREATE TRIGGER IF NOT EXISTS {name}_au AFTER UPDATE OF {_ROLLUP_WATCHED[source]} ON {source} "
+            f"BEGIN {remove('old')} {add('new')} END"
+        ),
+    ]
+
+
+def init_rollups(bind: Engine) -> None:
+    """Create the daily rollup tables and triggers on SQLite, backfilling each new table once."""
+    if bind.dialect.name != "sqlite":
+        return
+    existing = set(inspect(bind).get_table_names())
+    with bind.begin() as conn:
+        for name, spec in ROLLUPS.items():
+            create, backfill, *triggers = _rollup_ddl(name, spec)
+            conn.exec_driver_sql(create)
+            if name not in existing:
+                conn.exec_driver_sql(backfill)
+            for statement in triggers:
+                conn.exec_driver_sql(statement)
+
+
+DUE_ON_SYNC_DDL = """CREATE TRIGGER IF NOT EXISTS tasks_due_on_au AFTER UPDATE OF due_date ON tasks BEGIN
+    UPDATE tasks SET due_on = date(new.due_date) WHERE id = new.id;
+END"""
+
+
+def backfill_due_on(bind: Engine, chunk_size: int = 5000) -> int:
+    """Fill ``tasks.due_on`` for rows written before it existed; returns the number of rows parsed.
+
+    Runs in ``chunk_size`` batches so a large table is never held in memory at once. On SQLite it
+    also installs the trigger that keeps ``due_on`` in step with later ``due_date`` updates.
+    """
+    pending = select(Task.id, Task.due_date).where(Task.due_on.is_(None), Task.id > bindparam("after")).order_by(Task.id)
+    store = update(Task.__table__).where(Task.__table__.c.id == bindparam("row_id")).values(due_on=bindparam("parsed"))
+    filled, after = 0, 0
+    with bind.begin() as conn:
+        if bind.dialect.name == "sqlite":
+            conn.exec_driver_sql(DUE_ON_SYNC_DDL)
+        while True:
+            rows = conn.execute(pending.limit(chunk_size), {"after": after}).all()
+            if not rows:
+                return filled
+            after = rows[-1].id
+            parsed = [{"row_id": row.id, "parsed": parse_due_date(row.due_date)} for row in rows]
+            parsed = [params for params in parsed if params["parsed"] is not None]
+            if parsed:
+                conn.execute(store, parsed)
+                filled += len(parsed)
+
+
+def add_missing_columns(bind: Engine) -> None:
+    """Add model columns missing from existing tables as nullable columns; existing rows get NULL."""
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in present:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+
+
+# Bump whenever the models or the SQLite DDL above change, so existing databases get upgraded.
+SCHEMA_VERSION = 4
+_INIT_LOCK = threading.Lock()
+_initialized: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+
+def schema_version(bind: Engine) -> int | None:
+    """Schema version recorded in the database (SQLite ``user_version``); ``None`` elsewhere."""
+    if bind.dialect.name != "sqlite":
+        return None
+    with bind.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def _create_schema(bind: Engine) -> None:
+    Base.metadata.create_all(bind=bind)
+    add_missing_columns(bind)
+    # create_all skips indexes on tables that already exist, so add any new ones explicitly.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    backfill_due_on(bind)
+    init_ticket_search(bind)
+    init_table_counts(bind)
+    init_rollups(bind)
+    session = SessionLocal(bind=bind)
     try:
         if not session.query(User).filter(User.username == "admin").first():
             session.add(User(username="admin", password="admin123", role="admin"))
             session.commit()
     finally:
         session.close()
+    if bind.dialect.name == "sqlite":
+        with bind.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def init_db(bind: Engine | None = None) -> None:
+    """Create or upgrade the schema on ``bind`` (default: the app engine) and seed the admin user.
+
+    Runs at most once per engine per process. A SQLite database already at
+    :data:`SCHEMA_VERSION` costs one ``PRAGMA user_version`` read; other databases always get the
+    (idempotent) full init on first call.
+    """
+    bind = bind or engine
+    with _INIT_LOCK:
+        if bind in _initialized:
+            return
+        if schema_version(bind) != SCHEMA_VERSION:
+            _create_schema(bind)
+        _initialized.add(bind)
@@ -0,0 +1,150 @@
+"""Constant-memory table export: rows streamed in ``yield_per`` partitions as CSV, NDJSON or Parquet."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from typing import Any
+
+from sqlalchemy import JSON, Date, DateTime, Float, Integer, String, select, type_coerce
+from sqlalchemy.engine import Engine, Row
+
+from app.services.database import Lead, Task, Ticket
+
+EXPORT_TABLES = {"tickets": Ticket, "leads": Lead, "tasks": Task}
+EXPORT_BATCH_SIZE = 10_000
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson", "parquet": "application/vnd.apache.parquet"}
+
+
+class ExportUnavailable(RuntimeError):
+    """Raised when an export format needs an optional dependency that is not installed."""
+
+
+def _json_columns(model: type) -> list[str]:
+    return [column.name for column in model.__table__.columns if isinstance(column.type, JSON)]
+
+
+def iter_batches(bind: Engine, model: type, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[list[Row]]:
+    """Yield the table in id order, ``batch_size`` rows at a time, from a single streaming cursor.
+
+    JSON columns come back as their stored JSON text rather than decoded objects.
+    """
+    table = model.__table__
+    json_columns = set(_json_columns(model))
+    columns = [type_coerce(column, String) if column.name in json_columns else column for column in table.columns]
+    with bind.connect() as conn:
+        result = conn.execution_options(yield_per=batch_size).execute(select(*columns).order_by(table.c.id))
+        yield from result.partitions()
+
+
+def _text_rows(model: type, rows: list[Row]) -> Iterator[list[Any]]:
+    """Rows with dates and datetimes as ISO 8601 strings; only those columns are touched."""
+    positions = [i for i, column in enumerate(model.__table__.columns) if isinstance(column.type, (DateTime, Date))]
+    for row in rows:
+        values = list(row)
+        for i in positions:
+            if values[i] is not None:
+                values[i] = values[i].isoformat()
+        yield values
+
+
+def export_csv(model: type, batches: Iterator[list[Row]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in model.__table__.columns])
+    yield buffer.getvalue().encode()
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_text_rows(model, rows))
+        yield buffer.getvalue().encode()
+
+
+def export_ndjson(model: type, batches: Iterator[list[Row]]) -> Iterator[bytes]:
+    """One JSON object per line; JSON columns are nested as objects."""
+    names = [column.name for column in model.__table__.columns]
+    json_positions = [i for i, name in enumerate(names) if name in _json_columns(model)]
+    for rows in batches:
+        lines = []
+        for values in _text_rows(model, rows):
+            for i in json_positions:
+                if values[i] is not None:
+                    values[i] = json.loads(values[i])
+            lines.append(json.dumps(dict(zip(names, values))))
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its bytes back after each Parquet row group."""
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self.chunks.append(chunk)
+        self.position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _arrow_schema(model: type) -> Any:
+    import pyarrow as pa
+
+    def arrow_type(column: Any) -> Any:
+        if isinstance(column.type, Integer):
+            return pa.int64()
+        if isinstance(column.type, Float):
+            return pa.float64()
+        if isinstance(column.type, DateTime):
+            return pa.timestamp("us")
+        if isinstance(column.type, Date):
+            return pa.date32()
+        return pa.string()
+
+    return pa.schema([pa.field(column.name, arrow_type(column)) for column in model.__table__.columns])
+
+
+def export_parquet(model: type, batches: Iterator[list[Row]]) -> Iterator[bytes]:
+    """One Parquet row group per batch; JSON columns are written as JSON text."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(model)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in batches:
+            data = dict(zip(schema.names, (list(values) for values in zip(*rows))))
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def export_table(bind: Engine, name: str, fmt: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Encoded chunks of table ``name`` in ``fmt``; nothing is read until the iterator is consumed.
+
+    Raises :class:`ExportUnavailable` up front, before any bytes are produced.
+    """
+    model = EXPORT_TABLES[name]
+    batches = iter_batches(bind, model, batch_size)
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError as exc:
+            raise ExportUnavailable("Parquet export requires pyarrow") from exc
+        return export_parquet(model, batches)
+    if fmt == "ndjson":
+        return export_ndjson(model, batches)
+    return export_csv(model, batches)
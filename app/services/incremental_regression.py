@@ -0,0 +1,114 @@
+"""Out-of-core linear regression fitted chunk by chunk from normal-equation sufficient statistics."""
+from __future__ import annotations
+
+from typing import IO, Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.large_csv import DEFAULT_CHUNK_ROWS, iter_csv_chunks
+
+
+class IncrementalLinearRegression:
+    """Ordinary least squares with intercept, equivalent to ``sklearn.linear_model.LinearRegression``.
+
+    Only ``X'X``, ``X'y`` and ``y'y`` (p x p floats) are kept, so memory does not grow with the
+    number of rows. Inputs are shifted by the first chunk's means before accumulating, which
+    keeps the normal equations well conditioned for large-magnitude features.
+    """
+
+    def __init__(self) -> None:
+        self.n_samples_ = 0
+        self.feature_names_in_: list[str] | None = None
+        self.target_name_: str | None = None
+        self.coef_: np.ndarray | None = None
+        self.intercept_: float | None = None
+        self._shift_x: np.ndarray | None = None
+        self._shift_y = 0.0
+        self._xtx: np.ndarray | None = None
+        self._xty: np.ndarray | None = None
+        self._yty = 0.0
+        self._y_sum = 0.0
+        self._beta: np.ndarray | None = None
+
+    def partial_fit(self, X: Any, y: Any) -> IncrementalLinearRegression:
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is None:
+            self.feature_names_in_ = [str(col) for col in X.columns]
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if not len(y):
+            return self
+        if self._xtx is None:
+            self._shift_x = X.mean(axis=0)
+            self._shift_y = float(y.mean())
+            size = X.shape[1] + 1
+            self._xtx = np.zeros((size, size))
+            self._xty = np.zeros(size)
+        design = np.empty((len(y), X.shape[1] + 1))
+        design[:, 0] = 1.0
+        design[:, 1:] = X - self._shift_x
+        centered_y = y - self._shift_y
+        self._xtx += design.T @ design
+        self._xty += design.T @ centered_y
+        self._yty += float(centered_y @ centered_y)
+        self._y_sum += float(centered_y.sum())
+        self.n_samples_ += len(y)
+        self._solve()
+        return self
+
+    def _solve(self) -> None:
+        beta = np.linalg.lstsq(self._xtx, self._xty, rcond=None)[0]
+        self.coef_ = beta[1:]
+        self.intercept_ = float(beta[0] + self._shift_y - beta[1:] @ self._shift_x)
+        self._beta = beta
+
+    def predict(self, X: Any) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        return X @ self.coef_ + self.intercept_
+
+    def r2_score(self) -> float:
+        """Coefficient of determination on the fitted data, from the accumulated statistics."""
+        sse = self._yty - 2 * self._beta @ self._xty + self._beta @ self._xtx @ self._beta
+        sst = self._yty - self._y_sum**2 / self.n_samples_
+        return float(1 - sse / sst) if sst > 0 else 1.0
+
+
+def fit_csv(
+    source: str | IO[Any],
+    target: str | None = None,
+    features: list[str] | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> tuple[IncrementalLinearRegression, pd.DataFrame | None]:
+    """Fit on a CSV stream; returns the model and the last complete feature row.
+
+    Without ``target``/``features`` this mirrors the in-memory Analyst Bot model: the last
+    numeric column is the target, the other numeric columns are features, and rows with a
+    missing value in any of them are dropped.
+    """
+    model = IncrementalLinearRegression()
+    last_row = None
+    columns: list[str] | None = None
+    for chunk in iter_csv_chunks(source, chunk_rows):
+        if columns is None:
+            numeric = chunk.select_dtypes(include=np.number).columns.tolist()
+            target = target or (numeric[-1] if numeric else None)
+            features = features or [col for col in numeric if col != target]
+            if target is None or not features:
+                raise ValueError("Regression needs a numeric target and at least one numeric feature")
+            columns = [*features, target]
+            model.target_name_ = target
+            missing = [col for col in columns if col not in chunk.columns]
+            if missing:
+                raise ValueError(f"Unknown columns: {', '.join(missing)}")
+        data = chunk[columns].dropna()
+        if data.empty:
+            continue
+        model.partial_fit(data[features], data[target])
+        last_row = data[features].tail(1)
+    if not model.n_samples_:
+        raise ValueError("No complete rows to fit")
+    return model, last_row
@@ -0,0 +1,122 @@
+"""Bulk row ingestion: streaming CSV/NDJSON/JSON parsing and chunked executemany inserts."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "json",
+}
+SUFFIXES = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".json": "json"}
+
+
+class UnsupportedFormat(ValueError):
+    """Raised when an upload is neither CSV, NDJSON nor a JSON array."""
+
+
+def detect_format(content_type: str | None, filename: str | None = None) -> str:
+    if filename:
+        for suffix, fmt in SUFFIXES.items():
+            if filename.lower().endswith(suffix):
+                return fmt
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in FORMATS:
+        return FORMATS[media_type]
+    raise UnsupportedFormat(f"Unsupported upload format: {media_type or 'unknown'}")
+
+
+def iter_records(stream: IO[bytes], fmt: str) -> Iterator[Any]:
+    """Yield raw records one at a time from a binary file object without loading it whole."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        # Empty cells are treated as missing so model defaults apply.
+        for row in csv.DictReader(text):
+            yield {key: value for key, value in row.items() if key and value not in ("", None)}
+    elif fmt == "ndjson":
+        for line in text:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield exc
+    elif fmt == "json":
+        records = json.load(text)
+        if not isinstance(records, list):
+            raise UnsupportedFormat("JSON uploads must be an array of objects")
+        yield from records
+    else:
+        raise UnsupportedFormat(f"Unsupported upload format: {fmt}")
+
+
+def _error_detail(exc: Exception) -> list[dict[str, Any]] | str:
+    if isinstance(exc, ValidationError):
+        return [
+            {"field": ".".join(str(part) for part in err["loc"]), "message": err["msg"]}
+            for err in exc.errors(include_url=False)
+        ]
+    return str(exc)
+
+
+def bulk_insert(
+    db: Session,
+    model: type,
+    schema: type[BaseModel],
+    records: Iterable[Any],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    to_row: Callable[[BaseModel], dict[str, Any]] | None = None,
+    prepare_chunk: Callable[[list[dict[str, Any]]], None] | None = None,
+) -> dict[str, Any]:
+    """Validate ``records`` against ``schema`` and insert valid rows into ``model``'s table.
+
+    Rows are written with one executemany per chunk, each chunk in its own transaction, so
+    memory stays bounded by ``chunk_size``. Invalid rows are skipped and reported by their
+    1-based position in the input. ``prepare_chunk`` may fill in derived columns for a whole
+    chunk at once just before it is written.
+    """
+    table = model.__table__
+    statement = insert(table)
+    to_row = to_row or (lambda item: item.model_dump())
+    chunk: list[dict[str, Any]] = []
+    inserted = 0
+    error_count = 0
+    errors: list[dict[str, Any]] = []
+
+    def flush() -> None:
+        nonlocal inserted
+        if chunk:
+            if prepare_chunk is not None:
+                prepare_chunk(chunk)
+            db.execute(statement, chunk)
+            db.commit()
+            inserted += len(chunk)
+            chunk.clear()
+
+    for position, record in enumerate(records, start=1):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            chunk.append(to_row(schema.model_validate(record)))
+        except (ValidationError, ValueError) as exc:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"row": position, "errors": _error_detail(exc)})
+            continue
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return {"inserted": inserted, "error_count": error_count, "errors": errors}
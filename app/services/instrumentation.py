@@ -0,0 +1,263 @@
+"""In-process performance metrics in the Prometheus text format: routes, SQL statements and AI calls.
+
+Metrics live in one process-wide :data:`REGISTRY`. Routes are timed by :class:`MetricsMiddleware`,
+SQL statements by engine events attached with :func:`instrument_engine`, and AI calls by
+``AIEngine`` itself. ``GET /metrics`` renders everything with :meth:`Registry.render`.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Statements slower than this many milliseconds are logged and counted; unset disables the log.
+SLOW_QUERY_MS = float(os.environ["SLOW_QUERY_MS"]) if os.getenv("SLOW_QUERY_MS") else None
+slow_query_log = logging.getLogger("app.slow_queries")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: [count per bucket..., +Inf count, sum].
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        lines = []
+        for key, state in sorted(values.items()):
+            cumulative = 0.0
+            for bound, count in zip([*self.buckets, float("inf")], state):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, bucket_label)} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(state[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_number(cumulative)}")
+        return lines
+
+
+# Collectors return ``(name, kind, help_text, value)`` tuples computed at scrape time.
+Collector = Callable[[], Iterable[tuple[str, str, str, float]]]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list[Counter | Histogram] = []
+        self.collectors: list[Collector] = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), **kwargs: Any) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, **kwargs)
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines += [f"# HELP {metric.name} {metric.help_text}", f"# TYPE {metric.name} {metric.kind}", *metric.samples()]
+        for collector in self.collectors:
+            for name, kind, help_text, value in collector():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds", "SQL statement execution time, including executemany batches.", ("operation", "table")
+)
+DB_SLOW_QUERIES = REGISTRY.counter("db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.", ("operation", "table"))
+AI_REQUEST_SECONDS = REGISTRY.histogram(
+    "ai_request_duration_seconds",
+    "AIEngine call latency; outcome is completion, cache, fallback or rejected.",
+    ("department", "mode", "outcome"),
+)
+AI_FALLBACKS = REGISTRY.counter("ai_fallbacks_total", "AIEngine calls answered by the mock fallback.", ("reason",))
+AI_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "ai_queue_wait_seconds", "Time upstream AI calls waited for a scheduler slot.", ("priority",)
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request until its last body chunk, labelled by route template."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Route templates keep label cardinality bounded; unmatched paths share one label.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, method=scope["method"], route=route, status=str(status)
+            )
+
+
+_TABLE = re.compile(
+    r"\b(?:FROM|INTO|UPDATE|TABLE|ON)\s+(?:IF\s+(?:NOT\s+)?EXISTS\s+)?(?!OF\b)[\"`\[]?(\w+)", re.IGNORECASE
+)
+
+
+def _describe(statement: str) -> tuple[str, str]:
+    words = statement.lstrip().split(None, 1)
+    operation = words[0].upper() if words else ""
+    match = _TABLE.search(statement)
+    return operation, match.group(1) if match else ""
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_started = time.perf_counter()
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    elapsed = time.perf_counter() - context._query_started
+    operation, table = _describe(statement)
+    DB_QUERY_SECONDS.observe(elapsed, operation=operation, table=table)
+    if SLOW_QUERY_MS is not None and elapsed * 1000 >= SLOW_QUERY_MS:
+        DB_SLOW_QUERIES.inc(operation=operation, table=table)
+        slow_query_log.warning(
+            "slow query: %.1f ms%s: %s", elapsed * 1000, " (executemany)" if executemany else "", statement[:1000]
+        )
+
+
+def instrument_engine(bind: Engine) -> None:
+    """Time every statement ``bind`` executes; safe to call more than once."""
+    if not event.contains(bind, "before_cursor_execute", _before_execute):
+        event.listen(bind, "before_cursor_execute", _before_execute)
+        event.listen(bind, "after_cursor_execute", _after_execute)
+
+
+def cache_samples(stats: dict[str, int]) -> list[tuple[str, str, str, float]]:
+    """AI response cache statistics as scrape-time samples."""
+    if not stats:
+        return []
+    return [
+        ("ai_cache_hits_total", "counter", "Memory cache hits.", stats["hits"]),
+        ("ai_cache_disk_hits_total", "counter", "SQLite cache tier hits.", stats["disk_hits"]),
+        ("ai_cache_misses_total", "counter", "Cache misses.", stats["misses"]),
+        ("ai_cache_evictions_total", "counter", "Entries evicted by the LRU bound.", stats["evictions"]),
+        ("ai_cache_expirations_total", "counter", "Entries dropped after their TTL.", stats["expirations"]),
+        ("ai_cache_size", "gauge", "Entries in the memory cache.", stats["size"]),
+        ("ai_cache_max_size", "gauge", "Memory cache capacity.", stats["max_size"]),
+    ]
+
+
+def scheduler_samples(stats: dict[str, Any]) -> list[tuple[str, str, str, float]]:
+    """AI scheduler queue state and admission counters as scrape-time samples."""
+    if not stats:
+        return []
+    return [
+        ("ai_queue_depth", "gauge", "Upstream AI calls waiting for a slot.", stats["queued"]),
+        ("ai_queue_active", "gauge", "Upstream AI calls holding a slot.", stats["active"]),
+        ("ai_queue_granted_total", "counter", "Slots granted.", stats["granted"]),
+        ("ai_deduplicated_total", "counter", "Calls that shared an identical in-flight request.", stats["deduplicated"]),
+        ("ai_rejected_queue_full_total", "counter", "Calls rejected because the queue was full.", stats["rejected_queue_full"]),
+        ("ai_rejected_timeout_total", "counter", "Calls rejected after waiting AI_QUEUE_TIMEOUT.", stats["rejected_timeout"]),
+    ]
+
+
+def reminder_samples(stats: dict[str, Any]) -> list[tuple[str, str, str, float]]:
+    """Reminder scheduler state as scrape-time samples."""
+    if not stats:
+        return []
+    return [
+        ("reminders_queued", "gauge", "Pending reminders held in the scheduler's in-memory window.", stats["queued"]),
+        ("reminders_fired_total", "counter", "Reminders fired by this process.", stats["fired"]),
+        ("reminder_scheduler_errors_total", "counter", "Failed scheduler iterations.", stats["errors"]),
+    ]
@@ -0,0 +1,161 @@
+"""Bounded-memory CSV analytics: chunked compact loading, running stats and LTTB decimation."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import IO, Any
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 200_000
+DEFAULT_PLOT_POINTS = 2_000
+
+
+def compact_dtypes(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """Downcast numerics and turn low-cardinality text columns into categoricals, in place."""
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series):
+            df[col] = pd.to_numeric(series, downcast="float")
+        elif series.dtype == object and len(series) and series.nunique() / len(series) < category_ratio:
+            df[col] = series.astype("category")
+    return df
+
+
+def iter_csv_chunks(source: str | IO[Any], chunk_rows: int = DEFAULT_CHUNK_ROWS, **read_kwargs: Any) -> Iterator[pd.DataFrame]:
+    """Yield compacted frames of at most ``chunk_rows`` rows; never materializes the whole file."""
+    with pd.read_csv(source, chunksize=chunk_rows, low_memory=True, **read_kwargs) as reader:
+        for chunk in reader:
+            yield compact_dtypes(chunk)
+
+
+class RunningStats:
+    """Per-column count/mean/std/min/max merged chunk by chunk (Chan et al. parallel variance)."""
+
+    def __init__(self) -> None:
+        self.count: pd.Series | None = None
+        self.mean: pd.Series | None = None
+        self.m2: pd.Series | None = None
+        self.min: pd.Series | None = None
+        self.max: pd.Series | None = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        values = chunk.select_dtypes(include=np.number).astype(np.float64)
+        count = values.count()
+        mean = values.mean()
+        m2 = ((values - mean) ** 2).sum()
+        if self.count is None:
+            self.count, self.mean, self.m2 = count, mean.fillna(0.0), m2
+            self.min, self.max = values.min(), values.max()
+            return
+        total = self.count.add(count, fill_value=0)
+        delta = mean.fillna(0.0).sub(self.mean, fill_value=0.0)
+        weight = (count / total.where(total > 0)).fillna(0.0)
+        self.mean = self.mean.add(delta * weight, fill_value=0.0)
+        self.m2 = self.m2.add(m2, fill_value=0.0).add(
+            (delta**2 * self.count.reindex(total.index, fill_value=0) * weight).fillna(0.0), fill_value=0.0
+        )
+        self.count = total
+        self.min = pd.concat([self.min, values.min()], axis=1).min(axis=1)
+        self.max = pd.concat([self.max, values.max()], axis=1).max(axis=1)
+
+    def to_frame(self) -> pd.DataFrame:
+        if self.count is None:
+            return pd.DataFrame(columns=["count", "mean", "std", "min", "max"])
+        std = np.sqrt(self.m2 / (self.count - 1).where(self.count > 1))
+        return pd.DataFrame(
+            {"count": self.count.astype(np.int64), "mean": self.mean, "std": std, "min": self.min, "max": self.max}
+        )
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, per bucket, the point forming the largest triangle
+    with the previously kept point and the next bucket's average, which preserves peaks.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts = edges[:-1]
+    sizes = np.maximum(np.diff(edges), 1)
+    # Bucket averages up front; bucket i picks its point against bucket i + 1's average.
+    avg_x = np.add.reduceat(x[: n - 1], starts) / sizes
+    avg_y = np.add.reduceat(y[: n - 1], starts) / sizes
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = starts[i], starts[i] + sizes[i]
+        area = np.abs((x[a] - next_x[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+class StreamingDecimator:
+    """Keeps at most ``2 * max_points`` (x, y) points while a series streams in chunk by chunk."""
+
+    def __init__(self, max_points: int = DEFAULT_PLOT_POINTS) -> None:
+        self.max_points = max_points
+        self.x = np.empty(0, dtype=np.float64)
+        self.y = np.empty(0, dtype=np.float64)
+
+    def update(self, x: pd.Series, y: pd.Series) -> None:
+        mask = x.notna() & y.notna()
+        self.x = np.concatenate([self.x, x[mask].to_numpy(dtype=np.float64)])
+        self.y = np.concatenate([self.y, y[mask].to_numpy(dtype=np.float64)])
+        if len(self.x) > 2 * self.max_points:
+            self._reduce()
+
+    def _reduce(self) -> None:
+        keep = lttb(self.x, self.y, self.max_points)
+        self.x, self.y = self.x[keep], self.y[keep]
+
+    def points(self) -> tuple[np.ndarray, np.ndarray]:
+        if len(self.x) > self.max_points:
+            self._reduce()
+        return self.x, self.y
+
+
+@dataclass
+class LargeCSVSummary:
+    rows: int
+    head: pd.DataFrame
+    stats: pd.DataFrame
+    plot: pd.DataFrame
+    dtypes: dict[str, str] = field(default_factory=dict)
+
+
+def summarize_csv(
+    source: str | IO[Any],
+    x_col: str | None = None,
+    y_col: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    max_points: int = DEFAULT_PLOT_POINTS,
+) -> LargeCSVSummary:
+    """One pass over ``source``: row count, numeric summary stats and a decimated x/y series."""
+    stats = RunningStats()
+    decimator = StreamingDecimator(max_points)
+    rows = 0
+    head = pd.DataFrame()
+    dtypes: dict[str, str] = {}
+    for chunk in iter_csv_chunks(source, chunk_rows):
+        if not rows:
+            head = chunk.head().copy()
+            dtypes = {col: str(dtype) for col, dtype in chunk.dtypes.items()}
+        rows += len(chunk)
+        stats.update(chunk)
+        if x_col and y_col and x_col in chunk and y_col in chunk:
+            decimator.update(chunk[x_col], chunk[y_col])
+    x, y = decimator.points()
+    plot = pd.DataFrame({x_col or "x": x, y_col or "y": y}) if x_col != y_col else pd.DataFrame({x_col: x})
+    return LargeCSVSummary(rows=rows, head=head, stats=stats.to_frame(), plot=plot, dtypes=dtypes)
@@ -0,0 +1,114 @@
+"""Dashboard metrics shared by the API and the Streamlit app, served from a short-TTL cache."""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, String, text
+from sqlalchemy.engine import Engine
+
+from app.services.database import COUNTED_TABLES
+from app.services.database import engine as default_engine
+from app.services.reports import COMPLETED_TASK_STATUSES
+
+_COMPLETED = ", ".join(f"'{status}'" for status in COMPLETED_TASK_STATUSES)
+# One statement for all counts on databases without the trigger-maintained counter table.
+_AGGREGATE_SQL = "SELECT " + ", ".join(
+    [
+        *(f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in COUNTED_TABLES),
+        f"(SELECT COUNT(*) FROM tasks WHERE status IN ({_COMPLETED})) AS tasks_completed",
+    ]
+)
+# On SQLite the task_daily rollup already counts tasks per status.
+_COMPLETED_SQL = text(f"SELECT COALESCE(SUM(tasks), 0) FROM task_daily WHERE status IN ({_COMPLETED})")
+
+
+@dataclass(frozen=True)
+class DashboardMetrics:
+    tickets: int
+    tasks: int
+    leads: int
+    tasks_completed: int = 0
+    # Latest write to any counted table (SQLite only); a validator, not part of the payload.
+    modified_at: datetime | None = field(default=None, compare=False)
+
+    @property
+    def productivity(self) -> int:
+        return min(100, 40 + self.tasks * 4)
+
+    @property
+    def cost_saving(self) -> int:
+        return 12000 + self.leads * 700
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "tickets": self.tickets,
+            "tasks": self.tasks,
+            "leads": self.leads,
+            "tasks_completed": self.tasks_completed,
+            "productivity": self.productivity,
+            "cost_saving": self.cost_saving,
+        }
+
+
+_COUNTERS_SQL = text("SELECT table_name, row_count, modified_at FROM table_counts").columns(
+    table_name=String, row_count=Integer, modified_at=DateTime
+)
+
+
+def read_counts(bind: Engine) -> DashboardMetrics:
+    """Row and completed-task counts from the counter and rollup tables on SQLite, otherwise one aggregate query."""
+    modified_at = None
+    with bind.connect() as conn:
+        if bind.dialect.name == "sqlite":
+            rows = conn.execute(_COUNTERS_SQL).all()
+            counts = {row.table_name: row.row_count for row in rows}
+            modified_at = max((row.modified_at for row in rows if row.modified_at is not None), default=None)
+            counts["tasks_completed"] = conn.execute(_COMPLETED_SQL).scalar_one()
+        else:
+            counts = dict(conn.execute(text(_AGGREGATE_SQL)).one()._mapping)
+    return DashboardMetrics(
+        **{name: int(counts.get(name, 0)) for name in (*COUNTED_TABLES, "tasks_completed")}, modified_at=modified_at
+    )
+
+
+class MetricsService:
+    """Caches :func:`read_counts` for ``ttl`` seconds; concurrent callers share one refresh."""
+
+    def __init__(self, bind: Engine, ttl: float = 2.0) -> None:
+        self.bind = bind
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: DashboardMetrics | None = None
+        self._expires = 0.0
+
+    def snapshot(self) -> DashboardMetrics:
+        value = self._value
+        if value is not None and time.monotonic() < self._expires:
+            return value
+        with self._lock:
+            if self._value is None or time.monotonic() >= self._expires:
+                self._value = read_counts(self.bind)
+                self._expires = time.monotonic() + self.ttl
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires = 0.0
+
+
+_DEFAULT_METRICS: MetricsService | None = None
+_DEFAULT_METRICS_LOCK = threading.Lock()
+
+
+def default_metrics() -> MetricsService:
+    """Process-wide metrics service on the default engine; ``METRICS_TTL`` sets the cache lifetime."""
+    global _DEFAULT_METRICS
+    with _DEFAULT_METRICS_LOCK:
+        if _DEFAULT_METRICS is None:
+            _DEFAULT_METRICS = MetricsService(default_engine, ttl=float(os.getenv("METRICS_TTL", "2")))
+        return _DEFAULT_METRICS
@@ -0,0 +1,98 @@
+"""Fitted-model registry keyed by a content hash of the training data.
+
+A model is refit only when its training data (or the caller's ``version``) changes. Fitted
+models are kept in memory and pickled to ``MODEL_CACHE_DIR`` so new processes skip training.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+T = TypeVar("T")
+
+
+def data_fingerprint(data: pd.DataFrame) -> str:
+    """Hash of column names, dtypes and every value, stable across processes."""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(repr([(str(name), str(dtype)) for name, dtype in data.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, cache_dir: str | Path | None = None, max_memory: int = 32) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_memory = max_memory
+        self._models: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, name: str, key: str) -> Path | None:
+        return self.cache_dir / f"{name}-{key[:16]}.pkl" if self.cache_dir else None
+
+    def get_or_fit(self, name: str, data: pd.DataFrame, fit: Callable[[pd.DataFrame], T], version: str = "1") -> T:
+        """Return the model fitted on ``data``, calling ``fit(data)`` only on a cache miss.
+
+        Bump ``version`` whenever ``fit`` itself changes so stale models are not reused.
+        """
+        key = hashlib.sha256(f"{name}:{version}:{data_fingerprint(data)}".encode()).hexdigest()
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+
+            path = self._path(name, key)
+            model = None
+            if path is not None and path.exists():
+                try:
+                    model = pickle.loads(path.read_bytes())
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                    model = None
+            if model is None:
+                model = fit(data)
+                if path is not None:
+                    self._persist(name, path, model)
+
+            self._models[key] = model
+            while len(self._models) > self.max_memory:
+                self._models.popitem(last=False)
+            return model
+
+    def _persist(self, name: str, path: Path, model: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Older fits of the same model are stale once its data has changed.
+        for stale in path.parent.glob(f"{name}-{'?' * 16}.pkl"):
+            stale.unlink(missing_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(pickle.dumps(model))
+        tmp.replace(path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            if self.cache_dir is not None:
+                for path in self.cache_dir.glob("*.pkl"):
+                    path.unlink(missing_ok=True)
+
+
+_DEFAULT_REGISTRY: ModelRegistry | None = None
+_DEFAULT_REGISTRY_LOCK = threading.Lock()
+
+
+def default_registry() -> ModelRegistry:
+    """Process-wide registry persisting to ``MODEL_CACHE_DIR`` (default ``.model_cache``)."""
+    global _DEFAULT_REGISTRY
+    with _DEFAULT_REGISTRY_LOCK:
+        if _DEFAULT_REGISTRY is None:
+            _DEFAULT_REGISTRY = ModelRegistry(os.getenv("MODEL_CACHE_DIR", ".model_cache"))
+        return _DEFAULT_REGISTRY
@@ -0,0 +1,28 @@
+"""Opaque keyset-pagination cursors shared by the list endpoints."""
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a cursor that cannot be decoded."""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort-key values of the last row on a page into a URL-safe token."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Unpack a token produced by :func:`encode_cursor` into ``size`` sort-key values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed pagination cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Malformed pagination cursor")
+    return values
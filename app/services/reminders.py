@@ -0,0 +1,276 @@
+"""Persisted reminders fired on time by a scheduler that only holds the next window in memory.
+
+Reminders live in the ``reminders`` table. :class:`ReminderScheduler` keeps the ones due before
+its horizon (``now + window``) in a heap of ``(remind_at, id)`` pairs and reloads the window from
+the partial index on pending rows every ``refresh`` seconds, so memory follows the near future
+rather than the whole backlog, and reminders written by other processes are picked up on the next
+refresh. Due reminders are claimed with a conditional ``UPDATE`` before ``on_fire`` sees them, so
+several schedulers on one database never fire a reminder twice.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Engine
+
+from app.services.database import Reminder, engine
+
+FIRE_BATCH = 500
+
+reminder_log = logging.getLogger("app.reminders")
+
+
+@dataclass(frozen=True)
+class FiredReminder:
+    id: int
+    task_id: int | None
+    message: str
+    remind_at: datetime
+    fired_at: datetime
+    created_at: datetime | None = None
+
+    @property
+    def due_at(self) -> datetime:
+        """When the reminder could first fire: ``remind_at``, or its creation if it was overdue by then."""
+        if self.created_at is None:
+            return self.remind_at
+        return max(self.remind_at, self.created_at)
+
+
+def log_reminders(fired: list[FiredReminder]) -> None:
+    """Default ``on_fire``: one log line per reminder."""
+    for reminder in fired:
+        task = f" (task {reminder.task_id})" if reminder.task_id is not None else ""
+        reminder_log.info("reminder %s%s due %s: %s", reminder.id, task, reminder.remind_at, reminder.message)
+
+
+def utc_now() -> datetime:
+    """Current time as naive UTC, the form ``remind_at`` and ``fired_at`` are stored in."""
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def to_utc_naive(moment: datetime) -> datetime:
+    """Naive UTC for storage; naive input is taken to be UTC already."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(UTC).replace(tzinfo=None)
+
+
+def create_reminder(bind: Engine, message: str, remind_at: datetime, task_id: int | None = None) -> int:
+    with bind.begin() as conn:
+        statement = insert(Reminder).values(
+            message=message, remind_at=to_utc_naive(remind_at), task_id=task_id, created_at=utc_now()
+        )
+        return conn.execute(statement.returning(Reminder.id)).scalar_one()
+
+
+def upcoming_reminders(bind: Engine, limit: int = 50) -> list[dict[str, Any]]:
+    """Next pending reminders, soonest first."""
+    query = (
+        select(Reminder.id, Reminder.task_id, Reminder.message, Reminder.remind_at)
+        .where(Reminder.fired_at.is_(None))
+        .order_by(Reminder.remind_at, Reminder.id)
+        .limit(limit)
+    )
+    with bind.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def recently_fired(bind: Engine, limit: int = 20) -> list[dict[str, Any]]:
+    query = (
+        select(Reminder.id, Reminder.task_id, Reminder.message, Reminder.remind_at, Reminder.fired_at)
+        .where(Reminder.fired_at.is_not(None))
+        .order_by(Reminder.id.desc())
+        .limit(limit)
+    )
+    with bind.connect() as conn:
+        return [dict(row._mapping) for row in conn.execute(query)]
+
+
+def _percentile_ms(ordered: list[float], fraction: float) -> float | None:
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+
+class ReminderScheduler:
+    def __init__(
+        self,
+        bind: Engine,
+        on_fire: Callable[[list[FiredReminder]], None] = log_reminders,
+        window: float = 600.0,
+        refresh: float = 30.0,
+    ) -> None:
+        self.bind = bind
+        self.on_fire = on_fire
+        self.window = timedelta(seconds=window)
+        self.refresh = refresh
+        self._cond = threading.Condition()
+        self._heap: list[tuple[datetime, int]] = []
+        self._queued: set[int] = set()
+        self._horizon = datetime.min
+        self._next_refresh = 0.0
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        # Seconds between ``due_at`` and the claim, for the most recent fires. Reminders created
+        # already overdue count from their creation, so they don't skew the percentiles.
+        self._lateness: deque[float] = deque(maxlen=4096)
+        self._stats = {"fired": 0, "loaded": 0, "refreshes": 0, "errors": 0}
+
+    def start(self) -> None:
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="reminder-scheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+
+    def schedule(self, message: str, remind_at: datetime, task_id: int | None = None) -> int:
+        """Persist a reminder and, if it falls inside the loaded window, queue it right away."""
+        remind_at = to_utc_naive(remind_at)
+        reminder_id = create_reminder(self.bind, message, remind_at, task_id)
+        self._offer([(remind_at, reminder_id)])
+        return reminder_id
+
+    def _offer(self, entries: Iterable[tuple[datetime, int]]) -> int:
+        added = 0
+        with self._cond:
+            for remind_at, reminder_id in entries:
+                # Later reminders stay in the database until the window reaches them.
+                if remind_at >= self._horizon or reminder_id in self._queued:
+                    continue
+                heapq.heappush(self._heap, (remind_at, reminder_id))
+                self._queued.add(reminder_id)
+                added += 1
+            if added:
+                self._cond.notify_all()
+        return added
+
+    def _refresh(self) -> None:
+        horizon = utc_now() + self.window
+        # Move the horizon first: a reminder scheduled while the query runs is then either queued
+        # by ``schedule`` or returned here, and ``_queued`` drops the duplicate.
+        with self._cond:
+            self._horizon = horizon
+            self._next_refresh = time.monotonic() + self.refresh
+        query = (
+            select(Reminder.remind_at, Reminder.id)
+            .where(Reminder.fired_at.is_(None), Reminder.remind_at < horizon)
+            .order_by(Reminder.remind_at, Reminder.id)
+        )
+        with self.bind.connect() as conn:
+            loaded = self._offer(conn.execute(query).tuples())
+        self._stats["loaded"] += loaded
+        self._stats["refreshes"] += 1
+
+    def _claim(self, ids: list[int]) -> list[FiredReminder]:
+        fired_at = utc_now()
+        table = Reminder.__table__
+        columns = (table.c.id, table.c.task_id, table.c.message, table.c.remind_at, table.c.created_at)
+        claimed = []
+        with self.bind.begin() as conn:
+            for start in range(0, len(ids), FIRE_BATCH):
+                chunk = ids[start : start + FIRE_BATCH]
+                statement = (
+                    update(table).where(table.c.id.in_(chunk), table.c.fired_at.is_(None)).values(fired_at=fired_at)
+                )
+                if self.bind.dialect.update_returning:
+                    rows = conn.execute(statement.returning(*columns))
+                else:
+                    pending = select(*columns).where(table.c.id.in_(chunk), table.c.fired_at.is_(None))
+                    rows = conn.execute(pending).all()
+                    conn.execute(statement)
+                claimed += [
+                    FiredReminder(row.id, row.task_id, row.message, row.remind_at, fired_at, row.created_at) for row in rows
+                ]
+        return claimed
+
+    def _fire(self, due: list[int]) -> None:
+        fired = self._claim(due)
+        if not fired:
+            return
+        with self._cond:
+            self._stats["fired"] += len(fired)
+            self._lateness.extend((r.fired_at - r.due_at).total_seconds() for r in fired)
+        self.on_fire(fired)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                refresh_due = time.monotonic() >= self._next_refresh
+            try:
+                if refresh_due:
+                    self._refresh()
+                due = []
+                with self._cond:
+                    now = utc_now()
+                    while self._heap and self._heap[0][0] <= now:
+                        _, reminder_id = heapq.heappop(self._heap)
+                        self._queued.discard(reminder_id)
+                        due.append(reminder_id)
+                    if not due:
+                        timeout = self._next_refresh - time.monotonic()
+                        if self._heap:
+                            timeout = min(timeout, (self._heap[0][0] - now).total_seconds())
+                        if timeout > 0 and not self._stopping:
+                            self._cond.wait(timeout)
+                        continue
+                self._fire(due)
+            except Exception:  # noqa: BLE001 - keep the thread alive; unclaimed rows reload on the next refresh
+                reminder_log.exception("reminder scheduler iteration failed")
+                with self._cond:
+                    self._stats["errors"] += 1
+                    self._next_refresh = time.monotonic() + self.refresh
+                    self._cond.wait(1.0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            lateness = sorted(self._lateness)
+            return {
+                "running": self._thread is not None,
+                "queued": len(self._heap),
+                "next_due": self._heap[0][0] if self._heap else None,
+                "horizon": self._horizon if self._horizon != datetime.min else None,
+                "window_seconds": self.window.total_seconds(),
+                "lateness_ms_p50": _percentile_ms(lateness, 0.50),
+                "lateness_ms_p99": _percentile_ms(lateness, 0.99),
+                **self._stats,
+            }
+
+
+_DEFAULT_SCHEDULER: ReminderScheduler | None = None
+_DEFAULT_SCHEDULER_LOCK = threading.Lock()
+
+
+def default_reminder_scheduler() -> ReminderScheduler:
+    """Process-wide scheduler on the app engine, sized by ``REMINDER_WINDOW_SECONDS`` (default 600)
+    and ``REMINDER_REFRESH_SECONDS`` (default 30). Not started; callers call :meth:`start`."""
+    global _DEFAULT_SCHEDULER
+    with _DEFAULT_SCHEDULER_LOCK:
+        if _DEFAULT_SCHEDULER is None:
+            _DEFAULT_SCHEDULER = ReminderScheduler(
+                engine,
+                window=float(os.getenv("REMINDER_WINDOW_SECONDS", "600")),
+                refresh=float(os.getenv("REMINDER_REFRESH_SECONDS", "30")),
+            )
+        return _DEFAULT_SCHEDULER
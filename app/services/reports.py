@@ -0,0 +1,169 @@
+"""Monthly report aggregated from the daily rollup tables (or the raw tables when there are none)."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy import String, cast, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.services.database import ROLLUPS, Lead, Task, Ticket
+
+COMPLETED_TASK_STATUSES = ("Completed", "Done")
+
+_ROLLUP_SQL = {
+    "tickets": "SELECT month, category, status, SUM(tickets) FROM ticket_daily "
+    "WHERE month BETWEEN :start AND :end GROUP BY month, category, status",
+    "tasks": "SELECT month, status, SUM(tasks) FROM task_daily WHERE month BETWEEN :start AND :end GROUP BY month, status",
+    "leads": "SELECT month, source, SUM(leads), SUM(deal_size) FROM lead_daily "
+    "WHERE month BETWEEN :start AND :end GROUP BY month, source",
+}
+
+
+def month_range(months: int, end: str | None = None) -> list[str]:
+    """The ``months`` calendar months ending with ``end`` (``YYYY-MM``, default: this month)."""
+    year, month = (int(part) for part in end.split("-")) if end else (date.today().year, date.today().month)
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {end}")
+    index = year * 12 + month - 1
+    return [f"{i // 12:04d}-{i % 12 + 1:02d}" for i in range(index - months + 1, index + 1)]
+
+
+def _next_month(month: str) -> str:
+    year, number = (int(part) for part in month.split("-"))
+    return f"{year + number // 12:04d}-{number % 12 + 1:02d}"
+
+
+def _rollup_rows(conn: Connection, start: str, end: str) -> dict[str, list[tuple]]:
+    params = {"start": start, "end": end}
+    return {name: [tuple(row) for row in conn.execute(text(sql), params)] for name, sql in _ROLLUP_SQL.items()}
+
+
+def _source_rows(conn: Connection, start: str, end: str) -> dict[str, list[tuple]]:
+    """The same aggregates computed by scanning the raw tables."""
+    stop = f"{_next_month(end)}-01"
+
+    def day(column: Any) -> Any:
+        return cast(func.date(column), String)
+
+    def month(column: Any) -> Any:
+        return func.substr(day(column), 1, 7)
+
+    def coalesce(column: Any) -> Any:
+        return func.coalesce(column, "")
+
+    def in_range(column: Any) -> Any:
+        return (day(column) >= f"{start}-01") & (day(column) < stop)
+
+    ticket_month, task_month, lead_month = month(Ticket.created_at), month(Task.due_date), month(Lead.created_at)
+    queries = {
+        "tickets": select(ticket_month, coalesce(Ticket.category), coalesce(Ticket.status), func.count())
+        .where(in_range(Ticket.created_at))
+        .group_by(ticket_month, coalesce(Ticket.category), coalesce(Ticket.status)),
+        "tasks": select(task_month, coalesce(Task.status), func.count())
+        .where(in_range(Task.due_date))
+        .group_by(task_month, coalesce(Task.status)),
+        "leads": select(lead_month, coalesce(Lead.source), func.count(), func.coalesce(func.sum(Lead.deal_size), 0))
+        .where(in_range(Lead.created_at))
+        .group_by(lead_month, coalesce(Lead.source)),
+    }
+    return {name: [tuple(row) for row in conn.execute(query)] for name, query in queries.items()}
+
+
+def _percent_change(current: float, previous: float) -> float | None:
+    return round((current - previous) / previous * 100, 1) if previous else None
+
+
+def build_report(rows: dict[str, list[tuple]], months: list[str]) -> dict[str, Any]:
+    """Shape grouped ``(month, key..., measures...)`` rows into per-month sections and insights."""
+    report = {
+        month: {
+            "month": month,
+            "tickets": {"total": 0, "by_category": {}, "by_status": {}},
+            "tasks": {"total": 0, "completed": 0, "completion_rate": None, "by_status": {}},
+            "leads": {"total": 0, "deal_size": 0.0, "by_source": {}},
+        }
+        for month in months
+    }
+    for month, category, status, count in rows["tickets"]:
+        if month in report and count:
+            tickets = report[month]["tickets"]
+            tickets["total"] += count
+            tickets["by_category"][category] = tickets["by_category"].get(category, 0) + count
+            tickets["by_status"][status] = tickets["by_status"].get(status, 0) + count
+    for month, status, count in rows["tasks"]:
+        if month in report and count:
+            tasks = report[month]["tasks"]
+            tasks["total"] += count
+            tasks["by_status"][status] = tasks["by_status"].get(status, 0) + count
+            if status in COMPLETED_TASK_STATUSES:
+                tasks["completed"] += count
+    for month, source, count, deal_size in rows["leads"]:
+        if month in report and count:
+            leads = report[month]["leads"]
+            leads["total"] += count
+            leads["deal_size"] = round(leads["deal_size"] + deal_size, 2)
+            leads["by_source"][source] = {"leads": count, "deal_size": round(deal_size, 2)}
+    for section in report.values():
+        tasks = section["tasks"]
+        if tasks["total"]:
+            tasks["completion_rate"] = round(tasks["completed"] / tasks["total"] * 100, 1)
+
+    sections = list(report.values())
+    current = sections[-1]
+    previous = sections[-2] if len(sections) > 1 else None
+    insights = []
+    if current["tickets"]["total"]:
+        top_category, top_count = max(current["tickets"]["by_category"].items(), key=lambda item: item[1])
+        change = _percent_change(current["tickets"]["total"], previous["tickets"]["total"]) if previous else None
+        trend = f" ({change:+.1f}% vs {previous['month']})" if change is not None else ""
+        insights.append(
+            f"{current['tickets']['total']} tickets in {current['month']}{trend}; "
+            f"top category {top_category} ({top_count / current['tickets']['total']:.0%})"
+        )
+    if current["tasks"]["total"]:
+        insights.append(
+            f"{current['tasks']['completed']} of {current['tasks']['total']} tasks due in {current['month']} "
+            f"completed ({current['tasks']['completion_rate']}%)"
+        )
+    if current["leads"]["total"]:
+        top_source, top = max(current["leads"]["by_source"].items(), key=lambda item: item[1]["deal_size"])
+        insights.append(
+            f"{current['leads']['total']} new leads worth ${current['leads']['deal_size']:,.0f}; "
+            f"{top_source} brought the most deal value (${top['deal_size']:,.0f})"
+        )
+    return {
+        "summary": f"Monthly automation report for {months[0]} to {months[-1]}.",
+        "period": {"start": months[0], "end": months[-1]},
+        "insights": insights or [f"No activity recorded in {current['month']}."],
+        "months": sections,
+    }
+
+
+def has_activity(bind: Engine) -> bool:
+    """Whether any ticket, task or lead exists; reads the rollups on SQLite, never a cached count."""
+    with bind.connect() as conn:
+        if bind.dialect.name == "sqlite":
+            # Deletes leave zeroed rollup rows behind, so only positive counts mean data.
+            checks = [
+                text(f"SELECT 1 FROM {name} WHERE {next(iter(spec['measures']))} > 0 LIMIT 1") for name, spec in ROLLUPS.items()
+            ]
+        else:
+            checks = [select(model.id).limit(1) for model in (Ticket, Task, Lead)]
+        return any(conn.execute(check).first() is not None for check in checks)
+
+
+def monthly_report(bind: Engine, months: int = 12, end: str | None = None, from_source: bool = False) -> dict[str, Any]:
+    """Report for the ``months`` months ending at ``end``.
+
+    On SQLite the figures come from the trigger-maintained daily rollups, so the cost depends on
+    the number of months covered, not on table size. ``from_source`` (and any other database)
+    recomputes the same figures from the raw tables.
+    """
+    period = month_range(months, end)
+    with bind.connect() as conn:
+        if bind.dialect.name == "sqlite" and not from_source:
+            rows = _rollup_rows(conn, period[0], period[-1])
+        else:
+            rows = _source_rows(conn, period[0], period[-1])
+    return build_report(rows, period)
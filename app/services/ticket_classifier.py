@@ -0,0 +1,186 @@
+"""Ticket/complaint category classifier: hashed n-gram features with a linear model.
+
+Trained from ``Ticket.issue``/``Ticket.category`` rows (never from its own predictions) plus a
+small seed corpus, pickled to
+``MODEL_CACHE_DIR`` and loaded once per process. Hashing features are stateless, so batch
+classification is a sparse matrix product and runs at thousands of texts per second.
+"""
+from __future__ import annotations
+
+import os
+import pickle
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.services.database import Ticket
+
+MAX_TRAINING_ROWS = 200_000
+# Bump when the training set or features change; a persisted model of another version is retrained.
+TRAINING_VERSION = 2
+
+# Keeps the classifier usable on an empty database and anchors each category.
+SEED_EXAMPLES = {
+    "Billing": [
+        "I was charged twice for my subscription",
+        "Please refund the duplicate payment on my invoice",
+        "My credit card was billed the wrong amount",
+        "Need a copy of last month's invoice and receipt",
+        "Cancel my plan and stop charging me",
+    ],
+    "Technical": [
+        "The app crashes with an error when I log in",
+        "Found a bug: the export button does nothing",
+        "Password reset link is broken and the page won't load",
+        "API returns 500 errors since the last update",
+        "Dashboard is very slow and keeps timing out",
+    ],
+    "Logistics": [
+        "My order has not been delivered yet",
+        "The package arrived damaged during shipping",
+        "Tracking number shows no updates for a week",
+        "I received the wrong item in my delivery",
+        "Can I change the shipping address for my order",
+    ],
+    "General": [
+        "What are your business hours",
+        "I would like more information about your company",
+        "How do I contact the sales team",
+        "Thanks for the great service",
+        "Where can I find your privacy policy",
+    ],
+}
+
+
+def _model_path() -> Path:
+    return Path(os.getenv("MODEL_CACHE_DIR", ".model_cache")) / "ticket_classifier.pkl"
+
+
+class TicketClassifier:
+    def __init__(self, pipeline: Any, trained_rows: int) -> None:
+        self.pipeline = pipeline
+        self.trained_rows = trained_rows
+        self.version = TRAINING_VERSION
+        self.classes = [str(label) for label in pipeline.classes_]
+        self._prepare()
+
+    def _prepare(self) -> None:
+        # sklearn's predict_proba copies the (n_features x n_classes) coefficient matrix on
+        # every call; scoring against a contiguous copy made once is ~10x faster for small batches.
+        *features, model = [step for _, step in self.pipeline.steps]
+        self._features = features
+        self._weights = np.ascontiguousarray(model.coef_.T)
+        self._bias = model.intercept_
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {"pipeline": self.pipeline, "trained_rows": self.trained_rows, "classes": self.classes, "version": self.version}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        # Models pickled before versioning were trained on their own predictions too.
+        self.version = state.get("version", 1)
+        self._prepare()
+
+    @classmethod
+    def train(cls, texts: list[str], labels: list[str]) -> TicketClassifier:
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+
+        pipeline = make_pipeline(
+            HashingVectorizer(ngram_range=(1, 2), n_features=2**18, alternate_sign=False, norm=None),
+            TfidfTransformer(sublinear_tf=True),
+            LogisticRegression(C=10.0, max_iter=1000),
+        )
+        pipeline.fit(texts, labels)
+        return cls(pipeline, len(texts))
+
+    def classify(self, texts: Iterable[str]) -> list[dict[str, Any]]:
+        """Label and confidence for each text, in input order, from one vectorized predict."""
+        texts = [text or "" for text in texts]
+        if not texts:
+            return []
+        matrix = texts
+        for step in self._features:
+            matrix = step.transform(matrix)
+        scores = np.asarray(matrix @ self._weights) + self._bias
+        if scores.shape[1] == 1:
+            # Binary models have one decision column for the positive class.
+            scores = np.hstack([np.zeros_like(scores), scores])
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [
+            {"label": self.classes[index], "confidence": round(float(probabilities[row, index]), 4)}
+            for row, index in enumerate(best)
+        ]
+
+    def label(self, text: str) -> str:
+        return self.classify([text])[0]["label"]
+
+
+def training_data(engine: Engine, limit: int = MAX_TRAINING_ROWS) -> tuple[list[str], list[str]]:
+    texts = [text for texts in SEED_EXAMPLES.values() for text in texts]
+    labels = [label for label, texts in SEED_EXAMPLES.items() for _ in texts]
+    query = (
+        select(Ticket.issue, Ticket.category)
+        # NULL provenance (rows from before it was recorded, or written directly) counts as a user label.
+        .where(Ticket.category_source.is_distinct_from("auto"), Ticket.category.is_not(None))
+        .order_by(Ticket.id.desc())
+        .limit(limit)
+    )
+    with engine.connect() as conn:
+        for issue, category in conn.execute(query):
+            texts.append(issue)
+            labels.append(category)
+    return texts, labels
+
+
+def train_classifier(engine: Engine) -> TicketClassifier:
+    """Train on the newest tickets, persist the model and make it the process-wide classifier."""
+    global _CLASSIFIER
+    classifier = TicketClassifier.train(*training_data(engine))
+    path = _model_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(pickle.dumps(classifier))
+    tmp.replace(path)
+    with _CLASSIFIER_LOCK:
+        _CLASSIFIER = classifier
+    return classifier
+
+
+_CLASSIFIER: TicketClassifier | None = None
+_CLASSIFIER_LOCK = threading.Lock()
+# Held while loading or training on first use, so concurrent first callers wait for one model
+# instead of each training their own.
+_LOAD_LOCK = threading.Lock()
+
+
+def get_classifier(engine: Engine) -> TicketClassifier:
+    """Load the persisted classifier once per process, training it first if none of the current
+    :data:`TRAINING_VERSION` exists."""
+    global _CLASSIFIER
+    if _CLASSIFIER is not None:
+        return _CLASSIFIER
+    with _LOAD_LOCK:
+        if _CLASSIFIER is None:
+            path = _model_path()
+            if path.exists():
+                try:
+                    loaded = pickle.loads(path.read_bytes())
+                except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                    loaded = None
+                if getattr(loaded, "version", None) != TRAINING_VERSION:
+                    loaded = None
+                with _CLASSIFIER_LOCK:
+                    _CLASSIFIER = _CLASSIFIER or loaded
+        if _CLASSIFIER is None:
+            train_classifier(engine)
+    return _CLASSIFIER
@@ -0,0 +1,93 @@
+"""Ranked full-text ticket search over the ``tickets_fts`` FTS5 index."""
+from __future__ import annotations
+
+import math
+import re
+from typing import Any
+
+from sqlalchemy import DateTime, Float, Integer, String, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from app.services.pagination import InvalidCursor
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_SEARCH_SQL = """
+SELECT t.id, t.customer, t.issue, t.status, t.category, t.created_at, tickets_fts.rank AS rank,
+       snippet(tickets_fts, 1, '[', ']', '…', 12) AS snippet
+FROM tickets_fts JOIN tickets AS t ON t.id = tickets_fts.rowid
+WHERE tickets_fts MATCH :query {after}
+ORDER BY tickets_fts.rank, t.id
+LIMIT :limit
+"""
+_AFTER_SQL = "AND (tickets_fts.rank > :after_rank OR (tickets_fts.rank = :after_rank AND t.id > :after_id))"
+
+
+def fts_query(q: str) -> str | None:
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix.
+
+    Quoting each term means user input can never be parsed as FTS5 syntax.
+    """
+    terms = _TERM.findall(q)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _after_params(after: list[Any]) -> dict[str, Any]:
+    rank, row_id = after
+    # bool is an int subclass, and NaN/inf ranks would compare false against every row.
+    if isinstance(rank, bool) or not isinstance(rank, (int, float)) or not math.isfinite(rank):
+        raise InvalidCursor("Malformed pagination cursor")
+    if isinstance(row_id, bool) or not isinstance(row_id, int):
+        raise InvalidCursor("Malformed pagination cursor")
+    return {"after_rank": float(rank), "after_id": row_id}
+
+
+def search_statement(q: str, limit: int, after: list[Any] | None = None) -> tuple[TextClause, dict[str, Any]] | None:
+    """Statement and parameters for one page of results, best BM25 rank first.
+
+    ``after`` is the ``(rank, id)`` of the last row on the previous page; values of the wrong
+    type raise :class:`InvalidCursor`.
+    """
+    query = fts_query(q)
+    if query is None:
+        return None
+    params: dict[str, Any] = {"query": query, "limit": limit}
+    if after is not None:
+        params.update(_after_params(after))
+    statement = text(_SEARCH_SQL.format(after=_AFTER_SQL if after is not None else "")).columns(
+        id=Integer,
+        customer=String,
+        issue=String,
+        status=String,
+        category=String,
+        created_at=DateTime,
+        rank=Float,
+        snippet=String,
+    )
+    return statement, params
+
+
+def search_result(row: Any) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "customer": row.customer,
+        "issue": row.issue,
+        "status": row.status,
+        "category": row.category,
+        "created_at": row.created_at.isoformat(),
+        "rank": row.rank,
+        "snippet": row.snippet,
+    }
+
+
+def search_tickets(db: Session, q: str, limit: int = 50) -> list[dict[str, Any]]:
+    """Synchronous first page of results, for the Streamlit app."""
+    built = search_statement(q, limit)
+    if built is None:
+        return []
+    return [search_result(row) for row in db.execute(*built)]
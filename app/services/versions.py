@@ -0,0 +1,93 @@
+"""Per-table change versions and a version-keyed cache of serialized responses for conditional GETs.
+
+On SQLite every insert, update and delete bumps the table's ``version`` in ``table_counts`` (see
+``init_table_counts``). An ETag built from that version changes exactly when the table does, so a
+poll can be answered with ``304 Not Modified``, or from a cached body, after one primary-key read.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime
+
+from sqlalchemy import DateTime, Integer, text
+from sqlalchemy.engine import Engine
+
+VERSION_QUERY = text("SELECT version, modified_at FROM table_counts WHERE table_name = :table").columns(
+    version=Integer, modified_at=DateTime
+)
+
+
+@dataclass(frozen=True)
+class TableVersion:
+    version: int
+    modified_at: datetime | None
+
+
+def read_version(bind: Engine, table: str) -> TableVersion | None:
+    """Current change version of ``table``; ``None`` where the trigger-maintained counters do not exist."""
+    if bind.dialect.name != "sqlite":
+        return None
+    with bind.connect() as conn:
+        row = conn.execute(VERSION_QUERY, {"table": table}).one()
+    return TableVersion(row.version, row.modified_at)
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag over ``parts`` (table, version, path, query string, ...)."""
+    digest = hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag`` (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def http_date(moment: datetime) -> str:
+    """IMF-fixdate for ``Last-Modified``; naive datetimes are UTC (SQLite ``CURRENT_TIMESTAMP``)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return format_datetime(moment.astimezone(UTC), usegmt=True)
+
+
+class BodyCache:
+    """Thread-safe LRU of serialized response bodies; an entry is only served for its own ETag."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, etag: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: str, etag: str, body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def body_cache_from_env() -> BodyCache:
+    """Body cache sized by ``RESPONSE_CACHE_SIZE`` (entries, default 256)."""
+    return BodyCache(int(os.getenv("RESPONSE_CACHE_SIZE", "256")))
@@ -0,0 +1,113 @@
+"""Group-commit write coalescing for single-row inserts.
+
+Concurrent callers hand their row to a background writer thread and block until it is
+durable. The writer drains the queue into one transaction every ``max_delay`` seconds or
+``max_batch`` rows, so N concurrent inserts cost one commit instead of N lock/fsync cycles.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+_STOP = object()
+
+
+class WriteBatcher:
+    def __init__(self, engine: Engine, max_batch: int = 256, max_delay: float = 0.005) -> None:
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: queue.Queue[Any] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def insert(self, model: type, values: dict[str, Any], timeout: float | None = 30.0) -> dict[str, Any]:
+        """Queue one row for ``model`` and wait for the committed row (including its new ``id``)."""
+        self._ensure_started()
+        future: Future[dict[str, Any]] = Future()
+        self._queue.put((model.__table__, values, future))
+        return future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """Flush queued rows and stop the writer thread."""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="db-write-batcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: list[tuple[Any, dict[str, Any], Future]]) -> None:
+        groups: dict[tuple[Any, tuple[str, ...]], list[int]] = {}
+        for position, (table, values, _) in enumerate(batch):
+            groups.setdefault((table, tuple(sorted(values))), []).append(position)
+        rows: list[dict[str, Any]] = [{} for _ in batch]
+        try:
+            with self.engine.begin() as conn:
+                for (table, _), positions in groups.items():
+                    statement = insert(table).returning(*table.c, sort_by_parameter_order=True)
+                    result = conn.execute(statement, [batch[position][1] for position in positions])
+                    for position, row in zip(positions, result):
+                        rows[position] = dict(row._mapping)
+        except Exception:  # noqa: BLE001 - any failure falls back to per-row inserts
+            # One bad row must not fail its neighbours: retry each row in its own transaction.
+            for table, values, future in batch:
+                try:
+                    with self.engine.begin() as conn:
+                        row = self._insert_one(conn, table, values)
+                except Exception as exc:  # noqa: BLE001 - handed to the caller waiting on this row
+                    future.set_exception(exc)
+                else:
+                    future.set_result(row)
+            return
+        for (_, _, future), row in zip(batch, rows):
+            future.set_result(row)
+
+    @staticmethod
+    def _insert_one(conn: Any, table: Any, values: dict[str, Any]) -> dict[str, Any]:
+        return dict(conn.execute(insert(table).values(**values).returning(*table.c)).one()._mapping)
+
+
+def batcher_from_env(engine: Engine) -> WriteBatcher | None:
+    """Return a batcher when ``DB_WRITE_BATCHING=1``; tuned by ``DB_WRITE_BATCH_SIZE``/``DB_WRITE_BATCH_DELAY_MS``."""
+    if os.getenv("DB_WRITE_BATCHING", "0") != "1":
+        return None
+    return WriteBatcher(
+        engine,
+        max_batch=int(os.getenv("DB_WRITE_BATCH_SIZE", "256")),
+        max_delay=float(os.getenv("DB_WRITE_BATCH_DELAY_MS", "5")) / 1000,
+    )
@@ -1,32 +1,112 @@
 from __future__ import annotations
 
+import io
+import os
 import sys
 from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import numpy as np
-import pandas as pd
-import plotly.express as px
 import streamlit as st
-from sklearn.linear_model import LinearRegression, LogisticRegression
-from sklearn.model_selection import train_test_split
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from app.services.ai_engine import AIEngine
-from app.services.database import Lead, SessionLocal, Task, Ticket, User, init_db
+from app.services.ai_scheduler import AIOverloaded
+from app.services.database import (
+    Lead,
+    SessionLocal,
+    Task,
+    Ticket,
+    User,
+    engine,
+    init_db,
+)
+from app.services.metrics import default_metrics
+from app.services.model_registry import ModelRegistry, default_registry
+from app.services.reminders import (
+    ReminderScheduler,
+    default_reminder_scheduler,
+    recently_fired,
+    upcoming_reminders,
+)
+from app.services.reports import COMPLETED_TASK_STATUSES
+
+# numpy, pandas, plotly, sklearn and the services built on them are imported inside the page
+# that uses them, so the login screen and lighter pages do not pay for them on a cold start.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from app.services.large_csv import LargeCSVSummary
 
 st.set_page_config(page_title="AI Office Manager", layout="wide", page_icon="🤖")
+
+# Uploads above this size default to the chunked large-file mode in the Analyst Bot.
+LARGE_CSV_BYTES = 50 * 1024 * 1024
+# The ticket tab shows the newest tickets (or best search matches) rather than the whole table.
+TICKET_LIST_LIMIT = 500
+# Likewise the task list shows one due-date slice at a time, read through the due_on index.
+TASK_LIST_LIMIT = 500
+# Past this many employees the attendance chart is a histogram rather than one bar each.
+ATTENDANCE_BAR_LIMIT = 50
+
+
+@st.cache_resource
+def get_ai_engine() -> AIEngine:
+    return AIEngine()
+
+
+@st.cache_resource
+def get_model_registry() -> ModelRegistry:
+    return default_registry()
+
+
+@st.cache_resource
+def get_reminder_scheduler() -> ReminderScheduler:
+    scheduler = default_reminder_scheduler()
+    scheduler.start()
+    return scheduler
+
+
 init_db()
-ai = AIEngine()
+ai = get_ai_engine()
+models = get_model_registry()
 
 
 def db_session():
     return SessionLocal()
 
 
+@st.cache_data(show_spinner=False)
+def _load_csv(path: str, mtime: float) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.read_csv(path)
+
+
+def load_csv(path: str) -> pd.DataFrame:
+    """Cached CSV read; the file's mtime is part of the key so edits invalidate it."""
+    return _load_csv(path, os.path.getmtime(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_uploaded_csv(content: bytes) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.read_csv(io.BytesIO(content))
+
+
+def fit_linear(features: list[str], target: str | list[str]):
+    def fit(data: pd.DataFrame):
+        from sklearn.linear_model import LinearRegression
+
+        return LinearRegression().fit(data[features], data[target])
+
+    return fit
+
+
 def auth_gate() -> None:
     if "authenticated" not in st.session_state:
         st.session_state.authenticated = False
@@ -51,51 +131,75 @@ def auth_gate() -> None:
 
 
 def kpi_cards() -> None:
-    with db_session() as db:
-        tasks = db.query(Task).count()
-        tickets = db.query(Ticket).count()
-        leads = db.query(Lead).count()
-
-    productivity = min(100, 45 + tasks * 3)
-    cost_saving = 15000 + (leads * 800)
-    tasks_completed = tasks + tickets
+    metrics = default_metrics().snapshot()
 
     c1, c2, c3 = st.columns(3)
-    c1.metric("Productivity", f"{productivity}%", delta="+5%")
-    c2.metric("Cost Saving", f"${cost_saving:,.0f}", delta="+$1,200")
-    c3.metric("Tasks Completed", tasks_completed, delta="+9")
+    c1.metric("Productivity", f"{metrics.productivity}%", delta="+5%")
+    c2.metric("Cost Saving", f"${metrics.cost_saving:,.0f}", delta="+$1,200")
+    c3.metric("Tasks Completed", metrics.tasks_completed, delta="+9")
 
 
 def dashboard_home() -> None:
+    # graph_objects takes plain lists, so the landing page never imports pandas.
+    import plotly.graph_objects as go
+
     st.title("🏢 AI Office Manager")
     st.caption("Central workforce automation platform for HR, Analytics, Support, Admin, and Sales")
     kpi_cards()
 
-    timeline = pd.DataFrame(
-        {
-            "Month": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
-            "Automation ROI": [8, 12, 16, 21, 29, 35],
-        }
+    fig = go.Figure(
+        go.Scatter(
+            x=["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+            y=[8, 12, 16, 21, 29, 35],
+            fill="tozeroy",
+            mode="lines",
+            name="Automation ROI",
+        )
     )
-    fig = px.area(timeline, x="Month", y="Automation ROI", title="Automation ROI Trend")
+    fig.update_layout(title="Automation ROI Trend", xaxis_title="Month", yaxis_title="Automation ROI")
     st.plotly_chart(fig, use_container_width=True)
 
 
 def hr_module() -> None:
+    import pandas as pd
+    import plotly.express as px
+
+    from app.services.attendance import default_attendance_store
+
     st.header("👥 HR Bot")
     tabs = st.tabs(["Attendance", "Resume Analyzer", "Leave Requests", "Interview", "Performance"])
 
     with tabs[0]:
-        team = ["Ava", "Ben", "Cara", "Dan", "Eli"]
-        attendance = pd.DataFrame(
-            {
-                "Employee": team,
-                "Present Days": np.random.randint(18, 23, size=5),
-                "Late Days": np.random.randint(0, 4, size=5),
-            }
-        )
-        st.dataframe(attendance, use_container_width=True)
-        st.plotly_chart(px.bar(attendance, x="Employee", y="Present Days", title="Attendance Simulator"), use_container_width=True)
+        store = default_attendance_store()
+        upload = st.file_uploader("Clock-in/out log (CSV: employee, timestamp, event)", type=["csv"], key="attendance_upload")
+        if upload is not None and st.button("Import Events"):
+            try:
+                with st.spinner("Importing events in chunks..."):
+                    result = store.ingest(upload)
+            except ValueError as exc:
+                st.error(f"Could not import the event log: {exc}")
+            else:
+                st.success(f"Imported {result['stored']:,} events ({result['skipped']:,} skipped) for {', '.join(result['periods']) or 'no period'}")
+
+        periods = store.periods()
+        if not periods:
+            st.info("No attendance events yet. Import a clock-in/out log to see present days, late days and hours worked.")
+        else:
+            period = st.selectbox("Period", periods)
+            # Cached per period by the store, so this is a dictionary lookup until new events arrive.
+            attendance = store.summary(period).rename(
+                columns={"employee": "Employee", "present_days": "Present Days", "late_days": "Late Days", "hours_worked": "Hours Worked"}
+            )
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Employees", f"{len(attendance):,}")
+            c2.metric("Avg Present Days", f"{attendance['Present Days'].mean():.1f}")
+            c3.metric("Late Arrivals", f"{attendance['Late Days'].sum() / max(1, attendance['Present Days'].sum()) * 100:.1f}%")
+            st.dataframe(attendance, use_container_width=True)
+            if len(attendance) <= ATTENDANCE_BAR_LIMIT:
+                chart = px.bar(attendance, x="Employee", y="Present Days", title=f"Attendance {period}")
+            else:
+                chart = px.histogram(attendance, x="Present Days", title=f"Present days per employee, {period}")
+            st.plotly_chart(chart, use_container_width=True)
 
     with tabs[1]:
         resume_text = st.text_area("Paste resume text")
@@ -135,87 +239,196 @@ def hr_module() -> None:
         st.plotly_chart(px.scatter(perf, x="Performance Score", y="Goal Completion %", text="Employee", title="Performance Report"), use_container_width=True)
 
 
-def analyst_module() -> None:
-    st.header("📊 Analyst Bot")
-    uploaded = st.file_uploader("Upload CSV", type=["csv"])
+@st.cache_data(show_spinner="Scanning CSV in chunks...", max_entries=4)
+def summarize_uploaded_csv(file_id: str, _uploaded, x_col: str | None, y_col: str | None) -> LargeCSVSummary:
+    from app.services.large_csv import summarize_csv
 
-    if uploaded is not None:
-        df = pd.read_csv(uploaded)
-    else:
-        df = pd.read_csv("data/sample_sales.csv")
+    _uploaded.seek(0)
+    return summarize_csv(_uploaded, x_col, y_col)
+
+
+@st.cache_data(show_spinner="Fitting prediction model in chunks...", max_entries=4)
+def predict_uploaded_csv(file_id: str, _uploaded) -> tuple[str, float] | None:
+    from app.services.incremental_regression import fit_csv
 
-    st.dataframe(df.head(), use_container_width=True)
-    numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+    _uploaded.seek(0)
+    try:
+        model, last_row = fit_csv(_uploaded)
+    except ValueError:
+        return None
+    return model.target_name_, float(model.predict(last_row)[0])
 
+
+def large_csv_view(uploaded) -> None:
+    """Analyst view that never holds the whole upload as a DataFrame."""
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+
+    uploaded.seek(0)
+    preview = pd.read_csv(uploaded, nrows=1000)
+    numeric_cols = preview.select_dtypes(include=np.number).columns.tolist()
+    x_col = y_col = None
     if len(numeric_cols) >= 2:
         x_col = st.selectbox("X Axis", numeric_cols, index=0)
         y_col = st.selectbox("Y Axis", numeric_cols, index=min(1, len(numeric_cols)-1))
-        st.plotly_chart(px.line(df, x=x_col, y=y_col, title="Trend Analysis"), use_container_width=True)
+
+    summary = summarize_uploaded_csv(uploaded.file_id, uploaded, x_col, y_col)
+    st.caption(f"Large file mode: {summary.rows:,} rows scanned in chunks with compact dtypes")
+    st.dataframe(summary.head, use_container_width=True)
+    st.dataframe(summary.stats, use_container_width=True)
+    if x_col and y_col:
+        title = f"Trend Analysis (LTTB-decimated to {len(summary.plot):,} points)"
+        st.plotly_chart(px.line(summary.plot, x=x_col, y=y_col, title=title), use_container_width=True)
 
     if len(numeric_cols) >= 2:
-        model_df = df[numeric_cols].dropna()
-        target = numeric_cols[-1]
-        features = model_df[numeric_cols[:-1]]
-        y = model_df[target]
-        model = LinearRegression().fit(features, y)
-        pred = model.predict(features.tail(1))[0]
-        st.info(f"Prediction model output for next {target}: {pred:.2f}")
+        prediction = predict_uploaded_csv(uploaded.file_id, uploaded)
+        if prediction is not None:
+            target, pred = prediction
+            st.info(f"Prediction model output for next {target}: {pred:.2f}")
+
+
+def analyst_module() -> None:
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+
+    from app.services.reports import monthly_report
+
+    st.header("📊 Analyst Bot")
+    uploaded = st.file_uploader("Upload CSV", type=["csv"])
+
+    large_mode = uploaded is not None and st.toggle(
+        "Large file mode",
+        value=uploaded.size > LARGE_CSV_BYTES,
+        help="Read the file in chunks and plot a decimated series so memory stays bounded.",
+    )
+    if large_mode:
+        large_csv_view(uploaded)
+    else:
+        if uploaded is not None:
+            df = load_uploaded_csv(uploaded.getvalue())
+        else:
+            df = load_csv("data/sample_sales.csv")
+
+        st.dataframe(df.head(), use_container_width=True)
+        numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+
+        if len(numeric_cols) >= 2:
+            x_col = st.selectbox("X Axis", numeric_cols, index=0)
+            y_col = st.selectbox("Y Axis", numeric_cols, index=min(1, len(numeric_cols)-1))
+            st.plotly_chart(px.line(df, x=x_col, y=y_col, title="Trend Analysis"), use_container_width=True)
+
+        if len(numeric_cols) >= 2:
+            model_df = df[numeric_cols].dropna()
+            target = numeric_cols[-1]
+            features = numeric_cols[:-1]
+            model = models.get_or_fit("analyst_trend", model_df, fit_linear(features, target))
+            pred = model.predict(model_df[features].tail(1))[0]
+            st.info(f"Prediction model output for next {target}: {pred:.2f}")
 
     st.markdown("### Monthly Report")
-    st.write(ai.process("analyst", "Generate monthly trend and anomaly report"))
+    report = monthly_report(engine, months=12)
+    for insight in report["insights"]:
+        st.write(f"- {insight}")
+    monthly = pd.DataFrame(
+        [
+            {
+                "Month": m["month"],
+                "Tickets": m["tickets"]["total"],
+                "Tasks Due": m["tasks"]["total"],
+                "Task Completion %": m["tasks"]["completion_rate"],
+                "New Leads": m["leads"]["total"],
+                "Deal Size": m["leads"]["deal_size"],
+            }
+            for m in report["months"]
+        ]
+    )
+    st.dataframe(monthly, use_container_width=True, hide_index=True)
+    st.write(ai.process("analyst", "Generate monthly trend and anomaly report from: " + "; ".join(report["insights"])))
 
 
 def support_module() -> None:
+    import pandas as pd
+
+    from app.services.ticket_search import search_tickets
+
     st.header("🎧 Support Bot")
     tab1, tab2, tab3, tab4 = st.tabs(["AI Chatbot", "Ticket System", "Auto Reply", "Complaint Classifier"])
 
     with tab1:
         user_query = st.text_input("Customer question")
         if st.button("Get AI Response"):
-            st.write(ai.process("support", user_query))
+            st.write_stream(ai.stream("support", user_query))
 
     with tab2:
         with st.form("ticket_form"):
             customer = st.text_input("Customer")
             issue = st.text_area("Issue")
-            category = st.selectbox("Category", ["Billing", "Technical", "Logistics", "General"])
+            category = st.selectbox("Category", ["Auto-detect", "Billing", "Technical", "Logistics", "General"])
             submitted = st.form_submit_button("Create Ticket")
         if submitted:
+            source = "user"
+            if category == "Auto-detect":
+                from app.services.ticket_classifier import get_classifier
+
+                category, source = get_classifier(engine).label(issue), "auto"
             with db_session() as db:
-                ticket = Ticket(customer=customer, issue=issue, category=category)
+                ticket = Ticket(customer=customer, issue=issue, category=category, category_source=source)
                 db.add(ticket)
                 db.commit()
-            st.success("Ticket created")
+            st.success(f"Ticket created ({category})")
 
+        search = st.text_input("Search tickets", placeholder="Customer or issue keywords")
         with db_session() as db:
-            tickets = db.query(Ticket).order_by(Ticket.created_at.desc()).all()
-            ticket_df = pd.DataFrame(
-                [
-                    {
-                        "ID": t.id,
-                        "Customer": t.customer,
-                        "Issue": t.issue,
-                        "Category": t.category,
-                        "Status": t.status,
-                    }
-                    for t in tickets
-                ]
-            )
+            if search.strip():
+                results = search_tickets(db, search, limit=TICKET_LIST_LIMIT)
+                ticket_df = pd.DataFrame(
+                    [
+                        {
+                            "ID": r["id"],
+                            "Customer": r["customer"],
+                            "Issue": r["issue"],
+                            "Category": r["category"],
+                            "Status": r["status"],
+                            "Match": r["snippet"],
+                        }
+                        for r in results
+                    ]
+                )
+            else:
+                tickets = db.query(Ticket).order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(TICKET_LIST_LIMIT).all()
+                ticket_df = pd.DataFrame(
+                    [
+                        {
+                            "ID": t.id,
+                            "Customer": t.customer,
+                            "Issue": t.issue,
+                            "Category": t.category,
+                            "Status": t.status,
+                        }
+                        for t in tickets
+                    ]
+                )
         st.dataframe(ticket_df, use_container_width=True)
 
     with tab3:
         message = st.text_area("Incoming customer message")
         if st.button("Generate Auto Reply"):
-            st.write(ai.process("support", f"Draft polite auto-reply for: {message}"))
+            st.write_stream(ai.stream("support", f"Draft polite auto-reply for: {message}"))
 
     with tab4:
         complaint = st.text_area("Complaint text")
         if st.button("Classify Complaint"):
-            label = "Technical" if "bug" in complaint.lower() else "General"
-            st.success(f"Predicted category: {label}")
+            from app.services.ticket_classifier import get_classifier
+
+            prediction = get_classifier(engine).classify([complaint])[0]
+            st.success(f"Predicted category: {prediction['label']} ({prediction['confidence']:.0%} confidence)")
 
 
 def admin_module() -> None:
+    import pandas as pd
+
     st.header("🗂️ Admin Bot")
     tab1, tab2, tab3, tab4 = st.tabs(["Task Manager", "Calendar", "Reminders", "Email Generator"])
 
@@ -232,8 +445,17 @@ def admin_module() -> None:
                 db.commit()
             st.success("Task added")
 
+        view = st.selectbox("Show", ["Due this week", "Overdue", "Upcoming", "All"])
+        today = date.today()
         with db_session() as db:
-            tasks = db.query(Task).all()
+            query = db.query(Task)
+            if view == "Due this week":
+                query = query.filter(Task.due_on.between(today, today + timedelta(days=6)))
+            elif view == "Overdue":
+                query = query.filter(Task.due_on < today, Task.status.not_in(COMPLETED_TASK_STATUSES))
+            elif view == "Upcoming":
+                query = query.filter(Task.due_on >= today)
+            tasks = query.order_by(Task.due_on, Task.id).limit(TASK_LIST_LIMIT).all()
         st.dataframe(pd.DataFrame([{"Title": t.title, "Owner": t.owner, "Due": t.due_date, "Priority": t.priority, "Status": t.status} for t in tasks]), use_container_width=True)
 
     with tab2:
@@ -241,10 +463,28 @@ def admin_module() -> None:
         st.info(f"Scheduled events for {date_selected}: Team sync at 10:00 AM")
 
     with tab3:
+        scheduler = get_reminder_scheduler()
         reminder = st.text_input("Reminder")
+        reminder_day = st.date_input("Day", value=date.today(), key="reminder_day")
         reminder_time = st.time_input("Time", value=datetime.now().time())
-        if st.button("Set Reminder"):
-            st.success(f"Reminder set: {reminder} at {reminder_time}")
+        if st.button("Set Reminder") and reminder:
+            # Entered in the server's local time; stored as UTC.
+            remind_at = datetime.combine(reminder_day, reminder_time).astimezone()
+            scheduler.schedule(reminder, remind_at)
+            st.success(f"Reminder set: {reminder} at {remind_at:%Y-%m-%d %H:%M}")
+
+        def local(rows: list[dict]) -> pd.DataFrame:
+            frame = pd.DataFrame(rows)
+            local_zone = datetime.now().astimezone().tzinfo
+            for column in ("remind_at", "fired_at"):
+                if column in frame:
+                    frame[column] = pd.to_datetime(frame[column]).dt.tz_localize("UTC").dt.tz_convert(local_zone).dt.tz_localize(None)
+            return frame
+
+        st.subheader("Upcoming")
+        st.dataframe(local(upcoming_reminders(engine)), use_container_width=True)
+        st.subheader("Recently fired")
+        st.dataframe(local(recently_fired(engine)), use_container_width=True)
 
     with tab4:
         purpose = st.text_input("Email purpose")
@@ -253,6 +493,12 @@ def admin_module() -> None:
 
 
 def sales_module() -> None:
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+
+    from app.services.lead_scoring import conversion_model, rescore_leads, score_leads
+
     st.header("💼 Sales Bot")
     tab1, tab2, tab3, tab4 = st.tabs(["Lead Form", "Lead Scoring", "Sales Forecast", "CRM Dashboard"])
 
@@ -265,29 +511,37 @@ def sales_module() -> None:
             deal_size = st.number_input("Potential Deal Size", min_value=100.0, value=5000.0)
             submitted = st.form_submit_button("Save Lead")
         if submitted:
-            score = 40 + (deal_size / 1000) + (10 if source == "Referral" else 0)
+            model, training = conversion_model(models)
+            score = score_leads(
+                model,
+                np.array([deal_size]),
+                np.array([source]),
+                np.array([training["engagement"].median()]),
+                np.array([training["meetings"].median()]),
+            )[0]
             with db_session() as db:
                 db.add(Lead(name=name, email=email, company=company, source=source, deal_size=deal_size, score=score))
                 db.commit()
             st.success(f"Lead saved with score {score:.1f}")
 
     with tab2:
-        data = pd.read_csv("data/sample_leads.csv")
-        X = data[["deal_size", "engagement", "meetings"]]
-        y = data["converted"]
-        X_train, X_test, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
-        model = LogisticRegression().fit(X_train, y_train)
-        prob = model.predict_proba([[10000, 70, 2]])[0][1]
+        model, _ = conversion_model(models)
+        example = pd.DataFrame([[10000, 70, 2]], columns=["deal_size", "engagement", "meetings"])
+        prob = model.predict_proba(example)[0][1]
         st.metric("Example Lead Conversion Probability", f"{prob*100:.1f}%")
 
     with tab3:
-        forecast_df = pd.read_csv("data/sample_sales.csv")
-        model = LinearRegression().fit(forecast_df[["month_index"]], forecast_df[["revenue"]])
-        next_rev = model.predict([[forecast_df["month_index"].max() + 1]])[0][0]
+        forecast_df = load_csv("data/sample_sales.csv")
+        model = models.get_or_fit("sales_forecast", forecast_df, fit_linear(["month_index"], ["revenue"]))
+        next_month = pd.DataFrame({"month_index": [forecast_df["month_index"].max() + 1]})
+        next_rev = model.predict(next_month)[0][0]
         st.metric("Next Month Forecast", f"${next_rev:,.0f}")
         st.plotly_chart(px.line(forecast_df, x="month", y="revenue", markers=True, title="Sales Forecast Trend"), use_container_width=True)
 
     with tab4:
+        if st.button("Rescore All Leads"):
+            result = rescore_leads(engine, models)
+            st.success(f"Rescored {result['rescored']:,} leads in {result['elapsed_ms']:,.0f} ms")
         with db_session() as db:
             leads = db.query(Lead).all()
         lead_df = pd.DataFrame([{"Name": l.name, "Company": l.company, "Source": l.source, "Deal Size": l.deal_size, "Score": l.score} for l in leads])
@@ -303,18 +557,21 @@ def main() -> None:
     )
     st.sidebar.success(f"Logged in as {st.session_state.get('username', 'admin')}")
 
-    if section == "Dashboard":
-        dashboard_home()
-    elif section == "HR Bot":
-        hr_module()
-    elif section == "Analyst Bot":
-        analyst_module()
-    elif section == "Support Bot":
-        support_module()
-    elif section == "Admin Bot":
-        admin_module()
-    elif section == "Sales Bot":
-        sales_module()
+    try:
+        if section == "Dashboard":
+            dashboard_home()
+        elif section == "HR Bot":
+            hr_module()
+        elif section == "Analyst Bot":
+            analyst_module()
+        elif section == "Support Bot":
+            support_module()
+        elif section == "Admin Bot":
+            admin_module()
+        elif section == "Sales Bot":
+            sales_module()
+    except AIOverloaded as exc:
+        st.warning(f"The AI assistant is busy right now ({exc}). Please retry in {exc.retry_after:.0f}s.")
 
 
 if __name__ == "__main__":
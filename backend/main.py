@@ -1,17 +1,92 @@
 """FastAPI backend for AI Office Manager."""
 from __future__ import annotations
 
-from typing import Any
-
-from fastapi import Depends, FastAPI, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+import csv
+import itertools
+import json
+import math
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Literal
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.datastructures import UploadFile
 
 from app.services.ai_engine import AIEngine
-from app.services.database import Lead, SessionLocal, Task, Ticket, init_db
+from app.services.ai_scheduler import AIOverloaded
+from app.services.database import (
+    Lead,
+    SessionLocal,
+    Task,
+    Ticket,
+    engine,
+    get_async_engine,
+    get_async_session_factory,
+    init_db,
+)
+from app.services.export import MEDIA_TYPES, ExportUnavailable, export_table
+from app.services.ingest import (
+    UnsupportedFormat,
+    bulk_insert,
+    detect_format,
+    iter_records,
+)
+from app.services.instrumentation import (
+    CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    cache_samples,
+    instrument_engine,
+    reminder_samples,
+    scheduler_samples,
+)
+from app.services.metrics import default_metrics
+from app.services.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.services.reminders import (
+    default_reminder_scheduler,
+    to_utc_naive,
+    upcoming_reminders,
+)
+from app.services.reports import COMPLETED_TASK_STATUSES, has_activity
+from app.services.reports import monthly_report as build_monthly_report
+from app.services.ticket_classifier import get_classifier, train_classifier
+from app.services.ticket_search import search_result, search_statement
+from app.services.versions import (
+    body_cache_from_env,
+    etag_matches,
+    http_date,
+    make_etag,
+    read_version,
+)
+from app.services.write_batcher import batcher_from_env
 
 app = FastAPI(title="AI Office Manager API", version="1.0.0")
 ai = AIEngine()
+write_batcher = batcher_from_env(engine)
+dashboard_metrics = default_metrics()
+response_bodies = body_cache_from_env()
+reminders = default_reminder_scheduler()
+app.add_middleware(MetricsMiddleware)
+REGISTRY.register_collector(lambda: cache_samples(ai.cache_stats()))
+REGISTRY.register_collector(lambda: scheduler_samples(ai.scheduler_stats()))
+REGISTRY.register_collector(lambda: reminder_samples(reminders.stats()))
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_AI_BATCH_SIZE = 1000
+MAX_CLASSIFY_BATCH_SIZE = 10_000
+# Raw bulk uploads are spooled to disk past this size so memory stays bounded.
+UPLOAD_SPOOL_BYTES = 8 * 1024 * 1024
 
 
 class AIRequest(BaseModel):
@@ -19,10 +94,20 @@ class AIRequest(BaseModel):
     task: str
 
 
+class AIBatchRequest(BaseModel):
+    items: list[AIRequest] = Field(..., min_length=1, max_length=MAX_AI_BATCH_SIZE)
+    max_concurrency: int | None = Field(None, ge=1, le=64)
+
+
 class TicketRequest(BaseModel):
     customer: str
     issue: str
-    category: str = "General"
+    # Left out, the category is predicted from the issue text.
+    category: str | None = None
+
+
+class ClassifyRequest(BaseModel):
+    texts: list[str] = Field(..., min_length=1, max_length=MAX_CLASSIFY_BATCH_SIZE)
 
 
 class TaskRequest(BaseModel):
@@ -32,26 +117,217 @@ class TaskRequest(BaseModel):
     priority: str = "Medium"
 
 
+class ReminderRequest(BaseModel):
+    message: str = Field(..., min_length=1, max_length=300)
+    # Timezone-aware values are converted to UTC; naive ones are taken as UTC.
+    remind_at: datetime
+    task_id: int | None = None
+
+
 class LeadRequest(BaseModel):
     name: str
     email: str
     company: str
     source: str
-    deal_size: float
-    score: float
+    # NaN/inf would pass float parsing from CSV or NDJSON and poison score ordering and sums.
+    deal_size: float = Field(allow_inf_nan=False)
+    score: float = Field(allow_inf_nan=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+def _cursor_values(cursor: str | None, size: int) -> list[Any] | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, size)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _malformed_cursor() -> HTTPException:
+    return HTTPException(status_code=400, detail="Malformed pagination cursor")
+
+
+def _cursor_id(value: Any) -> int:
+    """The row id half of a keyset cursor; anything but a plain int is rejected."""
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise _malformed_cursor()
+    return value
+
+
+def _cursor_number(value: Any) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise _malformed_cursor()
+    return value
+
+
+async def _conditional_json(
+    request: Request, etag: str, modified_at: datetime | None, build: Callable[[], Awaitable[Any]]
+) -> Response:
+    """JSON response validated by ``etag``: 304 on a matching ``If-None-Match``, else a cached or fresh body."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if modified_at is not None:
+        headers["Last-Modified"] = http_date(modified_at)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    key = f"{request.url.path}?{request.url.query}"
+    body = response_bodies.get(key, etag)
+    if body is None:
+        body = JSONResponse(jsonable_encoder(await build())).body
+        response_bodies.put(key, etag, body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+async def _table_json(request: Request, table: str, build: Callable[[], Awaitable[Any]], *vary: Any) -> Response:
+    """Serve ``build()`` under an ETag derived from ``table``'s change version, the query string and
+    any ``vary`` values the body also depends on (e.g. today's date)."""
+    # A pooled sync read is ~20x cheaper than a round trip through the async session. It happens
+    # before building, so a concurrent write can only make a body newer than its tag, never older.
+    current = await run_in_threadpool(read_version, engine, table)
+    if current is None:
+        return JSONResponse(jsonable_encoder(await build()))
+    etag = make_etag(table, current.version, request.url.path, request.url.query, *vary)
+    return await _conditional_json(request, etag, current.modified_at, build)
+
 
+def _auto_categorize(rows: list[dict[str, Any]]) -> None:
+    for row in rows:
+        row["category_source"] = "user" if row.get("category") else "auto"
+    pending = [row for row in rows if row["category_source"] == "auto"]
+    if pending:
+        predictions = get_classifier(engine).classify(row["issue"] for row in pending)
+        for row, prediction in zip(pending, predictions):
+            row["category"] = prediction["label"]
 
-def get_db() -> Session:
+
+# Per-model hooks run on each chunk of bulk-ingested rows before it is written.
+CHUNK_HOOKS = {Ticket: _auto_categorize}
+
+
+def _ingest(source: Any, fmt: str, model: type, schema: type[BaseModel]) -> dict[str, Any]:
     db = SessionLocal()
     try:
-        yield db
+        return bulk_insert(db, model, schema, iter_records(source, fmt), prepare_chunk=CHUNK_HOOKS.get(model))
+    except UnsupportedFormat as exc:
+        raise HTTPException(status_code=415, detail=str(exc)) from exc
+    except (UnicodeDecodeError, json.JSONDecodeError, csv.Error) as exc:
+        raise HTTPException(status_code=400, detail=f"Could not parse upload: {exc}") from exc
     finally:
         db.close()
 
 
+@asynccontextmanager
+async def _spool_upload(request: Request) -> AsyncIterator[tuple[Any, str]]:
+    """File object and format for a raw CSV/NDJSON/JSON body or a multipart ``file`` upload.
+
+    A raw body is spooled to a temporary file that is closed on exit, even if the upload fails.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if not isinstance(upload, UploadFile):
+                raise HTTPException(status_code=400, detail="Multipart uploads need a 'file' field")
+            fmt = detect_format(upload.content_type, upload.filename)
+        else:
+            upload, fmt = None, detect_format(content_type)
+    except UnsupportedFormat as exc:
+        raise HTTPException(status_code=415, detail=str(exc)) from exc
+    if upload is not None:
+        # Starlette closes form files when the request ends.
+        yield upload.file, fmt
+        return
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES) as source:
+        async for chunk in request.stream():
+            source.write(chunk)
+        source.seek(0)
+        yield source, fmt
+
+
+async def _bulk_ingest(request: Request, model: type, schema: type[BaseModel]) -> dict[str, Any]:
+    """Accept a JSON array, a raw CSV/NDJSON body, or a multipart ``file`` upload."""
+    async with _spool_upload(request) as (source, fmt):
+        return await run_in_threadpool(_ingest, source, fmt, model, schema)
+
+
+def ticket_to_dict(t: Ticket) -> dict[str, Any]:
+    return {
+        "id": t.id,
+        "customer": t.customer,
+        "issue": t.issue,
+        "status": t.status,
+        "category": t.category,
+        "created_at": t.created_at.isoformat(),
+    }
+
+
+def task_to_dict(t: Task) -> dict[str, Any]:
+    return {
+        "id": t.id,
+        "title": t.title,
+        "owner": t.owner,
+        "due_date": t.due_date,
+        "due_on": t.due_on.isoformat() if t.due_on else None,
+        "priority": t.priority,
+        "status": t.status,
+    }
+
+
+def lead_to_dict(l: Lead) -> dict[str, Any]:
+    return {
+        "id": l.id,
+        "name": l.name,
+        "company": l.company,
+        "source": l.source,
+        "deal_size": l.deal_size,
+        "score": l.score,
+    }
+
+
 @app.on_event("startup")
 def startup_event() -> None:
+    instrument_engine(engine)
+    instrument_engine(get_async_engine().sync_engine)
     init_db()
+    reminders.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    if write_batcher is not None:
+        await run_in_threadpool(write_batcher.close)
+    await run_in_threadpool(reminders.stop)
+    await get_async_engine().dispose()
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(request: Request, exc: RequestValidationError) -> JSONResponse:
+    # Errors echo the rejected input, and NaN/inf cannot be written as JSON: send those as strings.
+    detail = jsonable_encoder(exc.errors(), custom_encoder={float: lambda value: value if math.isfinite(value) else str(value)})
+    return JSONResponse(status_code=422, content={"detail": detail})
+
+
+@app.exception_handler(AIOverloaded)
+async def ai_overloaded_handler(request: Request, exc: AIOverloaded) -> JSONResponse:
+    return JSONResponse(
+        status_code=429, content={"detail": str(exc)}, headers={"Retry-After": str(math.ceil(exc.retry_after))}
+    )
+
+
+async def _insert_row(db: AsyncSession, model: type, values: dict[str, Any]) -> dict[str, Any]:
+    """Insert one row, through the group-commit batcher when it is enabled."""
+    if write_batcher is not None:
+        return await run_in_threadpool(write_batcher.insert, model, values)
+    item = model(**values)
+    db.add(item)
+    await db.commit()
+    await db.refresh(item)
+    return {column.name: getattr(item, column.name) for column in model.__table__.columns}
 
 
 @app.get("/health")
@@ -59,100 +335,393 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """Route, SQL and AI timings plus AI cache counters in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.post("/ai/process")
 def process_ai(req: AIRequest) -> dict[str, str]:
     return {"response": ai.process(req.department, req.task)}
 
 
+def _sse_events(chunks: Iterator[str]) -> Iterator[str]:
+    for chunk in chunks:
+        yield f"data: {json.dumps({'token': chunk})}\n\n"
+    yield "event: done\ndata: {}\n\n"
+
+
+@app.post("/ai/process/stream")
+def process_ai_stream(req: AIRequest) -> StreamingResponse:
+    """Server-Sent Events: one ``data: {"token": ...}`` event per chunk, then ``event: done``."""
+    chunks = ai.stream(req.department, req.task)
+    # Wait for the first chunk here so a saturated AI queue is a 429, not a broken stream.
+    first = next(chunks, None)
+    return StreamingResponse(
+        _sse_events(itertools.chain([] if first is None else [first], chunks)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/ai/process/batch")
+def process_ai_batch(req: AIBatchRequest) -> dict[str, list[dict[str, str | None]]]:
+    results = ai.process_many(((item.department, item.task) for item in req.items), req.max_concurrency)
+    return {"results": results}
+
+
+@app.get("/ai/cache/stats")
+def ai_cache_stats() -> dict[str, int]:
+    return ai.cache_stats()
+
+
+@app.get("/ai/scheduler/stats")
+def ai_scheduler_stats() -> dict[str, Any]:
+    """Queue depth per priority, active upstream calls, and dedup/rejection counters."""
+    return ai.scheduler_stats()
+
+
 @app.post("/support/tickets")
-def create_ticket(req: TicketRequest, db: Session = Depends(get_db)) -> dict[str, Any]:
-    ticket = Ticket(customer=req.customer, issue=req.issue, category=req.category)
-    db.add(ticket)
-    db.commit()
-    db.refresh(ticket)
-    return {"id": ticket.id, "status": ticket.status}
+async def create_ticket(req: TicketRequest, db: AsyncSession = Depends(get_async_db)) -> dict[str, Any]:
+    values = req.model_dump()
+    if values["category"]:
+        values["category_source"] = "user"
+    else:
+        await run_in_threadpool(_auto_categorize, [values])
+    ticket = await _insert_row(db, Ticket, values)
+    return {"id": ticket["id"], "status": ticket["status"], "category": ticket["category"]}
+
+
+@app.post("/support/classify")
+async def classify_tickets(req: ClassifyRequest) -> dict[str, list[dict[str, Any]]]:
+    classifier = await run_in_threadpool(get_classifier, engine)
+    return {"results": await run_in_threadpool(classifier.classify, req.texts)}
+
+
+@app.post("/support/classifier/train")
+async def retrain_classifier() -> dict[str, Any]:
+    """Retrain the ticket classifier on the newest tickets and swap it in."""
+    classifier = await run_in_threadpool(train_classifier, engine)
+    return {"trained_rows": classifier.trained_rows, "classes": classifier.classes}
+
+
+@app.post("/support/tickets/bulk")
+async def create_tickets_bulk(request: Request) -> dict[str, Any]:
+    return await _bulk_ingest(request, Ticket, TicketRequest)
+
+
+@app.get("/support/tickets/search")
+async def search_tickets(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict[str, Any]:
+    """Full-text search over ticket customer/issue, best match first, keyset-paginated."""
+    if engine.dialect.name != "sqlite":
+        raise HTTPException(status_code=501, detail="Full-text search requires the SQLite FTS5 index")
+    try:
+        built = search_statement(q, limit + 1, _cursor_values(cursor, 2))
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if built is None:
+        return {"items": [], "next_cursor": None}
+    rows = (await db.execute(*built)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].id)
+    return {"items": [search_result(row) for row in rows], "next_cursor": next_cursor}
 
 
 @app.get("/support/tickets")
-def list_tickets(db: Session = Depends(get_db)) -> list[dict[str, Any]]:
-    records = db.query(Ticket).order_by(Ticket.created_at.desc()).all()
-    return [
-        {
-            "id": t.id,
-            "customer": t.customer,
-            "issue": t.issue,
-            "status": t.status,
-            "category": t.category,
-            "created_at": t.created_at.isoformat(),
-        }
-        for t in records
-    ]
+async def list_tickets(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    status: str | None = None,
+    category: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Newest-first ticket page; pass ``next_cursor`` back as ``cursor`` for the next one.
+
+    Carries an ``ETag`` that changes with any ticket write; send it back as ``If-None-Match`` to
+    get ``304 Not Modified`` while nothing changed.
+    """
+
+    async def page() -> dict[str, Any]:
+        query = select(Ticket)
+        if status is not None:
+            query = query.where(Ticket.status == status)
+        if category is not None:
+            query = query.where(Ticket.category == category)
+        after = _cursor_values(cursor, 2)
+        if after is not None:
+            try:
+                created_at = datetime.fromisoformat(after[0])
+            except (TypeError, ValueError) as exc:
+                raise _malformed_cursor() from exc
+            query = query.where(tuple_(Ticket.created_at, Ticket.id) < tuple_(created_at, _cursor_id(after[1])))
+        query = query.order_by(Ticket.created_at.desc(), Ticket.id.desc()).limit(limit + 1)
+        records = (await db.scalars(query)).all()
+
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            next_cursor = encode_cursor(last.created_at.isoformat(), last.id)
+        return {"items": [ticket_to_dict(t) for t in records], "next_cursor": next_cursor}
+
+    return await _table_json(request, "tickets", page)
 
 
 @app.post("/admin/tasks")
-def create_task(req: TaskRequest, db: Session = Depends(get_db)) -> dict[str, Any]:
-    item = Task(title=req.title, owner=req.owner, due_date=req.due_date, priority=req.priority)
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-    return {"id": item.id, "status": item.status}
+async def create_task(req: TaskRequest, db: AsyncSession = Depends(get_async_db)) -> dict[str, Any]:
+    item = await _insert_row(
+        db, Task, {"title": req.title, "owner": req.owner, "due_date": req.due_date, "priority": req.priority}
+    )
+    return {"id": item["id"], "status": item["status"]}
+
+
+@app.post("/admin/tasks/bulk")
+async def create_tasks_bulk(request: Request) -> dict[str, Any]:
+    return await _bulk_ingest(request, Task, TaskRequest)
+
+
+@app.get("/admin/tasks/due")
+async def tasks_due(
+    request: Request,
+    start: date | None = None,
+    end: date | None = None,
+    overdue: bool = False,
+    status: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Tasks due between ``start`` and ``end`` (inclusive, either optional), soonest first.
+
+    ``overdue=true`` narrows that to unfinished tasks due before today. Reads the ``due_on`` index,
+    so tasks whose ``due_date`` is not a date never match. Paginated and conditional like
+    ``GET /support/tickets``.
+    """
+    today = date.today()
+    if overdue:
+        end = min(end, today - timedelta(days=1)) if end is not None else today - timedelta(days=1)
+
+    async def page() -> dict[str, Any]:
+        query = select(Task).where(Task.due_on.is_not(None))
+        if start is not None:
+            query = query.where(Task.due_on >= start)
+        if end is not None:
+            query = query.where(Task.due_on <= end)
+        if overdue:
+            query = query.where(Task.status.not_in(COMPLETED_TASK_STATUSES))
+        if status is not None:
+            query = query.where(Task.status == status)
+        after = _cursor_values(cursor, 2)
+        if after is not None:
+            try:
+                due_on = date.fromisoformat(after[0])
+            except (TypeError, ValueError) as exc:
+                raise _malformed_cursor() from exc
+            query = query.where(tuple_(Task.due_on, Task.id) > tuple_(due_on, _cursor_id(after[1])))
+        query = query.order_by(Task.due_on, Task.id).limit(limit + 1)
+        tasks = (await db.scalars(query)).all()
+
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_cursor(tasks[-1].due_on.isoformat(), tasks[-1].id)
+        return {"items": [task_to_dict(t) for t in tasks], "next_cursor": next_cursor}
+
+    # "Overdue" moves with the calendar even when no task changes.
+    return await _table_json(request, "tasks", page, today.isoformat() if overdue else None)
+
+
+@app.post("/admin/reminders")
+async def create_reminder(req: ReminderRequest) -> dict[str, Any]:
+    reminder_id = await run_in_threadpool(reminders.schedule, req.message, req.remind_at, req.task_id)
+    return {"id": reminder_id, "remind_at": to_utc_naive(req.remind_at).isoformat()}
+
+
+@app.get("/admin/reminders")
+async def list_reminders(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)) -> dict[str, Any]:
+    """Pending reminders, soonest first."""
+    return {"items": await run_in_threadpool(upcoming_reminders, engine, limit)}
+
+
+@app.get("/admin/reminders/stats")
+def reminder_stats() -> dict[str, Any]:
+    """Reminders held in memory, the loaded window, fire counts and recent lateness."""
+    return reminders.stats()
 
 
 @app.post("/sales/leads")
-def create_lead(req: LeadRequest, db: Session = Depends(get_db)) -> dict[str, Any]:
-    lead = Lead(
-        name=req.name,
-        email=req.email,
-        company=req.company,
-        source=req.source,
-        deal_size=req.deal_size,
-        score=req.score,
-    )
-    db.add(lead)
-    db.commit()
-    db.refresh(lead)
-    return {"id": lead.id, "score": lead.score}
+async def create_lead(req: LeadRequest, db: AsyncSession = Depends(get_async_db)) -> dict[str, Any]:
+    lead = await _insert_row(db, Lead, req.model_dump())
+    return {"id": lead["id"], "score": lead["score"]}
+
+
+@app.post("/sales/leads/bulk")
+async def create_leads_bulk(request: Request) -> dict[str, Any]:
+    return await _bulk_ingest(request, Lead, LeadRequest)
+
+
+@app.post("/sales/leads/rescore")
+async def rescore_all_leads() -> dict[str, Any]:
+    """Recompute every lead's score (rule score blended with the conversion model) in bulk."""
+    # pandas-backed services are imported on first use to keep API startup light.
+    from app.services.lead_scoring import rescore_leads
+
+    return await run_in_threadpool(rescore_leads, engine)
 
 
 @app.get("/sales/leads")
-def list_leads(db: Session = Depends(get_db)) -> list[dict[str, Any]]:
-    leads = db.query(Lead).all()
-    return [
-        {
-            "id": l.id,
-            "name": l.name,
-            "company": l.company,
-            "source": l.source,
-            "deal_size": l.deal_size,
-            "score": l.score,
-        }
-        for l in leads
-    ]
+async def list_leads(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    source: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
+    """Highest-score-first lead page; pass ``next_cursor`` back as ``cursor`` for the next one.
+
+    Conditional like ``GET /support/tickets``: the ``ETag`` changes with any lead write.
+    """
+
+    async def page() -> dict[str, Any]:
+        query = select(Lead)
+        if source is not None:
+            query = query.where(Lead.source == source)
+        after = _cursor_values(cursor, 2)
+        if after is not None:
+            query = query.where(tuple_(Lead.score, Lead.id) < tuple_(_cursor_number(after[0]), _cursor_id(after[1])))
+        query = query.order_by(Lead.score.desc(), Lead.id.desc()).limit(limit + 1)
+        leads = (await db.scalars(query)).all()
+
+        next_cursor = None
+        if len(leads) > limit:
+            leads = leads[:limit]
+            next_cursor = encode_cursor(leads[-1].score, leads[-1].id)
+        return {"items": [lead_to_dict(l) for l in leads], "next_cursor": next_cursor}
+
+    return await _table_json(request, "leads", page)
+
+
+def _ingest_attendance(source: Any) -> dict[str, Any]:
+    from app.services.attendance import default_attendance_store
 
+    try:
+        return default_attendance_store().ingest(source)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=f"Could not parse event log: {exc}") from exc
 
-@app.get("/dashboard/metrics")
-def metrics(db: Session = Depends(get_db)) -> dict[str, Any]:
-    tickets = db.query(Ticket).count()
-    tasks = db.query(Task).count()
-    leads = db.query(Lead).count()
+
+@app.post("/hr/attendance/events")
+async def ingest_attendance_events(request: Request) -> dict[str, Any]:
+    """Append a clock-in/out CSV (``employee``, ``timestamp``, ``event`` columns), raw or multipart."""
+    async with _spool_upload(request) as (source, fmt):
+        if fmt != "csv":
+            raise HTTPException(status_code=415, detail="Attendance events must be CSV")
+        return await run_in_threadpool(_ingest_attendance, source)
+
+
+@app.get("/hr/attendance")
+async def attendance_periods() -> dict[str, Any]:
+    from app.services.attendance import default_attendance_store
+
+    store = default_attendance_store()
+    return {"periods": [{"period": period, "events": store.rows(period)} for period in store.periods()]}
+
+
+@app.get("/hr/attendance/{period}")
+async def attendance_summary(period: str) -> dict[str, Any]:
+    """Present days, late days and hours worked per employee for a ``YYYY-MM`` period."""
+    from app.services.attendance import default_attendance_store
+
+    store = default_attendance_store()
+    if period not in store.periods():
+        raise HTTPException(status_code=404, detail=f"No attendance events for {period}")
+    summary = await run_in_threadpool(store.summary, period)
+    return {"period": period, "events": store.rows(period), "items": summary.to_dict(orient="records")}
+
+
+def _fit_regression(source: Any, target: str | None, features: list[str] | None) -> dict[str, Any]:
+    from app.services.incremental_regression import fit_csv
+
+    try:
+        model, last_row = fit_csv(source, target=target, features=features)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    finally:
+        source.close()
     return {
-        "tasks_completed": tasks,
-        "tickets": tickets,
-        "leads": leads,
-        "productivity": min(100, 40 + tasks * 4),
-        "cost_saving": 12000 + leads * 700,
+        "target": model.target_name_,
+        "features": model.feature_names_in_,
+        "coefficients": dict(zip(model.feature_names_in_, model.coef_.tolist())),
+        "intercept": model.intercept_,
+        "r2": model.r2_score(),
+        "n_samples": model.n_samples_,
+        "prediction": float(model.predict(last_row)[0]),
     }
 
 
+@app.post("/analyst/regression")
+async def analyst_regression(
+    request: Request,
+    target: str | None = None,
+    features: str | None = Query(None, description="Comma-separated feature columns"),
+) -> dict[str, Any]:
+    """Fit a linear model on an uploaded CSV chunk by chunk, so file size is not bounded by RAM."""
+    source, fmt = await _spool_upload(request)
+    if fmt != "csv":
+        source.close()
+        raise HTTPException(status_code=415, detail="Regression uploads must be CSV")
+    feature_list = [name.strip() for name in features.split(",") if name.strip()] if features else None
+    return await run_in_threadpool(_fit_regression, source, target, feature_list)
+
+
+@app.get("/export/{table}")
+def export(
+    table: Literal["tickets", "leads", "tasks"],
+    format: Literal["csv", "ndjson", "parquet"] = "csv",
+) -> StreamingResponse:
+    """Stream a whole table in id order; memory use is bounded by one ``yield_per`` batch."""
+    try:
+        chunks = export_table(engine, table, format)
+    except ExportUnavailable as exc:
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
+
+
+@app.get("/dashboard/metrics")
+async def metrics(request: Request) -> Response:
+    """Dashboard counters; the ``ETag`` is derived from the payload, so polls get 304 until a count changes."""
+    snapshot = await run_in_threadpool(dashboard_metrics.snapshot)
+    payload = snapshot.as_dict()
+
+    async def build() -> dict[str, Any]:
+        return payload
+
+    return await _conditional_json(request, make_etag("metrics", payload), snapshot.modified_at, build)
+
+
 @app.get("/reports/monthly")
-def monthly_report(db: Session = Depends(get_db)) -> dict[str, Any]:
-    if db.query(Task).count() == 0 and db.query(Ticket).count() == 0 and db.query(Lead).count() == 0:
+async def monthly_report(
+    months: int = Query(12, ge=1, le=120),
+    end: str | None = Query(None, pattern=r"^\d{4}-\d{2}$", description="Last month of the report, YYYY-MM"),
+) -> dict[str, Any]:
+    """Tickets, task completion and lead volume per month, aggregated from the daily rollups."""
+    if not await run_in_threadpool(has_activity, engine):
         raise HTTPException(status_code=404, detail="No data available for report generation")
-    return {
-        "summary": "Monthly automation report generated successfully.",
-        "insights": [
-            "Average response time reduced by 35%",
-            "HR workflow completion improved by 22%",
-            "Lead conversion probability increased by 18%",
-        ],
-    }
+    try:
+        return await run_in_threadpool(build_monthly_report, engine, months, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -0,0 +1 @@
+"""Benchmarks for AI Office Manager."""
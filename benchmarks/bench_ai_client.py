@@ -0,0 +1,50 @@
+"""Compare a fresh OpenAI client per call against the engine's shared pooled client.
+
+Usage: python -m benchmarks.bench_ai_client [--calls N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.services.ai_engine import AIEngine
+from benchmarks.mock_openai import base_url, start_server
+
+
+def per_call_client(engine: AIEngine, prompt: str) -> str:
+    from openai import OpenAI
+
+    client = OpenAI(api_key=engine.api_key, base_url=engine.base_url)
+    completion = client.chat.completions.create(
+        model=engine.model,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return completion.choices[0].message.content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_server()
+    engine = AIEngine(api_key="bench", base_url=base_url(server))
+    engine.process("support", "warm up")
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        per_call_client(engine, f"ticket {i}")
+    fresh = (time.perf_counter() - start) / args.calls
+
+    start = time.perf_counter()
+    for i in range(args.calls):
+        engine.process("support", f"ticket {i}")
+    pooled = (time.perf_counter() - start) / args.calls
+
+    print(f"client per call: {fresh * 1000:.2f} ms/call")
+    print(f"shared client:   {pooled * 1000:.2f} ms/call ({fresh / pooled:.1f}x faster)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
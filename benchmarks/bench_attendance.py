@@ -0,0 +1,153 @@
+"""Attendance engine: chunked ingest of a month of clock events and per-employee period summaries.
+
+Usage: python -m benchmarks.bench_attendance [--events 10000000] [--loop-sample 1000000]
+
+Generates one month of synthetic badge events (every employee swiping in and out several times a
+day, with a few late arrivals and missed clock-outs) as a CSV file, then compares the summary
+(present days, late days, hours worked per employee) computed three ways:
+
+* ``python loop``: a per-event loop over the sorted log, timed on ``--loop-sample`` events and
+  extrapolated to the full month;
+* ``pandas``: the whole CSV loaded into a DataFrame and reduced with groupby/shift;
+* ``engine``: :class:`AttendanceStore` ingest, a cold summary over the memory-mapped columns, and
+  the cached summary in the same process and in a fresh store (disk cache).
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.services.attendance import AttendanceStore
+
+DAYS = 22
+SWIPE_PAIRS = 6
+LATE_AFTER = 9 * 3600 + 15 * 60
+MAX_SHIFT = 16 * 3600
+
+
+def generate(path: Path, events: int, seed: int = 7) -> int:
+    """Write a day-by-day event log for October 2026; returns the employee count."""
+    rng = np.random.default_rng(seed)
+    employees = max(1, events // (DAYS * SWIPE_PAIRS * 2))
+    month = np.datetime64("2026-10-01T00:00:00")
+    workdays = [day for day in range(31) if (month + np.timedelta64(day, "D")).astype("datetime64[D]").item().weekday() < 5]
+    names = np.char.add("emp", np.arange(employees).astype(str)).astype(object)
+    header = True
+    for day in workdays[:DAYS]:
+        # Arrival around 09:00 (sd 10 min), swipes through the day, departure around 17:30.
+        start = 9 * 3600 + rng.normal(0, 600, employees)
+        offsets = np.sort(rng.uniform(0, 8.5 * 3600, (employees, SWIPE_PAIRS * 2 - 2)), axis=1)
+        seconds = np.column_stack([start, start[:, None] + offsets, start + 8.5 * 3600]).astype(np.int64)
+        kinds = np.tile(np.array(["in", "out"]), (employees, SWIPE_PAIRS))
+        keep = np.ones_like(seconds, dtype=bool)
+        keep[rng.random(employees) < 0.01, -1] = False  # missed clock-outs
+        codes = np.repeat(np.arange(employees), SWIPE_PAIRS * 2).reshape(employees, -1)
+        stamps = month + np.timedelta64(day, "D") + seconds[keep].astype("timedelta64[s]")
+        frame = pd.DataFrame({"employee": names[codes[keep]], "timestamp": stamps, "event": kinds[keep]})
+        frame.to_csv(path, mode="a", header=header, index=False, date_format="%Y-%m-%dT%H:%M:%S")
+        header = False
+    return employees
+
+
+def python_loop(frame: pd.DataFrame) -> dict[str, list[float]]:
+    totals: dict[str, list[float]] = {}
+    last_employee, last_day, last_in = None, None, None
+    for employee, stamp, event in zip(frame["employee"], frame["timestamp"], frame["event"]):
+        entry = totals.setdefault(employee, [0, 0, 0.0])
+        day = stamp.date()
+        if employee != last_employee or day != last_day:
+            entry[0] += 1
+            second = stamp.hour * 3600 + stamp.minute * 60 + stamp.second
+            entry[1] += second > LATE_AFTER
+        if event == "out" and last_in is not None and employee == last_employee:
+            gap = (stamp - last_in).total_seconds()
+            if gap <= MAX_SHIFT:
+                entry[2] += gap
+        last_in = stamp if event == "in" else None
+        last_employee, last_day = employee, day
+    return totals
+
+
+def pandas_summary(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.sort_values(["employee", "timestamp"], kind="stable")
+    day = frame["timestamp"].dt.floor("D")
+    first = frame.groupby(["employee", day])["timestamp"].min()
+    late = (first - first.dt.floor("D")).dt.total_seconds() > LATE_AFTER
+    by_employee = frame.groupby("employee")
+    gap = (by_employee["timestamp"].shift(-1) - frame["timestamp"]).dt.total_seconds()
+    paired = (frame["event"] == "in") & (by_employee["event"].shift(-1) == "out") & (gap <= MAX_SHIFT)
+    return pd.DataFrame(
+        {
+            "present_days": first.groupby(level=0).size(),
+            "late_days": late.groupby(level=0).sum(),
+            "hours_worked": gap[paired].groupby(frame["employee"][paired]).sum() / 3600,
+        }
+    ).fillna(0)
+
+
+def _timed(fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--loop-sample", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "events.csv"
+        started = time.perf_counter()
+        employees = generate(csv_path, args.events)
+        with open(csv_path) as handle:
+            rows = sum(1 for _ in handle) - 1
+        print(
+            f"== {rows} events, {employees} employees, {DAYS} workdays "
+            f"(CSV {csv_path.stat().st_size / 2**20:.0f} MiB, generated in {time.perf_counter() - started:.1f} s)"
+        )
+
+        frame = pd.read_csv(csv_path, parse_dates=["timestamp"])
+        sample = frame.sort_values(["employee", "timestamp"], kind="stable").head(args.loop_sample)
+        _, loop_s, _ = _timed(python_loop, sample)
+        print(f"  python loop   {loop_s / len(sample) * rows:8.2f} s (extrapolated from {len(sample)} events)")
+        expected, pandas_s, pandas_peak = _timed(pandas_summary, frame)
+        print(f"  pandas        {pandas_s:8.2f} s  peak {pandas_peak / 2**20:6.0f} MiB  (after loading the CSV)")
+        del frame, sample
+
+        store = AttendanceStore(Path(tmp) / "store")
+        result, ingest_s, ingest_peak = _timed(store.ingest, str(csv_path))
+        store_bytes = sum(p.stat().st_size for p in (Path(tmp) / "store" / "events").rglob("*.bin"))
+        print(
+            f"  engine ingest {ingest_s:8.2f} s  peak {ingest_peak / 2**20:6.0f} MiB  "
+            f"{rows / ingest_s / 1e6:.2f} M events/s  store {store_bytes / 2**20:.0f} MiB ({store_bytes / rows:.0f} B/event)"
+        )
+        period = result["periods"][0]
+        summary, cold_s, cold_peak = _timed(store.summary, period)
+        print(f"  engine cold   {cold_s:8.2f} s  peak {cold_peak / 2**20:6.0f} MiB")
+        _, warm_s, _ = _timed(store.summary, period)
+        _, disk_s, _ = _timed(AttendanceStore(Path(tmp) / "store").summary, period)
+        print(f"  engine cached {warm_s * 1000:8.3f} ms in memory, {disk_s * 1000:.1f} ms from disk in a new store")
+
+        merged = summary.set_index("employee").join(expected, rsuffix="_pandas")
+        mismatched = int(
+            (merged["present_days"] != merged["present_days_pandas"]).sum()
+            + (merged["late_days"] != merged["late_days_pandas"]).sum()
+            + (~np.isclose(merged["hours_worked"], merged["hours_worked_pandas"], atol=0.01)).sum()
+        )
+        print(f"  engine vs pandas: {mismatched} mismatched values over {len(merged)} employees")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Ticket classifier throughput: train on synthetic tickets, then classify in batches.
+
+Usage: python -m benchmarks.bench_classifier [--train 50000] [--texts 100000] [--batch 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.services.ticket_classifier import SEED_EXAMPLES, TicketClassifier
+
+NOISE = ["please help", "urgent", "since yesterday", "again", "thanks", "asap", "for account 1234", "on mobile"]
+
+
+def synthetic(count: int, rng: random.Random) -> tuple[list[str], list[str]]:
+    pairs = [(text, label) for label, texts in SEED_EXAMPLES.items() for text in texts]
+    texts, labels = [], []
+    for _ in range(count):
+        text, label = rng.choice(pairs)
+        texts.append(f"{text} {rng.choice(NOISE)} {rng.choice(NOISE)}")
+        labels.append(label)
+    return texts, labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train", type=int, default=50_000)
+    parser.add_argument("--texts", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    start = time.perf_counter()
+    classifier = TicketClassifier.train(*synthetic(args.train, rng))
+    print(f"trained on {args.train:,} tickets in {time.perf_counter() - start:.2f} s")
+
+    texts, labels = synthetic(args.texts, rng)
+    start = time.perf_counter()
+    predictions = []
+    for offset in range(0, len(texts), args.batch):
+        predictions.extend(classifier.classify(texts[offset : offset + args.batch]))
+    elapsed = time.perf_counter() - start
+    accuracy = sum(p["label"] == label for p, label in zip(predictions, labels)) / len(labels)
+    print(f"classified {len(texts):,} texts: {len(texts) / elapsed:,.0f}/s (batch {args.batch}), accuracy {accuracy:.3f}")
+
+    start = time.perf_counter()
+    for text in texts[:2_000]:
+        classifier.classify([text])
+    print(f"single-text calls: {2_000 / (time.perf_counter() - start):,.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
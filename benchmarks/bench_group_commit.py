@@ -0,0 +1,65 @@
+"""Concurrent single-row ticket inserts: commit per request vs. the group-commit batcher.
+
+Usage: python -m benchmarks.bench_group_commit [--writers 64] [--rows 50]
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from app.services.database import Base, Ticket, create_db_engine
+from app.services.write_batcher import WriteBatcher
+
+
+def run(writers: int, rows: int, insert_one) -> tuple[float, int]:
+    errors = 0
+
+    def writer(worker: int) -> int:
+        failed = 0
+        for i in range(rows):
+            try:
+                insert_one({"customer": f"w{worker}", "issue": f"issue {i}", "category": "General"})
+            except Exception:  # noqa: BLE001 - every failed write counts, whatever the cause
+                failed += 1
+        return failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        errors = sum(pool.map(writer, range(writers)))
+    return time.perf_counter() - start, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=50)
+    args = parser.parse_args()
+    total = args.writers * args.rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+
+        def per_request_commit(values: dict) -> None:
+            with Session() as db:
+                db.add(Ticket(**values))
+                db.commit()
+
+        elapsed, errors = run(args.writers, args.rows, per_request_commit)
+        print(f"commit per request: {total / elapsed:8.0f} rows/s, {errors} errors")
+
+        batcher = WriteBatcher(engine)
+        elapsed, errors = run(args.writers, args.rows, lambda values: batcher.insert(Ticket, values))
+        batcher.close()
+        print(f"group commit:       {total / elapsed:8.0f} rows/s, {errors} errors")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Reminder scheduler: memory, CPU and firing lateness with a large pending backlog.
+
+Usage: python -m benchmarks.bench_reminders [--pending 200000] [--burst 2000] [--idle 65]
+
+Each run seeds a fresh SQLite database with ``--pending`` reminders spread over the next 30 days
+plus ``--burst`` due within the first seconds of the run, starts a :class:`ReminderScheduler`,
+and reports the memory held after its first load, the CPU it burns firing the burst and then
+idling for ``--idle`` seconds, and how late each burst reminder reached ``on_fire``. The windowed scheduler is compared with one
+whose window covers the whole backlog (everything in the heap, as a load-all design would hold).
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from app.services.database import Reminder, create_db_engine, init_db
+from app.services.reminders import FiredReminder, ReminderScheduler, utc_now
+
+BURST_SECONDS = 5.0
+
+
+def _insert(bind, rows: list[dict]) -> None:
+    with bind.begin() as conn:
+        for offset in range(0, len(rows), 20_000):
+            conn.execute(insert(Reminder), rows[offset : offset + 20_000])
+
+
+def _seed(bind, pending: int, burst: int) -> None:
+    rng = random.Random(7)
+    now = utc_now()
+    _insert(bind, [
+        {"message": f"follow up {i}", "remind_at": now + timedelta(seconds=rng.uniform(3600, 30 * 86400))}
+        for i in range(pending)
+    ])
+    # Seeded last and a few seconds out, so the burst is still ahead once the scheduler has loaded.
+    now = utc_now()
+    _insert(bind, [
+        {"message": f"standup {i}", "remind_at": now + timedelta(seconds=3 + rng.uniform(0, BURST_SECONDS))}
+        for i in range(burst)
+    ])
+
+
+def run(label: str, pending: int, burst: int, idle: float, window: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        bind = create_db_engine(f"sqlite:///{Path(tmp) / 'reminders.db'}")
+        init_db(bind)
+        seeded = time.perf_counter()
+        _seed(bind, pending, burst)
+        seed_s = time.perf_counter() - seeded
+
+        lateness: list[float] = []
+        lock = threading.Lock()
+
+        def on_fire(fired: list[FiredReminder]) -> None:
+            now = utc_now()
+            with lock:
+                lateness.extend((now - r.due_at).total_seconds() * 1000 for r in fired)
+
+        scheduler = ReminderScheduler(bind, on_fire=on_fire, window=window)
+        tracemalloc.start()
+        loaded_at = time.perf_counter()
+        scheduler.start()
+        while scheduler.stats()["refreshes"] < 1:
+            time.sleep(0.005)
+        load_s = time.perf_counter() - loaded_at
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        cpu = time.process_time()
+        deadline = time.monotonic() + 3 + BURST_SECONDS + 10
+        while scheduler.stats()["fired"] < burst and time.monotonic() < deadline:
+            time.sleep(0.05)
+        burst_cpu_s = time.process_time() - cpu
+        cpu = time.process_time()
+        time.sleep(idle)
+        idle_cpu_s = time.process_time() - cpu
+        stats = scheduler.stats()
+        scheduler.stop()
+        bind.dispose()
+
+    ordered = sorted(lateness)
+    p50 = ordered[len(ordered) // 2] if ordered else float("nan")
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else float("nan")
+    print(
+        f"  {label:18} loaded {stats['queued'] + stats['fired']:7}  held {held / 2**20:6.1f} MiB  "
+        f"first load {load_s * 1000:6.0f} ms  CPU burst {burst_cpu_s:5.2f} s  idle {idle_cpu_s:5.3f} s / {idle:.0f} s  "
+        f"fired {stats['fired']:5}  late p50 {p50:5.1f} ms  p99 {p99:5.1f} ms  (seed {seed_s:.1f} s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pending", type=int, default=200_000)
+    parser.add_argument("--burst", type=int, default=2000)
+    parser.add_argument("--idle", type=float, default=65.0, help="seconds of idle CPU after the burst (covers two 30 s refreshes)")
+    args = parser.parse_args()
+    print(f"== {args.pending} reminders over 30 days + {args.burst} due within {BURST_SECONDS:.0f} s")
+    run("window 10 min", args.pending, args.burst, args.idle, window=600)
+    run("whole backlog", args.pending, args.burst, args.idle, window=31 * 86400)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Cold-start and rerun cost of the Streamlit app, plus an import-time profile of its module.
+
+Usage: python -m benchmarks.bench_startup [--reruns 5] [--top 15] [--pages "HR Bot,Sales Bot"]
+
+Every measurement runs in a fresh interpreter against a temporary database, so imports, schema
+init and model loading are paid exactly as on a real cold start:
+
+* ``import``: ``python -X importtime`` of ``app.streamlit_app``; its slowest direct imports are
+  listed by cumulative time.
+* per page: the first script run after login (the Dashboard) and the first visit of the page,
+  then the mean of ``--reruns`` reruns, with the heavy packages loaded by that point.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PAGES = ["Dashboard", "HR Bot", "Analyst Bot", "Support Bot", "Admin Bot", "Sales Bot"]
+HEAVY_PACKAGES = ["numpy", "pandas", "plotly", "sklearn", "scipy", "openai", "pyarrow"]
+
+# Runs in the child interpreter; prints one JSON line.
+_PAGE_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=600)
+at.session_state["authenticated"] = True
+at.run()
+first_run = time.perf_counter() - started
+page_started = time.perf_counter()
+if {page!r} != "Dashboard":
+    at.sidebar.radio[0].set_value({page!r}).run()
+first_visit = time.perf_counter() - page_started if {page!r} != "Dashboard" else first_run
+reruns = []
+for _ in range({reruns}):
+    rerun_started = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - rerun_started)
+print(json.dumps({{
+    "first_run_s": first_run,
+    "first_visit_s": first_visit,
+    "rerun_s": sum(reruns) / len(reruns) if reruns else None,
+    "exceptions": [str(e.value) for e in at.exception],
+    "heavy": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def _env(workdir: Path) -> dict[str, str]:
+    return {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+        "DATABASE_URL": f"sqlite:///{workdir / 'startup.db'}",
+        "MODEL_CACHE_DIR": str(workdir / "models"),
+        "AI_CACHE_PATH": "",
+        "OPENAI_API_KEY": "",
+    }
+
+
+def import_profile(workdir: Path, top: int) -> tuple[float, list[tuple[str, float]]]:
+    """Total import time of ``app.streamlit_app`` and its slowest direct imports (seconds)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.streamlit_app"],
+        cwd=REPO_ROOT,
+        env=_env(workdir),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Children are printed before their parent, indented two spaces per level.
+    children: list[tuple[str, float]] = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        if not indent:
+            if name == "app.streamlit_app":
+                return int(cumulative) / 1e6, sorted(children, key=lambda e: -e[1])[:top]
+            children = []
+        elif len(indent) == 2:
+            children.append((name, int(cumulative) / 1e6))
+    raise RuntimeError(f"import app.streamlit_app failed:\n{result.stderr[-2000:]}")
+
+
+def page_profile(workdir: Path, page: str, reruns: int) -> dict:
+    app = str(REPO_ROOT / "app" / "streamlit_app.py")
+    probe = _PAGE_PROBE.format(app=app, page=page, reruns=reruns, heavy=HEAVY_PACKAGES)
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=REPO_ROOT, env=_env(workdir), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--pages", help="comma-separated subset of: " + ", ".join(PAGES))
+    args = parser.parse_args()
+    pages = args.pages.split(",") if args.pages else PAGES
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        total, slowest = import_profile(workdir, args.top)
+        print(f"import app.streamlit_app: {total:.3f} s")
+        for name, seconds in slowest:
+            print(f"  {name:40} {seconds:7.3f} s")
+        print()
+        print(f"{'page':14} {'first run':>10} {'first visit':>12} {'rerun':>9}  heavy packages loaded")
+        for page in pages:
+            row = page_profile(workdir, page, args.reruns)
+            rerun = f"{row['rerun_s']:.3f}" if row["rerun_s"] is not None else "-"
+            note = f"  EXCEPTION: {row['exceptions']}" if row["exceptions"] else ""
+            print(
+                f"{page:14} {row['first_run_s']:10.3f} {row['first_visit_s']:12.3f} {rerun:>9}  "
+                f"{', '.join(row['heavy']) or '-'}{note}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare a benchmark report against a saved baseline and flag regressions.
+
+Usage: python -m benchmarks.compare baseline.json current.json [--threshold 0.15] [--min-delta-ms 1]
+
+Exits with status 1 when any scenario regressed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, TextIO
+
+DEFAULT_THRESHOLD = 0.15
+# Latency changes smaller than this are treated as noise however large the ratio.
+DEFAULT_MIN_DELTA_MS = 1.0
+
+
+def _change(before: float | None, after: float | None) -> float | None:
+    if not before or after is None:
+        return None
+    return (after - before) / before
+
+
+def compare(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+) -> list[dict[str, Any]]:
+    """Per-scenario deltas; a scenario regresses when p95 latency rises or throughput falls by more than ``threshold``."""
+    rows = []
+    for name, now in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            rows.append({"scenario": name, "status": "new"})
+            continue
+        p95 = _change(before.get("p95_ms"), now.get("p95_ms"))
+        throughput = _change(before.get("throughput_rps"), now.get("throughput_rps"))
+        p95_delta = (now.get("p95_ms") or 0) - (before.get("p95_ms") or 0)
+        reasons = []
+        if p95 is not None and p95 > threshold and p95_delta > min_delta_ms:
+            reasons.append(f"p95 +{p95:.0%}")
+        if throughput is not None and throughput < -threshold:
+            reasons.append(f"throughput {throughput:.0%}")
+        if now.get("errors", 0) > before.get("errors", 0):
+            reasons.append(f"errors {before.get('errors', 0)} -> {now['errors']}")
+        improved = (p95 is not None and p95 < -threshold and -p95_delta > min_delta_ms) or (
+            throughput is not None and throughput > threshold
+        )
+        rows.append(
+            {
+                "scenario": name,
+                "status": "regressed" if reasons else "improved" if improved else "ok",
+                "p95_ms": [before.get("p95_ms"), now.get("p95_ms")],
+                "throughput_rps": [before.get("throughput_rps"), now.get("throughput_rps")],
+                "reasons": reasons,
+            }
+        )
+    for name in sorted(baseline["scenarios"].keys() - current["scenarios"].keys()):
+        rows.append({"scenario": name, "status": "missing"})
+    return rows
+
+
+def print_comparison(rows: list[dict[str, Any]], file: TextIO = sys.stdout) -> None:
+    print(f"{'scenario':32} {'status':10} {'p95 ms (base -> now)':>24} {'req/s (base -> now)':>24}", file=file)
+    for row in rows:
+        if "p95_ms" not in row:
+            print(f"{row['scenario']:32} {row['status']:10}", file=file)
+            continue
+        p95 = " -> ".join("-" if value is None else f"{value:.1f}" for value in row["p95_ms"])
+        rps = " -> ".join("-" if value is None else f"{value:.1f}" for value in row["throughput_rps"])
+        note = f"  ({', '.join(row['reasons'])})" if row["reasons"] else ""
+        print(f"{row['scenario']:32} {row['status']:10} {p95:>24} {rps:>24}{note}", file=file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args()
+    rows = compare(
+        json.loads(args.baseline.read_text()), json.loads(args.current.read_text()), args.threshold, args.min_delta_ms
+    )
+    print_comparison(rows)
+    sys.exit(1 if any(row["status"] == "regressed" for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
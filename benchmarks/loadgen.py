@@ -0,0 +1,262 @@
+"""Closed-loop HTTP load generator and the endpoint scenarios the benchmark suite drives.
+
+Each scenario runs ``concurrency`` workers that issue requests back to back (each on its own
+keep-alive session) until the duration or the scenario's request cap is reached.
+"""
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+import requests
+
+ISSUES = [
+    "I was charged twice for my subscription",
+    "The app crashes when I log in",
+    "My order has not been delivered yet",
+    "What are your business hours",
+]
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    # Builds the request kwargs (json=..., data=..., params=...) for the i-th request.
+    build: Callable[[int], dict[str, Any]] = field(default=lambda i: {})
+    # Heavy or table-wide operations get a request cap and fewer workers.
+    max_requests: int | None = None
+    max_concurrency: int | None = None
+
+
+def _ndjson(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    return {
+        "data": "\n".join(json.dumps(row) for row in rows).encode(),
+        "headers": {"Content-Type": "application/x-ndjson"},
+    }
+
+
+def _regression_csv(rows: int = 5000) -> bytes:
+    lines = ["x1,x2,y"] + [f"{i},{i % 17},{3 * i + 2 * (i % 17) + 5}" for i in range(rows)]
+    return "\n".join(lines).encode()
+
+
+REGRESSION_CSV = _regression_csv()
+ATTENDANCE_PERIOD = "2026-01"
+
+
+def _attendance_csv(i: int, employees: int = 500) -> dict[str, Any]:
+    """One office day of clock-ins and clock-outs in ``ATTENDANCE_PERIOD``, a different day per request."""
+    day = f"{ATTENDANCE_PERIOD}-{i % 28 + 1:02d}"
+    lines = ["employee,timestamp,event"]
+    for j in range(employees):
+        lines += [f"emp{j},{day}T09:{j % 30:02d}:00,in", f"emp{j},{day}T17:{j % 60:02d}:00,out"]
+    return {"data": "\n".join(lines).encode(), "headers": {"Content-Type": "text/csv"}}
+
+
+def default_scenarios() -> list[Scenario]:
+    """One scenario per API endpoint (plus cached/uncached and filtered variants).
+
+    Scenarios that read data another scenario writes (reminders, attendance) come after it.
+    """
+    today = date.today()
+    return [
+        Scenario("health", "GET", "/health"),
+        Scenario("ai_process", "POST", "/ai/process", lambda i: {"json": {"department": "support", "task": f"ticket {i}"}}),
+        Scenario("ai_process_cached", "POST", "/ai/process", lambda i: {"json": {"department": "support", "task": "cached"}}),
+        Scenario("ai_stream", "POST", "/ai/process/stream", lambda i: {"json": {"department": "hr", "task": f"policy {i}"}}),
+        Scenario(
+            "ai_batch",
+            "POST",
+            "/ai/process/batch",
+            lambda i: {"json": {"items": [{"department": "sales", "task": f"lead {i}-{j}"} for j in range(20)]}},
+        ),
+        Scenario("ai_cache_stats", "GET", "/ai/cache/stats"),
+        Scenario("ai_scheduler_stats", "GET", "/ai/scheduler/stats"),
+        Scenario(
+            "create_ticket",
+            "POST",
+            "/support/tickets",
+            lambda i: {"json": {"customer": f"bench{i}", "issue": ISSUES[i % 4], "category": "General"}},
+        ),
+        Scenario(
+            "create_ticket_auto_category",
+            "POST",
+            "/support/tickets",
+            lambda i: {"json": {"customer": f"bench{i}", "issue": ISSUES[i % 4]}},
+        ),
+        Scenario("classify", "POST", "/support/classify", lambda i: {"json": {"texts": ISSUES * 25}}),
+        Scenario("classifier_train", "POST", "/support/classifier/train", max_requests=2, max_concurrency=1),
+        Scenario(
+            "tickets_bulk",
+            "POST",
+            "/support/tickets/bulk",
+            lambda i: _ndjson([{"customer": f"bulk{i}", "issue": ISSUES[j % 4], "category": "General"} for j in range(1000)]),
+            max_requests=20,
+            max_concurrency=2,
+        ),
+        Scenario("ticket_search", "GET", "/support/tickets/search", lambda i: {"params": {"q": ["refund", "crash", "order", "hours"][i % 4]}}),
+        Scenario("list_tickets", "GET", "/support/tickets", lambda i: {"params": {"limit": 50}}),
+        Scenario("list_tickets_by_status", "GET", "/support/tickets", lambda i: {"params": {"limit": 50, "status": "Open"}}),
+        Scenario(
+            "create_task",
+            "POST",
+            "/admin/tasks",
+            lambda i: {"json": {"title": f"Task {i}", "owner": "bench", "due_date": "2030-01-01"}},
+        ),
+        Scenario(
+            "tasks_bulk",
+            "POST",
+            "/admin/tasks/bulk",
+            lambda i: _ndjson([{"title": f"Bulk {i}-{j}", "owner": "bench", "due_date": "2030-01-01"} for j in range(1000)]),
+            max_requests=20,
+            max_concurrency=2,
+        ),
+        Scenario(
+            "tasks_due",
+            "GET",
+            "/admin/tasks/due",
+            lambda i: {"params": {"start": today.isoformat(), "end": (today + timedelta(days=30)).isoformat(), "limit": 50}},
+        ),
+        Scenario("tasks_overdue", "GET", "/admin/tasks/due", lambda i: {"params": {"overdue": "true", "limit": 50}}),
+        Scenario(
+            "create_reminder",
+            "POST",
+            "/admin/reminders",
+            lambda i: {"json": {"message": f"Follow up {i}", "remind_at": f"{today + timedelta(days=1 + i % 30)}T09:00:00Z"}},
+        ),
+        Scenario("list_reminders", "GET", "/admin/reminders", lambda i: {"params": {"limit": 50}}),
+        Scenario("reminder_stats", "GET", "/admin/reminders/stats"),
+        Scenario(
+            "create_lead",
+            "POST",
+            "/sales/leads",
+            lambda i: {
+                "json": {"name": f"L{i}", "email": f"l{i}@x.io", "company": "Bench", "source": "Web", "deal_size": 5000, "score": 0}
+            },
+        ),
+        Scenario(
+            "leads_bulk",
+            "POST",
+            "/sales/leads/bulk",
+            lambda i: _ndjson(
+                [
+                    {"name": f"B{i}-{j}", "email": "b@x.io", "company": "Bench", "source": "Event", "deal_size": 1000 + j, "score": 0}
+                    for j in range(1000)
+                ]
+            ),
+            max_requests=20,
+            max_concurrency=2,
+        ),
+        Scenario("leads_rescore", "POST", "/sales/leads/rescore", max_requests=2, max_concurrency=1),
+        Scenario("list_leads", "GET", "/sales/leads", lambda i: {"params": {"limit": 50}}),
+        Scenario("list_leads_by_source", "GET", "/sales/leads", lambda i: {"params": {"limit": 50, "source": "Referral"}}),
+        Scenario("attendance_events", "POST", "/hr/attendance/events", _attendance_csv, max_requests=20, max_concurrency=2),
+        Scenario("attendance_periods", "GET", "/hr/attendance"),
+        Scenario("attendance_summary", "GET", f"/hr/attendance/{ATTENDANCE_PERIOD}"),
+        Scenario(
+            "analyst_regression",
+            "POST",
+            "/analyst/regression",
+            lambda i: {"data": REGRESSION_CSV, "headers": {"Content-Type": "text/csv"}},
+            max_requests=50,
+            max_concurrency=4,
+        ),
+        Scenario("export_tickets_csv", "GET", "/export/tickets", lambda i: {"params": {"format": "csv"}}, max_requests=3, max_concurrency=1),
+        Scenario("dashboard_metrics", "GET", "/dashboard/metrics"),
+        Scenario("prometheus_metrics", "GET", "/metrics"),
+        Scenario("reports_monthly", "GET", "/reports/monthly", lambda i: {"params": {"months": 12}}),
+    ]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    """Throughput and latency percentiles (milliseconds) for one scenario."""
+    done = len(latencies)
+    result: dict[str, Any] = {
+        "requests": done,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(done / elapsed, 2) if elapsed else 0.0,
+    }
+    if latencies:
+        ms = np.asarray(latencies) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        result.update(
+            mean_ms=round(float(ms.mean()), 3),
+            p50_ms=round(float(p50), 3),
+            p95_ms=round(float(p95), 3),
+            p99_ms=round(float(p99), 3),
+            max_ms=round(float(ms.max()), 3),
+        )
+    return result
+
+
+def run_scenario(
+    base_url: str,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    warmup: int = 1,
+    timeout: float = 120.0,
+) -> dict[str, Any]:
+    """Drive one scenario and return its :func:`summarize` result (errors: non-2xx or exceptions).
+
+    Uncapped scenarios first send ``warmup`` unrecorded requests, so one-off costs such as lazy
+    imports or first-use model training do not land in the percentiles.
+    """
+    workers = min(concurrency, scenario.max_concurrency or concurrency)
+    counter = itertools.count()
+    if scenario.max_requests is None:
+        with requests.Session() as session:
+            for _ in range(warmup):
+                try:
+                    session.request(scenario.method, base_url + scenario.path, timeout=timeout, **scenario.build(next(counter)))
+                except requests.RequestException:
+                    pass
+    lock = threading.Lock()
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    def worker() -> None:
+        nonlocal errors
+        session = requests.Session()
+        local: list[float] = []
+        failed = 0
+        try:
+            while time.perf_counter() < deadline:
+                i = next(counter)
+                if scenario.max_requests is not None and i >= scenario.max_requests:
+                    break
+                started = time.perf_counter()
+                try:
+                    response = session.request(scenario.method, base_url + scenario.path, timeout=timeout, **scenario.build(i))
+                    ok = response.ok
+                except requests.RequestException:
+                    ok = False
+                if ok:
+                    local.append(time.perf_counter() - started)
+                else:
+                    failed += 1
+        finally:
+            session.close()
+            with lock:
+                latencies.extend(local)
+                errors += failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(worker) for _ in range(workers)]:
+            future.result()
+    result = summarize(latencies, errors, time.perf_counter() - started)
+    result["concurrency"] = workers
+    return result
@@ -0,0 +1,159 @@
+"""Local OpenAI-compatible stand-in server for benchmarks and offline runs.
+
+Only ``POST /v1/chat/completions`` is implemented. Point the engine at it with
+``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1`` and any non-empty ``OPENAI_API_KEY``.
+With ``rate_limit`` (requests per second) it answers excess requests with 429, like a provider.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _completion(model: str, content: str) -> dict:
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }
+
+
+def _chunk(model: str, content: str | None) -> dict:
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "delta": {"content": content} if content is not None else {},
+                "finish_reason": None if content is not None else "stop",
+            }
+        ],
+    }
+
+
+class _RateLimit:
+    """Token bucket holding one second of requests, refilled continuously (thread-safe)."""
+
+    def __init__(self, per_second: int) -> None:
+        self.per_second = per_second
+        self._level = float(per_second)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.per_second, self._level + (now - self._updated) * self.per_second)
+            self._updated = now
+            if self._level < 1:
+                return False
+            self._level -= 1
+            return True
+
+
+def make_handler(latency: float, rate_limit: int | None = None) -> type[BaseHTTPRequestHandler]:
+    limiter = _RateLimit(rate_limit) if rate_limit else None
+
+    class MockOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            if limiter is not None and not limiter.allow():
+                self.server.rate_limited += 1
+                payload = b'{"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}'
+                self.send_response(429)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                return
+            self.server.completions += 1
+            if latency:
+                time.sleep(latency)
+            prompt = body.get("messages", [{}])[-1].get("content", "")
+            model = body.get("model", "mock")
+            if body.get("stream"):
+                self._stream(model, f"[MOCK SERVER] {prompt}")
+                return
+            payload = json.dumps(_completion(body.get("model", "mock"), f"[MOCK SERVER] {prompt}")).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _stream(self, model: str, content: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for word in [*content.split(" "), None]:
+                token = None if word is None else word + " "
+                self.wfile.write(f"data: {json.dumps(_chunk(model, token))}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+    return MockOpenAIHandler
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    # The default listen backlog of 5 overflows under concurrent load, and the dropped SYNs
+    # are retried after a full second, which shows up as fake tail latency.
+    request_queue_size = 1024
+    # Answered and rejected completion requests, for tests that count upstream calls.
+    completions = 0
+    rate_limited = 0
+
+
+def start_server(
+    host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, rate_limit: int | None = None
+) -> MockOpenAIServer:
+    """Start the stand-in server on a daemon thread and return it; ``port=0`` picks a free port."""
+    server = MockOpenAIServer((host, port), make_handler(latency, rate_limit))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/v1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every completion")
+    parser.add_argument("--rate-limit", type=int, help="requests per second before answering 429")
+    args = parser.parse_args()
+    server = MockOpenAIServer((args.host, args.port), make_handler(args.latency, args.rate_limit))
+    print(f"Mock OpenAI server on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Seed a database with deterministic synthetic tickets, leads and tasks for benchmarks.
+
+Usage: python -m benchmarks.seed --url sqlite:///bench.db [--tickets 50000] [--leads 20000] [--tasks 10000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.services.database import Lead, Task, Ticket, create_db_engine, init_db
+from app.services.ticket_classifier import SEED_EXAMPLES
+
+CHUNK_SIZE = 10_000
+NOISE = ["please help", "urgent", "since yesterday", "again", "thanks", "asap", "for account 1234", "on mobile"]
+SOURCES = ["Web", "Referral", "Event", "Ads", "Partner"]
+HISTORY_DAYS = 730
+
+
+def _tickets(rng: random.Random, now: datetime) -> Callable[[int], dict[str, Any]]:
+    pairs = [(text, label) for label, texts in SEED_EXAMPLES.items() for text in texts]
+
+    def row(i: int) -> dict[str, Any]:
+        text, label = rng.choice(pairs)
+        return {
+            "customer": f"customer{i % 5000}",
+            "issue": f"{text} {rng.choice(NOISE)}",
+            "category": label,
+            "status": rng.choice(["Open", "Open", "Pending", "Closed"]),
+            "created_at": now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+        }
+
+    return row
+
+
+def _leads(rng: random.Random, now: datetime) -> Callable[[int], dict[str, Any]]:
+    def row(i: int) -> dict[str, Any]:
+        deal_size = round(rng.uniform(1_000, 60_000), 2)
+        return {
+            "name": f"Lead {i}",
+            "email": f"lead{i}@example.com",
+            "company": f"Company {i % 2000}",
+            "source": rng.choice(SOURCES),
+            "deal_size": deal_size,
+            "score": round(40 + deal_size / 1000, 2),
+            "extra": {"engagement": rng.randrange(10, 100), "meetings": rng.randrange(0, 6)},
+            "created_at": now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400)),
+        }
+
+    return row
+
+
+def _tasks(rng: random.Random, now: datetime) -> Callable[[int], dict[str, Any]]:
+    def row(i: int) -> dict[str, Any]:
+        return {
+            "title": f"Task {i}",
+            "owner": f"owner{i % 50}",
+            "due_date": (now + timedelta(days=rng.randrange(-HISTORY_DAYS, 60))).strftime("%Y-%m-%d"),
+            "priority": rng.choice(["Low", "Medium", "High"]),
+            "status": rng.choice(["Pending", "In Progress", "Completed"]),
+        }
+
+    return row
+
+
+def _chunks(count: int, make_row: Callable[[int], dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    for start in range(0, count, CHUNK_SIZE):
+        yield [make_row(i) for i in range(start, min(count, start + CHUNK_SIZE))]
+
+
+def seed_database(url: str, tickets: int, leads: int, tasks: int, seed: int = 42) -> dict[str, Any]:
+    """Create the schema at ``url`` and append the requested number of rows to each table."""
+    engine = create_db_engine(url)
+    init_db(engine)
+    rng = random.Random(seed)
+    now = datetime.now(UTC).replace(tzinfo=None)
+    started = time.perf_counter()
+    for model, count, factory in ((Ticket, tickets, _tickets), (Lead, leads, _leads), (Task, tasks, _tasks)):
+        statement = insert(model.__table__)
+        for chunk in _chunks(count, factory(rng, now)):
+            with engine.begin() as conn:
+                conn.execute(statement, chunk)
+    engine.dispose()
+    return {"tickets": tickets, "leads": leads, "tasks": tasks, "seconds": round(time.perf_counter() - started, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="sqlite:///bench.db")
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--leads", type=int, default=20_000)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    print(seed_database(args.url, args.tickets, args.leads, args.tasks, args.seed))
+
+
+if __name__ == "__main__":
+    main()
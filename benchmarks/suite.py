@@ -0,0 +1,186 @@
+"""End-to-end API benchmark: seed a database, start the OpenAI stand-in and the API, load every endpoint.
+
+Usage:
+    python -m benchmarks.suite [--tickets 50000] [--leads 20000] [--tasks 10000]
+                               [--latency 0.05] [--concurrency 16] [--duration 5]
+                               [--scenarios health,ai_process] [--env DB_WRITE_BATCHING=1]
+                               [--output report.json] [--baseline baseline.json]
+
+The API runs under uvicorn in a subprocess against a freshly seeded SQLite file, with ``OPENAI_BASE_URL``
+pointing at ``benchmarks.mock_openai`` (also a subprocess), so the load generator does not
+share a GIL with either. The report is JSON; with ``--baseline`` it is also compared against a
+previous report and the exit status is 1 if any scenario regressed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from benchmarks.compare import (
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_THRESHOLD,
+    compare,
+    print_comparison,
+)
+from benchmarks.loadgen import default_scenarios, run_scenario
+from benchmarks.seed import seed_database
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{' '.join(process.args)} exited with status {process.returncode}")
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise TimeoutError(f"{url} did not come up within {timeout:.0f}s")
+
+
+@contextmanager
+def _process(args: list[str], env: dict[str, str], ready_url: str) -> Iterator[subprocess.Popen]:
+    process = subprocess.Popen(args, cwd=REPO_ROOT, env=env)
+    try:
+        _wait_until_up(ready_url, process)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args: argparse.Namespace, workdir: Path) -> dict[str, Any]:
+    for stale in workdir.glob("bench.db*"):
+        stale.unlink()
+    shutil.rmtree(workdir / "attendance", ignore_errors=True)
+    db_url = f"sqlite:///{workdir / 'bench.db'}"
+    print(f"seeding {db_url} ...", file=sys.stderr)
+    seeded = seed_database(db_url, args.tickets, args.leads, args.tasks)
+
+    mock_port, api_port = _free_port(), _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+        "DATABASE_URL": db_url,
+        "OPENAI_API_KEY": "bench",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{mock_port}/v1",
+        "MODEL_CACHE_DIR": str(workdir / "models"),
+        "ATTENDANCE_STORE_DIR": str(workdir / "attendance"),
+        "AI_CACHE_PATH": "",
+    }
+    env.update(dict(item.split("=", 1) for item in args.env))
+    mock = [sys.executable, "-m", "benchmarks.mock_openai", "--port", str(mock_port), "--latency", str(args.latency)]
+    api = [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1", "--port", str(api_port), "--log-level", "warning"]
+    api_url = f"http://127.0.0.1:{api_port}"
+
+    scenarios = default_scenarios()
+    if args.scenarios:
+        wanted = set(args.scenarios.split(","))
+        unknown = wanted - {scenario.name for scenario in scenarios}
+        if unknown:
+            raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in wanted]
+
+    results = {}
+    with _process(mock, env, f"http://127.0.0.1:{mock_port}/"), _process(api, env, f"{api_url}/health"):
+        for scenario in scenarios:
+            result = run_scenario(api_url, scenario, args.concurrency, args.duration, args.warmup)
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:32} {result['throughput_rps']:9.1f} req/s  p50 {result.get('p50_ms', 0):8.1f} ms  "
+                f"p95 {result.get('p95_ms', 0):8.1f} ms  p99 {result.get('p99_ms', 0):8.1f} ms  errors {result['errors']}",
+                file=sys.stderr,
+            )
+    return {
+        "meta": {
+            "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seeded": seeded,
+            "mock_latency_s": args.latency,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup": args.warmup,
+            "env": args.env,
+        },
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=50_000)
+    parser.add_argument("--leads", type=int, default=20_000)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the mock OpenAI server adds per completion")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="unrecorded requests before each uncapped scenario")
+    parser.add_argument("--scenarios", help="comma-separated subset of scenario names")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra API environment")
+    parser.add_argument("--workdir", type=Path, help="keep the database and models here instead of a temp dir")
+    parser.add_argument("--output", type=Path, help="write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="compare against this report and exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS)
+    args = parser.parse_args()
+
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        report = run_suite(args, args.workdir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            report = run_suite(args, Path(tmp))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        rows = compare(json.loads(args.baseline.read_text()), report, args.threshold, args.min_delta_ms)
+        print_comparison(rows, file=sys.stderr)
+        if any(row["status"] == "regressed" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Test configuration: every test run gets its own database, model cache and attendance store."""
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Set before any app module is imported: the app engine reads DATABASE_URL at import time.
+_SCRATCH = Path(tempfile.mkdtemp(prefix="ai-office-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH / 'app.db'}"
+os.environ["MODEL_CACHE_DIR"] = str(_SCRATCH / "models")
+os.environ["ATTENDANCE_STORE_DIR"] = str(_SCRATCH / "attendance")
+os.environ["AI_CACHE_PATH"] = ""
+os.environ["OPENAI_API_KEY"] = ""
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture()
+def engine(tmp_path):
+    """A fresh, fully initialized SQLite database."""
+    from app.services.database import create_db_engine, init_db
+
+    bind = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    init_db(bind)
+    yield bind
+    bind.dispose()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """The API against the session database, with startup and shutdown hooks run."""
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+
+from app.services.ai_cache import ResponseCache
+from app.services.ai_engine import AIEngine
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubClient:
+    """Stands in for the OpenAI client: answers every completion with the next queued content."""
+
+    def __init__(self, *answers: str | None) -> None:
+        self.answers = list(answers)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **_: object) -> SimpleNamespace:
+        self.calls += 1
+        message = SimpleNamespace(content=self.answers.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def test_lru_bound_evicts_the_least_recently_used_entry():
+    cache = ResponseCache(max_size=2, clock=FakeClock())
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    stats = cache.stats()
+    assert (stats["size"], stats["max_size"], stats["evictions"]) == (2, 2, 1)
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (3, 1, 0)
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(ttl=10, clock=clock)
+    cache.set("a", "1")
+
+    clock.now += 9.9
+    assert cache.get("a") == "1"
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 2, 1, 0)
+
+
+def test_disk_hits_are_promoted_into_memory(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+    clock = FakeClock()
+    ResponseCache(ttl=10, path=path, clock=clock).set("a", "1")
+
+    clock.now += 5
+    restarted = ResponseCache(ttl=10, path=path, clock=clock)
+    assert restarted.stats()["size"] == 0
+    assert restarted.get("a") == "1"
+    assert restarted.get("a") == "1"
+    stats = restarted.stats()
+    assert (stats["disk_hits"], stats["hits"], stats["misses"], stats["size"]) == (1, 1, 0, 1)
+
+    # The promoted entry keeps its original age, so it expires on the disk entry's schedule.
+    clock.now += 5
+    assert restarted.get("a") is None
+    assert restarted.stats()["expirations"] == 1
+
+
+def test_expired_disk_entries_are_misses_and_purged_on_open(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+    clock = FakeClock()
+    ResponseCache(ttl=10, path=path, clock=clock).set("a", "1")
+
+    clock.now += 5
+    opened_early = ResponseCache(ttl=10, path=path, clock=clock)
+    clock.now += 5
+    assert opened_early.get("a") is None
+    assert opened_early.stats()["misses"] == 1
+
+    clock.now += 1
+    ResponseCache(ttl=10, path=path, clock=clock)
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM ai_cache").fetchone() == (0,)
+
+
+def test_only_real_completions_are_cached():
+    cache = ResponseCache(clock=FakeClock())
+    engine = AIEngine(api_key="test", cache=cache, scheduler=None)
+    stub = StubClient("", None, "real answer")
+    engine.client = lambda: stub
+
+    mock = engine._mock_response("sales", "pitch")
+    assert engine.process("sales", "pitch") == mock
+    assert engine.process("sales", "pitch") == mock
+    assert cache.stats()["size"] == 0
+
+    assert engine.process("sales", "pitch") == "real answer"
+    assert engine.process("sales", "pitch") == "real answer"
+    assert stub.calls == 3
+    assert cache.stats()["size"] == 1
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import backend.main
+from app.services.ai_engine import AIEngine
+
+
+class RateLimited(Exception):
+    status_code = 429
+    response = None
+
+
+class StubClient:
+    """Stands in for the OpenAI client; ``script`` maps a task to its answer, chunks or exception."""
+
+    def __init__(self, script: dict[str, object]) -> None:
+        self.script = script
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, *, messages: list[dict[str, str]], stream: bool = False, **_: object) -> object:
+        task = next(task for task in self.script if messages[-1]["content"].endswith(task))
+        answer = self.script[task]
+        if stream:
+            return self._chunks(answer)
+        if isinstance(answer, Exception):
+            raise answer
+        delay, content = answer
+        time.sleep(delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    @staticmethod
+    def _chunks(parts: object):
+        for part in parts:
+            if isinstance(part, Exception):
+                raise part
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))])
+
+
+def _engine(script: dict[str, object]) -> AIEngine:
+    engine = AIEngine(api_key="test", cache=None, scheduler=None)
+    stub = StubClient(script)
+    engine.client = lambda: stub
+    return engine
+
+
+def test_process_many_keeps_input_order():
+    # Earlier items answer last, so completion order is the reverse of input order.
+    engine = _engine({f"task {i}": (0.02 * (5 - i), f"answer {i}") for i in range(5)})
+    items = [("sales", f"task {i}") for i in range(5)]
+
+    results = engine.process_many(items, max_concurrency=5)
+
+    assert results == [{"response": f"answer {i}", "error": None} for i in range(5)]
+
+
+def test_one_failing_item_does_not_fail_the_batch():
+    engine = _engine({"first": (0, "one"), "boom": RateLimited("slow down"), "last": (0, "three")})
+
+    results = engine.process_many([("hr", "first"), ("hr", "boom"), ("hr", "last")], max_concurrency=3)
+
+    assert results[0] == {"response": "one", "error": None}
+    assert results[1]["response"] is None
+    assert results[1]["error"].startswith("AIOverloaded:")
+    assert results[2] == {"response": "three", "error": None}
+
+
+def _sse_tokens(client, task: str) -> list[str]:
+    response = client.post("/ai/process/stream", json={"department": "support", "task": task})
+    assert response.status_code == 200
+    events = response.text.strip().split("\n\n")
+    assert events[-1] == "event: done\ndata: {}"
+    return [json.loads(event.removeprefix("data: "))["token"] for event in events[:-1]]
+
+
+@pytest.mark.parametrize("parts", [[RuntimeError("connection reset")], []])
+def test_stream_falls_back_to_the_mock_when_nothing_was_streamed(client, monkeypatch, parts):
+    engine = _engine({"refund": parts})
+    monkeypatch.setattr(backend.main, "ai", engine)
+
+    tokens = _sse_tokens(client, "refund")
+
+    assert "".join(tokens) == engine._mock_response("support", "refund")
+    assert len(tokens) > 1
+
+
+def test_stream_error_after_output_ends_without_the_mock(client, monkeypatch):
+    monkeypatch.setattr(backend.main, "ai", _engine({"refund": ["Refund ", "approved", RuntimeError("reset")]}))
+
+    assert _sse_tokens(client, "refund") == ["Refund ", "approved"]
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+import backend.main
+from app.services.ai_engine import AIEngine
+from app.services.ai_scheduler import AIOverloaded, AIScheduler, Priority
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_identical_concurrent_keys_share_one_call():
+    scheduler = AIScheduler(max_concurrency=4)
+    release = threading.Event()
+    calls = []
+
+    def upstream() -> str:
+        calls.append(1)
+        release.wait(5)
+        return "answer"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(scheduler.run(upstream, key="same"))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: scheduler.stats()["deduplicated"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["answer"] * 5
+    assert scheduler.stats()["in_flight_keys"] == 0
+
+
+def test_followers_see_the_leaders_error():
+    scheduler = AIScheduler(max_concurrency=1)
+    release = threading.Event()
+
+    def upstream() -> str:
+        release.wait(5)
+        raise RuntimeError("upstream down")
+
+    errors = []
+
+    def call() -> None:
+        try:
+            scheduler.run(upstream, key="same")
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: scheduler.stats()["deduplicated"] == 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert errors == ["upstream down"] * 3
+
+
+def test_interactive_requests_are_granted_before_queued_bulk():
+    scheduler = AIScheduler(max_concurrency=1)
+    order: list[str] = []
+
+    def call(name: str, priority: Priority) -> None:
+        with scheduler.slot(priority):
+            order.append(name)
+
+    with scheduler.slot():
+        threads = []
+        for name, priority in [("bulk 1", Priority.BULK), ("bulk 2", Priority.BULK), ("interactive", Priority.INTERACTIVE)]:
+            thread = threading.Thread(target=call, args=(name, priority))
+            thread.start()
+            threads.append(thread)
+            queued = len(threads)
+            # Each request is queued before the next starts, so arrival order is fixed.
+            _wait_for(lambda queued=queued: scheduler.stats()["queued"] == queued)
+    for thread in threads:
+        thread.join()
+
+    assert order == ["interactive", "bulk 1", "bulk 2"]
+
+
+def test_full_queue_is_rejected_at_once():
+    scheduler = AIScheduler(max_concurrency=1, max_queue=1, max_wait=5)
+
+    def wait_for_slot() -> None:
+        with scheduler.slot():
+            pass
+
+    with scheduler.slot():
+        waiter = threading.Thread(target=wait_for_slot)
+        waiter.start()
+        _wait_for(lambda: scheduler.stats()["queued"] == 1)
+        started = time.monotonic()
+        with pytest.raises(AIOverloaded) as info, scheduler.slot():
+            pass
+        assert time.monotonic() - started < 1
+        assert info.value.retry_after >= 1
+    waiter.join()
+    assert scheduler.stats()["rejected_queue_full"] == 1
+
+
+def test_queue_timeout_is_rejected():
+    scheduler = AIScheduler(max_concurrency=1, max_wait=0.1)
+    with scheduler.slot(), pytest.raises(AIOverloaded), scheduler.slot():
+        pass
+    stats = scheduler.stats()
+    assert stats["rejected_timeout"] == 1
+    assert stats["queued"] == 0
+    # The timed-out ticket must not hold up the next caller.
+    with scheduler.slot():
+        assert scheduler.stats()["active"] == 1
+
+
+def test_overloaded_endpoint_returns_429_with_retry_after(client, monkeypatch):
+    saturated = AIEngine(api_key="test", cache=None, scheduler=AIScheduler(max_concurrency=1, max_queue=0))
+    monkeypatch.setattr(backend.main, "ai", saturated)
+
+    response = client.post("/ai/process", json={"department": "support", "task": "hello"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_adjust_tokens_refunds_and_charges_the_bucket():
+    # 10 tokens/s with a 10 s burst: a 100-token bucket that barely refills during the test.
+    scheduler = AIScheduler(tokens_per_minute=600, burst=10)
+    bucket = scheduler._tokens
+    with scheduler.slot(tokens=80):
+        pass
+    assert bucket.level == pytest.approx(20, abs=1)
+    scheduler.adjust_tokens(-50)  # the call used 50 fewer tokens than estimated
+    assert bucket.level == pytest.approx(70, abs=1)
+    scheduler.adjust_tokens(60)  # ...or 60 more
+    assert bucket.level == pytest.approx(10, abs=1)
+    scheduler.adjust_tokens(-1000)
+    assert bucket.level == pytest.approx(bucket.capacity)
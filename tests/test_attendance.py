@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import io
+import json
+from datetime import time
+
+from app.services.attendance import AttendanceStore
+
+
+def _events(name: str, day: int) -> io.StringIO:
+    return io.StringIO(
+        "employee,timestamp,event\n"
+        f"{name},2026-10-{day:02d}T09:00:00,in\n"
+        f"{name},2026-10-{day:02d}T17:00:00,out\n"
+    )
+
+
+def test_two_stores_on_one_root_keep_every_employee(tmp_path):
+    first, second = AttendanceStore(tmp_path), AttendanceStore(tmp_path)
+    first.ingest(_events("alice", 1))
+    assert second.employees() == ["alice"]
+    first.ingest(_events("bob", 2))
+    second.ingest(_events("carol", 3))
+
+    assert json.loads((tmp_path / "employees.json").read_text()) == ["alice", "bob", "carol"]
+    summary = AttendanceStore(tmp_path).summary("2026-10").set_index("employee")
+    assert summary["present_days"].to_dict() == {"alice": 1, "bob": 1, "carol": 1}
+    assert summary["hours_worked"].to_dict() == {"alice": 8.0, "bob": 8.0, "carol": 8.0}
+
+
+def _log(*rows: str) -> io.StringIO:
+    return io.StringIO("employee,timestamp,event\n" + "".join(f"{row}\n" for row in rows))
+
+
+def test_arrivals_after_the_threshold_are_late(tmp_path):
+    store = AttendanceStore(tmp_path, late_after=time(9, 15))
+    store.ingest(
+        _log(
+            "early,2026-10-05T09:14:59,in",
+            "on_time,2026-10-05T09:15:00,in",
+            "late,2026-10-05T09:15:01,in",
+            # Only the first event of the day is the arrival.
+            "first_counts,2026-10-05T08:00:00,in",
+            "first_counts,2026-10-05T12:00:00,out",
+            "first_counts,2026-10-05T13:00:00,in",
+            "mixed,2026-10-05T09:30:00,in",
+            "mixed,2026-10-06T09:00:00,in",
+        )
+    )
+
+    summary = store.summary("2026-10").set_index("employee")
+    assert summary["late_days"].to_dict() == {"early": 0, "first_counts": 0, "late": 1, "mixed": 1, "on_time": 0}
+    assert summary["present_days"].to_dict() == {"early": 1, "first_counts": 1, "late": 1, "mixed": 2, "on_time": 1}
+    stricter = AttendanceStore(tmp_path, late_after=time(9, 0)).summary("2026-10").set_index("employee")
+    assert stricter["late_days"].to_dict() == {"early": 1, "first_counts": 0, "late": 1, "mixed": 1, "on_time": 1}
+
+
+def test_hours_pair_across_ingests_into_a_reopened_store(tmp_path):
+    first = AttendanceStore(tmp_path)
+    first.ingest(_log("alice,2026-10-05T09:00:00,in", "bob,2026-10-05T08:30:00,in", "bob,2026-10-05T12:00:00,out"))
+    assert first.summary("2026-10").set_index("employee")["hours_worked"].to_dict() == {"alice": 0.0, "bob": 3.5}
+
+    reopened = AttendanceStore(tmp_path)
+    reopened.ingest(_log("alice,2026-10-05T17:30:00,out", "bob,2026-10-05T13:00:00,in", "bob,2026-10-05T17:15:00,out"))
+
+    summary = AttendanceStore(tmp_path).summary("2026-10").set_index("employee")
+    assert summary["hours_worked"].to_dict() == {"alice": 8.5, "bob": 7.75}
+    assert summary["present_days"].to_dict() == {"alice": 1, "bob": 1}
+    assert first.summary("2026-10").equals(reopened.summary("2026-10"))
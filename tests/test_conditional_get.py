@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import delete, update
+
+import backend.main
+from app.services.database import Lead, Task, Ticket
+
+TICKET = {"customer": "etag", "issue": "conditional get check", "category": "Hardware"}
+LEAD = {"name": "etag", "email": "etag@x.io", "company": "Acme", "source": "Web", "deal_size": 10.0, "score": 5.0}
+TASK = {"title": "etag", "owner": "ops", "due_date": "2026-11-02", "priority": "Low"}
+
+# (list path, create path, row, model, column to update)
+ENDPOINTS = [
+    ("/support/tickets?limit=500", "/support/tickets", TICKET, Ticket, Ticket.status),
+    ("/sales/leads?limit=500", "/sales/leads", LEAD, Lead, Lead.source),
+    ("/admin/tasks/due?limit=500", "/admin/tasks", TASK, Task, Task.status),
+]
+
+
+def _etag(client, path: str) -> str:
+    response = client.get(path)
+    assert response.status_code == 200
+    return response.headers["ETag"]
+
+
+def _assert_changed(client, path: str, before: str) -> str:
+    response = client.get(path, headers={"If-None-Match": before})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != before
+    return response.headers["ETag"]
+
+
+@pytest.mark.parametrize("path", [endpoint[0] for endpoint in ENDPOINTS])
+def test_repeated_get_with_matching_etag_is_not_modified(client, path):
+    first = client.get(path)
+    etag = first.headers["ETag"]
+
+    repeat = client.get(path, headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+    assert repeat.content == b""
+    assert client.get(path, headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+    assert client.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+@pytest.mark.parametrize(("path", "create", "row", "model", "column"), ENDPOINTS)
+def test_every_write_changes_the_etag(client, path, create, row, model, column):
+    etag = _etag(client, path)
+
+    created = client.post(create, json=row)
+    assert created.status_code == 200
+    row_id = created.json()["id"]
+    etag = _assert_changed(client, path, etag)
+
+    bulk = client.post(f"{create}/bulk", json=[row, row])
+    assert bulk.status_code == 200
+    etag = _assert_changed(client, path, etag)
+
+    with backend.main.engine.begin() as conn:
+        conn.execute(update(model).where(model.id == row_id).values({column.key: "Changed"}))
+    etag = _assert_changed(client, path, etag)
+    assert any(item.get(column.key) == "Changed" for item in client.get(path).json()["items"])
+
+    with backend.main.engine.begin() as conn:
+        conn.execute(delete(model).where(model.id == row_id))
+    _assert_changed(client, path, etag)
+    assert all(item["id"] != row_id for item in client.get(path).json()["items"])
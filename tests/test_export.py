@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.services.database import Lead, Task, Ticket
+from app.services.export import EXPORT_TABLES, export_table
+
+
+@pytest.fixture()
+def populated(engine):
+    with engine.begin() as conn:
+        conn.execute(insert(Ticket), [{"customer": f"c{i}", "issue": "x", "created_at": datetime(2026, 5, i + 1, 9)} for i in range(5)])
+        conn.execute(insert(Lead), [{"name": f"l{i}", "email": "e", "company": "c", "source": "Website", "extra": {"meetings": i}} for i in range(5)])
+        conn.execute(insert(Task), [{"title": f"t{i}", "owner": "o", "due_date": f"2026-06-{i + 1:02d}"} for i in range(4)])
+        conn.execute(insert(Task), [{"title": "someday", "owner": "o", "due_date": "next week"}])
+    return engine
+
+
+def _export(engine, name: str, fmt: str) -> bytes:
+    return b"".join(export_table(engine, name, fmt, batch_size=2))
+
+
+@pytest.mark.parametrize("name", sorted(EXPORT_TABLES))
+def test_text_exports_cover_every_table(populated, name):
+    rows = list(csv.DictReader(io.StringIO(_export(populated, name, "csv").decode())))
+    lines = [json.loads(line) for line in _export(populated, name, "ndjson").decode().splitlines()]
+    assert len(rows) == len(lines) == 5
+    assert [row["id"] for row in rows] == [str(line["id"]) for line in lines]
+    if name == "tasks":
+        assert [line["due_on"] for line in lines] == ["2026-06-01", "2026-06-02", "2026-06-03", "2026-06-04", None]
+        assert rows[0]["due_on"] == "2026-06-01"
+    if name == "leads":
+        assert lines[3]["extra"] == {"meetings": 3}
+
+
+@pytest.mark.parametrize("name", sorted(EXPORT_TABLES))
+def test_parquet_export_covers_every_table(populated, name):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(io.BytesIO(_export(populated, name, "parquet")))
+    assert table.num_rows == 5
+    if name == "tasks":
+        assert table.column("due_on").to_pylist()[:2] == [date(2026, 6, 1), date(2026, 6, 2)]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import r2_score
+
+from app.services.incremental_regression import fit_csv
+
+
+def _frame(rows: int = 500, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(
+        {
+            "label": [f"r{i}" for i in range(rows)],
+            "spend": rng.uniform(1e6, 2e6, rows),
+            "visits": rng.normal(50, 10, rows),
+            "region": np.full(rows, 7.0),
+        }
+    )
+    frame["revenue"] = 3.5 * frame["spend"] - 120 * frame["visits"] + 4000 + rng.normal(0, 5e4, rows)
+    frame.loc[rng.choice(rows, 20, replace=False), "visits"] = np.nan
+    return frame
+
+
+@pytest.mark.parametrize("chunk_rows", [37, 100, 10_000])
+def test_chunked_fit_matches_sklearn(tmp_path, chunk_rows):
+    frame = _frame()
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    model, last_row = fit_csv(str(path), chunk_rows=chunk_rows)
+
+    complete = frame.dropna()
+    features = ["spend", "visits", "region"]
+    reference = LinearRegression().fit(complete[features], complete["revenue"])
+    assert model.n_samples_ == len(complete)
+    assert model.target_name_ == "revenue"
+    np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-7, atol=1e-7)
+    assert model.coef_[2] == pytest.approx(0.0, abs=1e-7)  # the constant column
+    assert model.intercept_ == pytest.approx(reference.intercept_, rel=1e-7)
+    expected_r2 = r2_score(complete["revenue"], reference.predict(complete[features]))
+    assert model.r2_score() == pytest.approx(expected_r2, rel=1e-9)
+    np.testing.assert_allclose(model.predict(last_row), reference.predict(last_row), rtol=1e-9)
+
+
+def test_fit_needs_a_numeric_feature(tmp_path):
+    path = tmp_path / "data.csv"
+    pd.DataFrame({"label": ["a", "b"], "revenue": [1.0, 2.0]}).to_csv(path, index=False)
+    with pytest.raises(ValueError):
+        fit_csv(str(path))
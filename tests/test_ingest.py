@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import tempfile
+
+import pytest
+
+import backend.main
+
+LEAD = {"name": "n", "email": "e@x.io", "company": "Acme", "source": "Web", "deal_size": 100.0, "score": 50.0}
+
+
+@pytest.mark.parametrize("value", ["NaN", "Infinity", "-Infinity"])
+def test_bulk_leads_reject_non_finite_numbers(client, value):
+    body = "\n".join(
+        [
+            '{"name": "ok", "email": "e", "company": "c", "source": "Web", "deal_size": 1.0, "score": 2.0}',
+            f'{{"name": "bad", "email": "e", "company": "c", "source": "Web", "deal_size": {value}, "score": 2.0}}',
+            f'{{"name": "bad", "email": "e", "company": "c", "source": "Web", "deal_size": 1.0, "score": {value}}}',
+        ]
+    )
+    result = client.post("/sales/leads/bulk", content=body, headers={"content-type": "application/x-ndjson"}).json()
+    assert result["inserted"] == 1
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+
+
+def test_csv_leads_reject_non_finite_numbers(client):
+    body = "name,email,company,source,deal_size,score\nok,e,c,Web,1,2\nbad,e,c,Web,nan,2\nbad,e,c,Web,1,inf\n"
+    result = client.post("/sales/leads/bulk", content=body, headers={"content-type": "text/csv"}).json()
+    assert result["inserted"] == 1
+    assert [error["row"] for error in result["errors"]] == [2, 3]
+
+
+def test_single_lead_rejects_non_finite_numbers(client):
+    body = '{"name": "n", "email": "e", "company": "c", "source": "Web", "deal_size": NaN, "score": 1}'
+    response = client.post("/sales/leads", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["input"] == "nan"
+
+
+@pytest.mark.parametrize(
+    ("body", "status"), [(b'[{"customer": "c", "issue": "i"}]', 200), (b'[{"customer": "c", "issue": ', 400)]
+)
+def test_spooled_upload_is_closed(client, monkeypatch, body, status):
+    spools = []
+
+    class TrackedSpool(tempfile.SpooledTemporaryFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            spools.append(self)
+
+    monkeypatch.setattr(backend.main.tempfile, "SpooledTemporaryFile", TrackedSpool)
+    response = client.post("/support/tickets/bulk", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == status
+    assert len(spools) == 1
+    assert spools[0].closed
+
+
+def test_attendance_upload_is_ingested_and_closed(client, monkeypatch):
+    spools = []
+
+    class TrackedSpool(tempfile.SpooledTemporaryFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            spools.append(self)
+
+    monkeypatch.setattr(backend.main.tempfile, "SpooledTemporaryFile", TrackedSpool)
+    body = b"employee,timestamp,event\nspool-check,2026-09-01T09:00:00,in\nspool-check,2026-09-01T17:00:00,out\n"
+    response = client.post("/hr/attendance/events", content=body, headers={"content-type": "text/csv"})
+    assert response.status_code == 200
+    rejected = client.post("/hr/attendance/events", content=b"[]", headers={"content-type": "application/json"})
+    assert rejected.status_code == 415
+    assert len(spools) == 2
+    assert all(spool.closed for spool in spools)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from app.services.large_csv import StreamingDecimator, lttb, summarize_csv
+
+
+def test_chunked_stats_match_the_whole_frame():
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame(
+        {
+            "units": rng.integers(0, 1_000, 103),
+            "revenue": rng.normal(5_000, 1_200, 103),
+            "region": rng.choice(["north", "south"], 103),
+        }
+    )
+    # A column that is empty for the whole first chunk and sparse afterwards.
+    frame["refunds"] = np.where(np.arange(103) % 3 == 0, rng.normal(40, 9, 103), np.nan)
+    frame.loc[:9, "refunds"] = np.nan
+    source = io.StringIO(frame.to_csv(index=False))
+
+    summary = summarize_csv(source, chunk_rows=10)
+
+    assert summary.rows == 103
+    assert summary.dtypes["region"] == "category"
+    expected = frame.describe().T[["count", "mean", "std", "min", "max"]]
+    pd.testing.assert_frame_equal(
+        summary.stats.loc[expected.index], expected, check_dtype=False, check_names=False, rtol=1e-5
+    )
+
+
+def test_lttb_keeps_the_endpoints_and_peaks():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 500)
+    y[4_321] = 25.0
+    y[7_000] = -25.0
+
+    keep = lttb(x, y, 200)
+
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert {4_321, 7_000} <= set(keep.tolist())
+
+
+def test_streaming_decimator_stays_bounded():
+    decimator = StreamingDecimator(max_points=100)
+    for start in range(0, 5_000, 250):
+        x = pd.Series(np.arange(start, start + 250, dtype=np.float64))
+        decimator.update(x, np.cos(x / 100))
+        assert len(decimator.x) <= 200
+
+    x, y = decimator.points()
+    assert len(x) == len(y) == 100
+    assert x[0] == 0 and x[-1] == 4_999
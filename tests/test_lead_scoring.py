@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import insert, inspect, select
+
+from app.services import database, lead_scoring
+from app.services.database import Lead, create_db_engine
+from app.services.instrumentation import DB_QUERY_SECONDS, instrument_engine
+from app.services.lead_scoring import conversion_model, rescore_leads, score_leads
+from app.services.model_registry import ModelRegistry
+
+
+def _update_count() -> float:
+    # Histogram state is [count per bucket..., +Inf count, sum].
+    return sum(DB_QUERY_SECONDS._values.get(("UPDATE", "leads"), [0.0])[:-1])
+
+
+def test_rescore_writes_model_scores_through_sqlalchemy(engine):
+    rows = [
+        {"name": f"n{i}", "email": "e", "company": "c", "source": ["Website", "Referral"][i % 2], "deal_size": 1000.0 * i,
+         "score": 0.0, "extra": {"engagement": i % 100, "meetings": i % 4} if i % 3 else {}}
+        for i in range(1, 251)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(Lead), rows)
+    registry = ModelRegistry(None)
+    instrument_engine(engine)
+    updates_before = _update_count()
+
+    result = rescore_leads(engine, registry, batch_size=100)
+
+    assert result["rescored"] == 250
+    # Writes go through SQLAlchemy, so the statement instrumentation sees them.
+    assert _update_count() > updates_before
+    model, data = conversion_model(registry)
+    defaults = data[["engagement", "meetings"]].median()
+    expected = score_leads(
+        model,
+        np.array([r["deal_size"] for r in rows]),
+        np.array([r["source"] for r in rows]),
+        np.array([r["extra"].get("engagement", defaults["engagement"]) for r in rows], dtype=float),
+        np.array([r["extra"].get("meetings", defaults["meetings"]) for r in rows], dtype=float),
+    )
+    with engine.connect() as conn:
+        stored = [score for (score,) in conn.execute(select(Lead.score).order_by(Lead.id))]
+    np.testing.assert_allclose(stored, expected)
+    # Indexes dropped for the rewrite are back afterwards.
+    names = {index["name"] for index in inspect(engine).get_indexes("leads")}
+    assert {"ix_leads_score_id", "ix_leads_source_score_id"} <= names
+
+
+def test_writers_are_not_locked_out_during_a_rescore(engine, monkeypatch):
+    rows = [{"name": f"n{i}", "email": "e", "company": "c", "source": "Website", "deal_size": float(i), "score": -1.0} for i in range(100_000)]
+    with engine.begin() as conn:
+        conn.execute(insert(Lead), rows)
+    # A writer that gives up after 0.5 s: far less than the whole rescore, far more than one batch.
+    monkeypatch.setattr(database, "SQLITE_BUSY_TIMEOUT_MS", 500)
+    writer = create_db_engine(engine.url.render_as_string())
+    registry = ModelRegistry(None)
+    conversion_model(registry)
+    scoring = threading.Event()
+
+    def score_and_signal(*args):
+        scoring.set()
+        return score_leads(*args)
+
+    monkeypatch.setattr(lead_scoring, "score_leads", score_and_signal)
+    rescore = threading.Thread(target=rescore_leads, args=(engine, registry), kwargs={"batch_size": 2000})
+    rescore.start()
+    try:
+        assert scoring.wait(10)
+        time.sleep(0.05)
+        for i in range(5):
+            with writer.begin() as conn:
+                conn.execute(insert(Lead).values(name=f"late {i}", email="e", company="c", source="Web"))
+        assert rescore.is_alive(), "rescore finished before the concurrent writes were tried"
+    finally:
+        rescore.join()
+        writer.dispose()
+
+
+def test_conversion_model_is_cached_per_registry():
+    registry = ModelRegistry(None)
+    first = conversion_model(registry)
+    assert conversion_model(registry) is first
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, insert, text, update
+
+from app.services.database import Task
+from app.services.metrics import _AGGREGATE_SQL, read_counts
+
+
+def test_tasks_completed_counts_only_completed_statuses(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Task),
+            [
+                {"title": f"t{i}", "owner": "o", "due_date": ["2026-03-01", "someday"][i % 2],
+                 "status": ["Pending", "Completed", "Done", "In Progress"][i % 4]}
+                for i in range(20)
+            ],
+        )
+    metrics = read_counts(engine)
+    assert (metrics.tasks, metrics.tasks_completed) == (20, 10)
+    assert metrics.as_dict()["tasks_completed"] == 10
+
+    with engine.begin() as conn:
+        conn.execute(update(Task).where(Task.status == "Pending").values(status="Done"))
+        conn.execute(delete(Task).where(Task.status == "Completed"))
+    metrics = read_counts(engine)
+    assert (metrics.tasks, metrics.tasks_completed) == (15, 10)
+
+    # The aggregate query used on other databases agrees with the SQLite rollup.
+    with engine.connect() as conn:
+        assert conn.execute(text(_AGGREGATE_SQL)).one().tasks_completed == 10
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.pagination import encode_cursor
+
+MALFORMED = [["abc", 1], [None, 1], [{"a": 1}, 1], [True, 1], [10.0, "1"], [10.0, 1.5], [10.0, None]]
+
+
+def _seed_leads(client, count: int) -> None:
+    rows = [
+        {"name": f"lead {i}", "email": f"l{i}@x.io", "company": "Acme", "source": "Website", "deal_size": 100.0, "score": float(i % 7)}
+        for i in range(count)
+    ]
+    assert client.post("/sales/leads/bulk", json=rows).json()["inserted"] == count
+
+
+def test_lead_pages_cover_every_lead_once(client):
+    _seed_leads(client, 23)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 5, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/sales/leads", params=params).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    everything = client.get("/sales/leads", params={"limit": 500}).json()["items"]
+    assert len(seen) == len(set(seen)) == len(everything)
+
+
+@pytest.mark.parametrize("values", MALFORMED)
+def test_lead_cursor_with_wrong_types_is_rejected(client, values):
+    response = client.get("/sales/leads", params={"cursor": encode_cursor(*values)})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("values", [["2026-01-01T00:00:00", "1"], ["2026-01-01T00:00:00", None], [5, 1]])
+def test_ticket_cursor_with_wrong_types_is_rejected(client, values):
+    response = client.get("/support/tickets", params={"cursor": encode_cursor(*values)})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("values", MALFORMED)
+def test_search_cursor_with_wrong_types_is_rejected(client, values):
+    response = client.get("/support/tickets/search", params={"q": "printer", "cursor": encode_cursor(*values)})
+    assert response.status_code == 400
+
+
+def test_search_pages_follow_the_cursor(client):
+    tickets = [{"customer": "searcher", "issue": f"printer jam number {i}", "category": "Technical"} for i in range(7)]
+    assert client.post("/support/tickets/bulk", json=tickets).json()["inserted"] == 7
+    first = client.get("/support/tickets/search", params={"q": "printer jam", "limit": 4}).json()
+    second = client.get("/support/tickets/search", params={"q": "printer jam", "limit": 4, "cursor": first["next_cursor"]}).json()
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert len(ids) == len(set(ids)) == 7
+
+
+@pytest.mark.parametrize("values", [["2026-01-01", "1"], ["2026-01-01", True], ["2026-01-01", None], [20260101, 1]])
+def test_due_task_cursor_with_wrong_types_is_rejected(client, values):
+    response = client.get("/admin/tasks/due", params={"cursor": encode_cursor(*values)})
+    assert response.status_code == 400
+
+
+def test_undecodable_cursor_is_rejected(client):
+    assert client.get("/sales/leads", params={"cursor": "not-base64!"}).status_code == 400
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from app.services.reminders import FiredReminder, ReminderScheduler, utc_now
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_lateness_counts_overdue_reminders_from_their_creation(engine):
+    fired: list[FiredReminder] = []
+    scheduler = ReminderScheduler(engine, on_fire=fired.extend, window=60, refresh=30)
+    scheduler.start()
+    try:
+        overdue = scheduler.schedule("missed standup", utc_now() - timedelta(hours=1))
+        upcoming = scheduler.schedule("standup", utc_now() + timedelta(milliseconds=200))
+        _wait_for(lambda: scheduler.stats()["fired"] == 2)
+    finally:
+        scheduler.stop()
+
+    by_id = {reminder.id: reminder for reminder in fired}
+    assert by_id[overdue].due_at == by_id[overdue].created_at > by_id[overdue].remind_at
+    assert by_id[upcoming].due_at == by_id[upcoming].remind_at
+    stats = scheduler.stats()
+    # Measured from remind_at, the overdue reminder alone would put p99 at an hour.
+    assert stats["lateness_ms_p99"] < 1_000
+
+
+def test_due_at_falls_back_to_remind_at_without_a_creation_time():
+    remind_at = utc_now()
+    reminder = FiredReminder(1, None, "legacy", remind_at, remind_at + timedelta(seconds=1))
+    assert reminder.due_at == remind_at
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import delete, insert, update
+
+import backend.main
+from app.services.database import Lead, Task, Ticket
+from app.services.metrics import MetricsService
+from app.services.reports import monthly_report
+
+PERIOD = {"months": 6, "end": "2026-06"}
+
+
+def _assert_rollups_match(engine) -> None:
+    assert monthly_report(engine, **PERIOD) == monthly_report(engine, from_source=True, **PERIOD)
+
+
+def test_rollups_follow_inserts_updates_and_deletes(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Ticket),
+            [
+                {"customer": f"c{i}", "issue": "x", "status": ["Open", "Closed"][i % 2],
+                 "category": ["Billing", "Technical", None][i % 3], "created_at": datetime(2026, 1 + i % 6, 1 + i % 28, 12)}
+                for i in range(40)
+            ],
+        )
+        conn.execute(
+            insert(Task),
+            [
+                {"title": f"t{i}", "owner": "o", "due_date": f"2026-{1 + i % 7:02d}-{1 + i % 28:02d}",
+                 "status": ["Pending", "Completed", "Done"][i % 3]}
+                for i in range(30)
+            ],
+        )
+        conn.execute(
+            insert(Lead),
+            [
+                {"name": f"l{i}", "email": "e", "company": "c", "source": ["Website", "Referral"][i % 2],
+                 "deal_size": 1000.0 + i, "created_at": datetime(2026, 1 + i % 6, 15)}
+                for i in range(30)
+            ],
+        )
+    _assert_rollups_match(engine)
+
+    with engine.begin() as conn:
+        conn.execute(update(Ticket).where(Ticket.id <= 5).values(status="Resolved"))
+        conn.execute(update(Ticket).where(Ticket.id.between(6, 10)).values(category="Logistics"))
+        conn.execute(update(Ticket).where(Ticket.id.between(11, 15)).values(created_at=datetime(2026, 6, 30, 23, 59)))
+        conn.execute(update(Ticket).where(Ticket.id == 16).values(created_at=datetime(2025, 12, 31), category=None))
+        conn.execute(update(Task).where(Task.id <= 5).values(status="Completed"))
+        conn.execute(update(Task).where(Task.id.between(6, 10)).values(due_date="2026-03-31"))
+        conn.execute(update(Task).where(Task.id == 11).values(due_date="2026-07-01", status="Done"))
+        conn.execute(update(Lead).where(Lead.id <= 5).values(source="Event", deal_size=250.5))
+        conn.execute(update(Lead).where(Lead.id.between(6, 10)).values(created_at=datetime(2026, 2, 1)))
+    _assert_rollups_match(engine)
+
+    with engine.begin() as conn:
+        conn.execute(delete(Ticket).where(Ticket.id % 4 == 0))
+        conn.execute(delete(Task).where(Task.id % 3 == 0))
+        conn.execute(delete(Lead).where(Lead.source == "Event"))
+    _assert_rollups_match(engine)
+
+    report = monthly_report(engine, **PERIOD)
+    assert sum(month["tickets"]["total"] for month in report["months"]) > 0
+    assert all("Event" not in month["leads"]["by_source"] for month in report["months"])
+
+
+def test_report_availability_is_not_read_from_the_metrics_cache(engine, client, monkeypatch):
+    stale = MetricsService(engine, ttl=3600)
+    monkeypatch.setattr(backend.main, "engine", engine)
+    monkeypatch.setattr(backend.main, "dashboard_metrics", stale)
+    assert stale.snapshot().tickets == 0
+    assert client.get("/reports/monthly").status_code == 404
+
+    with engine.begin() as conn:
+        conn.execute(insert(Lead).values(name="l", email="e", company="c", source="Website"))
+    assert client.get("/reports/monthly").status_code == 200
+    assert stale.snapshot().leads == 0
+
+    with engine.begin() as conn:
+        conn.execute(delete(Lead))
+    assert client.get("/reports/monthly").status_code == 404
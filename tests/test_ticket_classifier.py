@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pickle
+
+from sqlalchemy import insert, select
+
+from app.services import ticket_classifier
+from app.services.database import Ticket, create_db_engine, init_db
+from app.services.database import engine as app_engine
+from app.services.ticket_classifier import (
+    SEED_EXAMPLES,
+    TRAINING_VERSION,
+    TicketClassifier,
+    get_classifier,
+    training_data,
+)
+
+
+def _sources(customer: str) -> dict[str, tuple[str, str | None]]:
+    query = select(Ticket.issue, Ticket.category, Ticket.category_source).where(Ticket.customer == customer)
+    with app_engine.connect() as conn:
+        return {issue: (category, source) for issue, category, source in conn.execute(query)}
+
+
+def test_ticket_endpoints_record_where_the_category_came_from(client):
+    assert client.post("/support/tickets", json={"customer": "src-one", "issue": "chose it", "category": "Billing"}).status_code == 200
+    assert client.post("/support/tickets", json={"customer": "src-one", "issue": "my parcel never arrived"}).status_code == 200
+    bulk = [
+        {"customer": "src-bulk", "issue": "typed by hand", "category": "Technical"},
+        {"customer": "src-bulk", "issue": "the app crashes on login"},
+    ]
+    assert client.post("/support/tickets/bulk", json=bulk).json()["inserted"] == 2
+
+    assert _sources("src-one")["chose it"] == ("Billing", "user")
+    assert _sources("src-one")["my parcel never arrived"][1] == "auto"
+    assert _sources("src-bulk")["typed by hand"] == ("Technical", "user")
+    assert _sources("src-bulk")["the app crashes on login"][1] == "auto"
+
+
+def test_training_data_skips_predicted_labels(engine):
+    with engine.begin() as conn:
+        conn.execute(
+            insert(Ticket),
+            [
+                {"customer": "c", "issue": "user label", "category": "Billing", "category_source": "user"},
+                {"customer": "c", "issue": "predicted label", "category": "Billing", "category_source": "auto"},
+                {"customer": "c", "issue": "legacy label", "category": "Logistics", "category_source": None},
+            ],
+        )
+    texts, labels = training_data(engine)
+    seeds = sum(len(examples) for examples in SEED_EXAMPLES.values())
+    assert sorted(zip(texts[seeds:], labels[seeds:])) == [("legacy label", "Logistics"), ("user label", "Billing")]
+
+
+def test_upgraded_database_keeps_its_training_rows(tmp_path):
+    bind = create_db_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with bind.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE tickets (id INTEGER PRIMARY KEY, customer VARCHAR(80) NOT NULL, "
+                             "issue VARCHAR(500) NOT NULL, status VARCHAR(30), category VARCHAR(50), created_at DATETIME)")
+        conn.exec_driver_sql("INSERT INTO tickets (customer, issue, category) VALUES ('c', 'old ticket', 'Billing')")
+        conn.exec_driver_sql("PRAGMA user_version = 3")
+    init_db(bind)
+    texts, _ = training_data(bind)
+    assert "old ticket" in texts
+    bind.dispose()
+
+
+def test_stale_persisted_model_is_retrained(engine, tmp_path, monkeypatch):
+    monkeypatch.setenv("MODEL_CACHE_DIR", str(tmp_path / "models"))
+    monkeypatch.setattr(ticket_classifier, "_CLASSIFIER", None)
+    stale = TicketClassifier.train(*training_data(engine))
+    stale.version = TRAINING_VERSION - 1
+    path = tmp_path / "models" / "ticket_classifier.pkl"
+    path.parent.mkdir()
+    path.write_bytes(pickle.dumps(stale))
+
+    assert get_classifier(engine).version == TRAINING_VERSION
+    assert pickle.loads(path.read_bytes()).version == TRAINING_VERSION
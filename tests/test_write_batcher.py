@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.services.database import Lead, Task
+from app.services.write_batcher import WriteBatcher
+
+
+def _lead(name: str, email: str | None = None) -> dict[str, object]:
+    return {"name": name, "email": email if email is not None else f"{name}@x.io", "company": "Acme", "source": "Web"}
+
+
+def _run_concurrently(batcher: WriteBatcher, calls: list[tuple[type, dict[str, object]]]) -> list[object]:
+    """Insert every row from its own thread, released together; returns rows or exceptions in order."""
+    results: list[object] = [None] * len(calls)
+    start = threading.Barrier(len(calls))
+
+    def call(position: int) -> None:
+        start.wait()
+        try:
+            results[position] = batcher.insert(*calls[position])
+        except Exception as exc:  # noqa: BLE001 - collected for the assertions
+            results[position] = exc
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.fixture()
+def batcher(engine):
+    batcher = WriteBatcher(engine, max_batch=256, max_delay=0.2)
+    flushed: list[int] = []
+    flush = batcher._flush
+    batcher._flush = lambda batch: (flushed.append(len(batch)), flush(batch))
+    batcher.flushed = flushed
+    yield batcher
+    batcher.close()
+
+
+def test_concurrent_creates_get_distinct_correct_ids(engine, batcher):
+    calls = [(Lead, _lead(f"lead{i}")) for i in range(40)]
+    # Tasks with and without a priority land in separate insert groups within the same batch.
+    calls += [
+        (Task, {"title": f"task{i}", "owner": "ops", "due_date": f"2026-11-{i + 1:02d}", **({"priority": "High"} if i % 2 else {})})
+        for i in range(20)
+    ]
+
+    results = _run_concurrently(batcher, calls)
+
+    assert max(batcher.flushed) > 1
+    leads, tasks = results[:40], results[40:]
+    assert len({row["id"] for row in leads}) == 40
+    assert len({row["id"] for row in tasks}) == 20
+    assert [row["name"] for row in leads] == [f"lead{i}" for i in range(40)]
+    assert [row["title"] for row in tasks] == [f"task{i}" for i in range(20)]
+    assert [row["priority"] for row in tasks] == ["Medium", "High"] * 10
+    assert [row["due_on"].day for row in tasks] == list(range(1, 21))
+    with engine.connect() as conn:
+        stored = dict(conn.execute(select(Lead.id, Lead.name)).all())
+    assert stored == {row["id"]: row["name"] for row in leads}
+
+
+def test_bad_row_falls_back_to_per_row_inserts(engine, batcher):
+    calls = [(Lead, _lead(f"lead{i}")) for i in range(10)]
+    calls[4] = (Lead, {**_lead("broken"), "email": None})
+
+    results = _run_concurrently(batcher, calls)
+
+    assert max(batcher.flushed) > 1
+    assert isinstance(results[4], IntegrityError)
+    good = [row for position, row in enumerate(results) if position != 4]
+    assert [row["name"] for row in good] == [f"lead{i}" for i in range(10) if i != 4]
+    with engine.connect() as conn:
+        stored = dict(conn.execute(select(Lead.id, Lead.name)).all())
+    assert stored == {row["id"]: row["name"] for row in good}